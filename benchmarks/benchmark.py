@@ -0,0 +1,277 @@
+"""
+This module is the entry point of the scalability benchmarks\n
+It builds every synthetic topology at every size, times the building of the
+Network, the computation of every Route and a fixed Packet workload, and
+measures the memory the Network takes per Node. The results are written to
+JSON, along with the log-log slope of every measurement against the amount
+of Nodes - the exponent of its complexity - and plotted if matplotlib is
+installed
+"""
+# Built-in modules
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+# Third-party modules
+import numpy as np
+
+# Self-made modules
+from src.components.network import Network
+from src.engine.scenario import Scenario
+from src.engine.simulator import Simulator
+from src.engine.topologies import GENERATORS
+from src.utils.graph import Graph
+
+# The measurements of a benchmark row whose scaling is fitted
+MEASUREMENTS: List[str] = ["build_seconds", "routes_seconds",
+                           "workload_seconds", "seconds_per_packet",
+                           "bytes_per_node"]
+
+
+def best_time(function: Callable[[], Any], repeats: int) -> float:
+    """
+    Gets the shortest of repeated timings of a function - the one disturbed
+    the least by the rest of the machine
+
+    Parameters:
+    function (Callable[[], Any]): The function to time
+    repeats  (int): The amount of timings
+
+    Returns:
+    float: The shortest timing (in seconds)
+    """
+    best: float = float("inf")
+    for _ in range(repeats):
+        start: float = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compute_routes(network: Network) -> int:
+    """
+    Runs Dijkstra's algorithm between every pair of Nodes, as a routing
+    table update does, without touching the Routes of the Nodes
+
+    Parameters:
+    network (Network): The Network to compute the Routes of
+
+    Returns:
+    int: The amount of Routes found
+    """
+    nodes = network.get_nodes()
+    graph: Graph = Graph()
+    graph.update_graph(nodes)
+    return sum(graph.dijkstra(source.ip, destination.ip) is not None
+               for source in nodes for destination in nodes)
+
+
+def time_workload(scenario: Scenario, repeats: int) -> Tuple[float, int]:
+    """
+    Times running the Packets of a Scenario through the Network - with
+    Network.send_packet() and receive_packet(), by the Simulator - until
+    every one of them is delivered or dropped, without building the Network
+
+    Parameters:
+    scenario (Scenario): The Scenario to run
+    repeats  (int): The amount of timings to take the shortest of
+
+    Returns:
+    Tuple[float, int]: The shortest timing (in seconds), and the amount of \
+                       Packets sent
+    """
+    best: float = float("inf")
+    packets: int = 0
+    for _ in range(repeats):
+        simulator: Simulator = Simulator.from_scenario(scenario)
+        start: float = time.perf_counter()
+        simulator.run(scenario.duration)
+        best = min(best, time.perf_counter() - start)
+        packets = simulator.network.total_pack
+    return best, packets
+
+
+def measure_memory(scenario: Scenario) -> int:
+    """
+    Measures the memory a built Network of a Scenario takes
+
+    Parameters:
+    scenario (Scenario): The Scenario to build
+
+    Returns:
+    int: The bytes allocated by building the Network, and still in use
+    """
+    tracing: bool = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+    network: Network = scenario.build_network()
+    used: int = tracemalloc.get_traced_memory()[0] - before
+    if not tracing:
+        tracemalloc.stop()
+    del network
+    return used
+
+
+def measure(topology: str,
+            size: int,
+            packets: int = 100,
+            repeats: int = 3
+            ) -> Dict[str, Any]:
+    """
+    Runs every benchmark on a topology of a size
+
+    Parameters:
+    topology (str): The name of the topology generator
+    size     (int): The amount of Routers asked from the generator
+    packets  (int): The amount of Packets every Host sends in the workload
+    repeats  (int): The amount of timings to take the shortest of
+
+    Returns:
+    Dict[str, Any]: {topology, size, routers, nodes, links, packets} and \
+                    the MEASUREMENTS
+    """
+    scenario: Scenario = GENERATORS[topology](size, packets=packets)
+    network: Network = scenario.build_network()
+    nodes: int = len(network.get_nodes())
+    # Workload Packets are sent for as long as it takes at the Hosts' rate
+    scenario.duration = packets / scenario.hosts[0]["send_rate"] + nodes
+    workload, sent = time_workload(scenario, repeats)
+    return {"topology": topology, "size": size,
+            "routers": len(scenario.routers), "nodes": nodes,
+            "links": len(scenario.links), "packets": sent,
+            "build_seconds": best_time(scenario.build_network, repeats),
+            "routes_seconds": best_time(lambda: compute_routes(network),
+                                        repeats),
+            "workload_seconds": workload,
+            "seconds_per_packet": workload / sent if sent > 0 else 0.0,
+            "bytes_per_node": measure_memory(scenario) / nodes}
+
+
+def scaling(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Fits every measurement of every topology against the amount of Nodes on
+    a log-log scale: a slope of 1 is linear, 2 is quadratic, and so on
+
+    Parameters:
+    rows (List[Dict[str, Any]]): The rows of measure()
+
+    Returns:
+    Dict[str, Dict[str, float]]: Topology -> measurement -> slope, for the \
+                                 topologies measured at least at two sizes
+    """
+    slopes: Dict[str, Dict[str, float]] = {}
+    for topology in dict.fromkeys(row["topology"] for row in rows):
+        measured: List[Dict[str, Any]] = [row for row in rows
+                                          if row["topology"] == topology]
+        nodes: np.ndarray = np.array([row["nodes"] for row in measured],
+                                     dtype=np.float64)
+        if len(np.unique(nodes)) < 2:
+            continue
+        slopes[topology] = {}
+        for name in MEASUREMENTS:
+            values: np.ndarray = np.array([row[name] for row in measured],
+                                          dtype=np.float64)
+            if np.all(values > 0):
+                slopes[topology][name] = \
+                    float(np.polyfit(np.log(nodes), np.log(values), 1)[0])
+    return slopes
+
+
+def plot(rows: List[Dict[str, Any]], path: str) -> bool:
+    """
+    Plots every measurement against the amount of Nodes on log-log axes, a
+    line per topology
+
+    Parameters:
+    rows (List[Dict[str, Any]]): The rows of measure()
+    path (str): The path of the image to write
+
+    Returns:
+    bool: Whether the plot was written, False if matplotlib is missing
+    """
+    try:
+        import matplotlib # pylint: disable=import-outside-toplevel
+        matplotlib.use("Agg")
+        from matplotlib import pyplot # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return False
+    figure, axes = pyplot.subplots(1, len(MEASUREMENTS),
+                                   figsize=(5 * len(MEASUREMENTS), 4))
+    for axis, name in zip(axes, MEASUREMENTS):
+        for topology in dict.fromkeys(row["topology"] for row in rows):
+            measured: List[Dict[str, Any]] = [row for row in rows
+                                              if row["topology"] == topology]
+            axis.loglog([row["nodes"] for row in measured],
+                        [row[name] for row in measured], marker="o",
+                        label=topology)
+        axis.set_xlabel("nodes")
+        axis.set_title(name)
+    axes[0].legend()
+    figure.tight_layout()
+    figure.savefig(path)
+    pyplot.close(figure)
+    return True
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parses the command line arguments
+
+    Returns:
+    argparse.Namespace: The parsed arguments
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Time the building, routing and forwarding of synthetic "
+        "topologies of growing sizes")
+    parser.add_argument("--topologies", nargs="+", default=list(GENERATORS),
+                        choices=list(GENERATORS),
+                        help="The topologies to measure")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[4, 8, 16],
+                        help="The amounts of Routers to measure at")
+    parser.add_argument("--packets", type=int, default=100,
+                        help="The Packets every Host sends in the workload")
+    parser.add_argument("--repeats", type=int, default=3,
+                        help="The timings to take the shortest of")
+    parser.add_argument("--output", default="benchmark_results.json",
+                        help="Path of the JSON file to write the results to")
+    parser.add_argument("--plot", default=None,
+                        help="Path of the image to plot the scaling to")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """
+    Runs the benchmarks given on the command line
+    """
+    arguments: argparse.Namespace = parse_arguments()
+    rows: List[Dict[str, Any]] = []
+    for topology in arguments.topologies:
+        for size in arguments.sizes:
+            rows.append(measure(topology, size, arguments.packets,
+                                arguments.repeats))
+            print(f"{topology:<12} {rows[-1]['nodes']:>5} nodes  "
+                  f"build {rows[-1]['build_seconds']:.4f} s  "
+                  f"routes {rows[-1]['routes_seconds']:.4f} s  "
+                  f"workload {rows[-1]['workload_seconds']:.4f} s  "
+                  f"{rows[-1]['seconds_per_packet'] * 1e6:.1f} us / Packet  "
+                  f"{rows[-1]['bytes_per_node']:.0f} B / node")
+
+    results: Dict[str, Any] = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "packets": arguments.packets, "repeats": arguments.repeats,
+        "results": rows, "scaling": scaling(rows)}
+    with open(arguments.output, "w", encoding="utf-8") as output_file:
+        json.dump(results, output_file, indent=3)
+    if arguments.plot is not None and not plot(rows, arguments.plot):
+        print("matplotlib is not installed, no plot was written",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
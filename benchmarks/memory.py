@@ -0,0 +1,74 @@
+"""
+This module is the entry point of the memory footprint report\n
+It builds a Scenario given as a JSON file, or a synthetic topology, and
+prints (or writes) the memory its Network takes: per Node, per Route, per
+Interface and per Packet in flight, broken down by type and allocation
+site, and - with --until - the growth of the Router buffers, the Channel
+payloads and the traced memory during a run
+"""
+# Built-in modules
+import argparse
+import json
+from typing import Any, Dict
+
+# Self-made modules
+from src.engine.memory import memory_report
+from src.engine.scenario import Scenario
+from src.engine.topologies import GENERATORS
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parses the command line arguments
+
+    Returns:
+    argparse.Namespace: The parsed arguments
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Report the memory footprint of a Network")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--scenario", default=None,
+                        help="Path of the Scenario JSON file to build")
+    source.add_argument("--topology", default=None, choices=list(GENERATORS),
+                        help="The synthetic topology to build")
+    parser.add_argument("--size", type=int, default=16,
+                        help="The amount of Routers of the topology")
+    parser.add_argument("--hosts", type=int, default=2,
+                        help="The amount of Hosts of the topology")
+    parser.add_argument("--packets", type=int, default=100,
+                        help="The Packets every Host of the topology sends")
+    parser.add_argument("--until", type=float, default=None,
+                        help="Run the Network until the given simulated "
+                        "time, following the growth of its memory")
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="Simulated seconds between growth samples")
+    parser.add_argument("--top", type=int, default=15,
+                        help="The amount of types and allocation sites to "
+                        "report")
+    parser.add_argument("--output", default=None,
+                        help="Path of the JSON file to write the report to, "
+                        "instead of printing it")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """
+    Reports the memory footprint of the Network given on the command line
+    """
+    arguments: argparse.Namespace = parse_arguments()
+    scenario: Scenario = Scenario.load(arguments.scenario) \
+        if arguments.scenario is not None \
+        else GENERATORS[arguments.topology](arguments.size,
+                                            hosts=arguments.hosts,
+                                            packets=arguments.packets)
+    report: Dict[str, Any] = memory_report(scenario, arguments.until,
+                                           arguments.interval, arguments.top)
+    if arguments.output is not None:
+        with open(arguments.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=3)
+    else:
+        print(json.dumps(report, indent=3))
+
+
+if __name__ == "__main__":
+    main()
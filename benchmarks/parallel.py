@@ -0,0 +1,129 @@
+"""
+This module is the entry point of the parallel scaling benchmark\n
+It builds a Scenario given as a JSON file, or a synthetic topology, runs it
+on a single process, then cut into more and more partitions, and prints (or
+writes) the wall-clock time of every run, its speedup over the single
+process one, and its efficiency - the speedup per partition
+"""
+# Built-in modules
+import argparse
+import json
+import multiprocessing
+import time
+from typing import Any, Dict, List
+
+# Self-made modules
+from src.engine.parallel import ParallelSimulator
+from src.engine.scenario import Scenario
+from src.engine.simulator import Simulator
+from src.engine.topologies import GENERATORS
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parses the command line arguments
+
+    Returns:
+    argparse.Namespace: The parsed arguments
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Measure the speedup of partitioned runs")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--scenario", default=None,
+                        help="Path of the Scenario JSON file to run")
+    source.add_argument("--topology", default="line", choices=list(GENERATORS),
+                        help="The synthetic topology to run")
+    parser.add_argument("--size", type=int, default=32,
+                        help="The amount of Routers of the topology")
+    parser.add_argument("--hosts", type=int, default=8,
+                        help="The amount of Hosts of the topology")
+    parser.add_argument("--packets", type=int, default=500,
+                        help="The Packets every Host of the topology sends")
+    parser.add_argument("--until", type=float, default=60,
+                        help="The simulated time to run until")
+    parser.add_argument("--partitions", type=int, nargs="+", default=None,
+                        help="The amounts of partitions to run with, "
+                        "by default powers of 2 up to the amount of cores")
+    parser.add_argument("--output", default=None,
+                        help="Path of the JSON file to write the results to, "
+                        "instead of printing them")
+    return parser.parse_args()
+
+
+def default_partitions() -> List[int]:
+    """
+    Gets the powers of 2 up to the amount of cores, and the amount of cores
+
+    Returns:
+    List[int]: The amounts of partitions to run with
+    """
+    cores: int = multiprocessing.cpu_count()
+    parts: List[int] = []
+    count: int = 2
+    while count < cores:
+        parts.append(count)
+        count *= 2
+    return parts + [cores] if cores > 1 else [2]
+
+
+def measure_scaling(scenario: Scenario,
+                    until: float,
+                    partitions: List[int]
+                    ) -> List[Dict[str, Any]]:
+    """
+    Times the single-process run of a Scenario, and its partitioned runs\n
+    The partitioned times include starting the workers, as every worker
+    builds its own partition
+
+    Parameters:
+    scenario   (Scenario): The Scenario to run
+    until      (float): The simulated time to run until
+    partitions (List[int]): The amounts of partitions to run with
+
+    Returns:
+    List[Dict[str, Any]]: A row per run, with the amount of partitions, \
+                          the seconds it took, the speedup and efficiency
+    """
+    start: float = time.perf_counter()
+    simulator: Simulator = Simulator.from_scenario(scenario)
+    simulator.run(until)
+    single: float = time.perf_counter() - start
+    rows: List[Dict[str, Any]] = [{"partitions": 1, "seconds": single,
+                                   "speedup": 1.0, "efficiency": 1.0}]
+
+    for parts in partitions:
+        start = time.perf_counter()
+        parallel: ParallelSimulator = ParallelSimulator(scenario, parts)
+        parallel.run(until)
+        seconds: float = time.perf_counter() - start
+        rows.append({"partitions": parallel.parts, "seconds": seconds,
+                     "speedup": single / seconds,
+                     "efficiency": single / seconds / parallel.parts,
+                     "windows": parallel.windows,
+                     "lookahead": parallel.lookahead})
+    return rows
+
+
+def main() -> None:
+    """
+    Measures the speedup of the Scenario given on the command line
+    """
+    arguments: argparse.Namespace = parse_arguments()
+    scenario: Scenario = Scenario.load(arguments.scenario) \
+        if arguments.scenario is not None \
+        else GENERATORS[arguments.topology](arguments.size,
+                                            hosts=arguments.hosts,
+                                            packets=arguments.packets)
+    results: Dict[str, Any] = {
+        "cores": multiprocessing.cpu_count(),
+        "runs": measure_scaling(scenario, arguments.until,
+                                arguments.partitions or default_partitions())}
+    if arguments.output is not None:
+        with open(arguments.output, "w", encoding="utf-8") as output_file:
+            json.dump(results, output_file, indent=3)
+    else:
+        print(json.dumps(results, indent=3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""
+This module is the entry point of the performance regression gate\n
+It runs a fixed set of benchmarks of the hot paths many times, and compares
+the samples with the ones stored in a baseline JSON file with Welch's
+t-test: a benchmark regressed if it got slower (or bigger) by more than its
+threshold, and the 95% confidence interval of the difference of the means
+lies entirely above zero - so noise alone does not fail the gate\n
+The exit code is 1 if any benchmark regressed, and --update stores the
+current samples as the new baseline
+"""
+# Built-in modules
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+# Self-made modules
+from benchmarks.benchmark import measure_memory, time_workload
+from src.components.network import Network
+from src.engine.scenario import Scenario
+from src.engine.topologies import grid, line
+from src.utils.logger import Logger
+
+# The two-sided 95% critical values of Student's t distribution, for 1 to 30
+# degrees of freedom
+T_95: List[float] = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306,
+                     2.262, 2.228, 2.201, 2.179, 2.160, 2.145, 2.131, 2.120,
+                     2.110, 2.101, 2.093, 2.086, 2.080, 2.074, 2.069, 2.064,
+                     2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+
+# The threshold of the benchmarks not given one (relative slowdown)
+DEFAULT_THRESHOLD: float = 0.10
+
+
+def t_critical(degrees: float) -> float:
+    """
+    Gets the two-sided 95% critical value of Student's t distribution
+
+    Parameters:
+    degrees (float): The degrees of freedom
+
+    Returns:
+    float: The critical value, approximated beyond 30 degrees of freedom
+    """
+    if degrees < 1:
+        return T_95[0]
+    if degrees <= len(T_95):
+        return T_95[int(degrees) - 1]
+    return 1.960 + (T_95[-1] - 1.960) * len(T_95) / degrees
+
+
+def summarize(samples: List[float]) -> Dict[str, Any]:
+    """
+    Gets the mean of samples and its 95% confidence interval
+
+    Parameters:
+    samples (List[float]): The samples
+
+    Returns:
+    Dict[str, Any]: {samples, mean, stdev, ci_low, ci_high}
+    """
+    count: int = len(samples)
+    mean: float = sum(samples) / count
+    stdev: float = math.sqrt(sum((sample - mean) ** 2 for sample in samples) /
+                             (count - 1)) if count > 1 else 0.0
+    half: float = t_critical(count - 1) * stdev / math.sqrt(count)
+    return {"samples": samples, "mean": mean, "stdev": stdev,
+            "ci_low": mean - half, "ci_high": mean + half}
+
+
+def compare(baseline: Dict[str, Any],
+            current: Dict[str, Any],
+            threshold: float
+            ) -> Dict[str, Any]:
+    """
+    Compares the samples of a benchmark with its baseline, with the 95%
+    confidence interval of the difference of their means (Welch)
+
+    Parameters:
+    baseline  (Dict[str, Any]): The summary of the baseline samples
+    current   (Dict[str, Any]): The summary of the current samples
+    threshold (float): The relative change that counts as a regression
+
+    Returns:
+    Dict[str, Any]: {change (relative), diff_low, diff_high, verdict}, \
+                    where verdict is "regression", "improvement" or "same"
+    """
+    base_count: int = len(baseline["samples"])
+    count: int = len(current["samples"])
+    base_variance: float = baseline["stdev"] ** 2 / base_count
+    variance: float = current["stdev"] ** 2 / count
+    error: float = math.sqrt(base_variance + variance)
+    degrees: float = (base_variance + variance) ** 2 / \
+        (base_variance ** 2 / max(base_count - 1, 1) +
+         variance ** 2 / max(count - 1, 1)) if error > 0 else 1.0
+    difference: float = current["mean"] - baseline["mean"]
+    half: float = t_critical(degrees) * error
+    change: float = difference / baseline["mean"] if baseline["mean"] else 0.0
+
+    verdict: str = "same"
+    if change > threshold and difference - half > 0:
+        verdict = "regression"
+    elif change < -threshold and difference + half < 0:
+        verdict = "improvement"
+    return {"change": change, "diff_low": difference - half,
+            "diff_high": difference + half, "verdict": verdict}
+
+
+def routing_recompute() -> float:
+    """
+    Times recomputing every Route of a 16 Router grid
+
+    Returns:
+    float: The seconds a recomputation takes
+    """
+    network: Network = grid(16).build_network()
+    # Private, as it only runs when the topology changes
+    update: Callable[[], bool] = getattr(network,
+                                         "_Network__update_routing_tables")
+    start: float = time.perf_counter()
+    for _ in range(5):
+        update()
+    return (time.perf_counter() - start) / 5
+
+
+def packet_forwarding() -> float:
+    """
+    Times forwarding Packets along a line of 8 Routers
+
+    Returns:
+    float: The seconds a Packet takes, from sending to delivery
+    """
+    scenario: Scenario = line(8, packets=200)
+    scenario.duration = 20.0
+    seconds, packets = time_workload(scenario, 1)
+    return seconds / packets
+
+
+def statistics_refresh() -> float:
+    """
+    Times refreshing the PPV averages of a 16 Router grid with 8 Hosts
+
+    Returns:
+    float: The seconds a refresh takes
+    """
+    network: Network = grid(16, hosts=8).build_network()
+    # Private, as it only runs when a Packet is sent or received
+    refresh: Callable[[], None] = getattr(network, "_Network__refresh_avg_ppv")
+    start: float = time.perf_counter()
+    for _ in range(1000):
+        refresh()
+    return (time.perf_counter() - start) / 1000
+
+
+def logger_throughput() -> float:
+    """
+    Times writing entries into a Logger's file
+
+    Returns:
+    float: The seconds a write takes
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        config_path: str = os.path.join(directory, "logger_config.json")
+        with open(config_path, "w", encoding="utf-8") as config_file:
+            json.dump({"logfile_path": directory + os.sep,
+                       "logfile_name": "benchmark.log"}, config_file)
+        # The Logger creates ./logs, kept inside the temporary directory
+        working_directory: str = os.getcwd()
+        os.chdir(directory)
+        try:
+            logger: Logger = Logger(config_path)
+        finally:
+            os.chdir(working_directory)
+        start: float = time.perf_counter()
+        for index in range(200):
+            logger.write("Benchmark", f"Entry {index}", "INFO")
+        return (time.perf_counter() - start) / 200
+
+
+def memory_per_node() -> float:
+    """
+    Measures the memory a 16 Router grid takes
+
+    Returns:
+    float: The bytes per Node
+    """
+    scenario: Scenario = grid(16)
+    return measure_memory(scenario) / (len(scenario.routers) +
+                                       len(scenario.hosts))
+
+
+# Benchmark name -> the function taking a sample of it
+BENCHMARKS: Dict[str, Callable[[], float]] = {
+    "routing_recompute": routing_recompute,
+    "packet_forwarding": packet_forwarding,
+    "statistics_refresh": statistics_refresh,
+    "logger_throughput": logger_throughput,
+    "memory_per_node": memory_per_node}
+
+
+def run_benchmarks(names: List[str],
+                   repeats: int,
+                   inner: int = 3
+                   ) -> Dict[str, Dict[str, Any]]:
+    """
+    Takes repeated samples of benchmarks, after a warm-up run of each\n
+    Every sample is the best of a few runs, so a run slowed down by the
+    rest of the machine does not widen the confidence intervals
+
+    Parameters:
+    names   (List[str]): The names of the benchmarks to run
+    repeats (int): The amount of samples per benchmark
+    inner   (int): The amount of runs every sample is the best of
+
+    Returns:
+    Dict[str, Dict[str, Any]]: Benchmark name -> the summary of its samples
+    """
+    summaries: Dict[str, Dict[str, Any]] = {}
+    for name in names:
+        BENCHMARKS[name]()
+        summaries[name] = summarize([min(BENCHMARKS[name]()
+                                         for _ in range(inner))
+                                     for _ in range(repeats)])
+    return summaries
+
+
+def gate(baseline: Dict[str, Any],
+         current: Dict[str, Dict[str, Any]],
+         threshold: float = DEFAULT_THRESHOLD,
+         thresholds: Dict[str, float] = None
+         ) -> Dict[str, Dict[str, Any]]:
+    """
+    Compares every benchmark present in both the baseline and the current
+    run
+
+    Parameters:
+    baseline   (Dict[str, Any]): The baseline file's contents
+    current    (Dict[str, Dict[str, Any]]): The summaries of the current run
+    threshold  (float): The threshold of the benchmarks not given one
+    thresholds (Dict[str, float]): Benchmark name -> its threshold, over \
+                                   the ones stored in the baseline
+
+    Returns:
+    Dict[str, Dict[str, Any]]: Benchmark name -> the result of compare(), \
+                               with the threshold used
+    """
+    stored: Dict[str, float] = baseline.get("thresholds", {})
+    thresholds = {**stored, **(thresholds or {})}
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, summary in current.items():
+        if name not in baseline["benchmarks"]:
+            continue
+        used: float = thresholds.get(name, threshold)
+        results[name] = {"threshold": used,
+                         **compare(baseline["benchmarks"][name], summary, used)}
+    return results
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parses the command line arguments
+
+    Returns:
+    argparse.Namespace: The parsed arguments
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description="Compare the hot paths with a stored baseline")
+    parser.add_argument("--baseline", default="benchmarks/baseline.json",
+                        help="Path of the baseline JSON file")
+    parser.add_argument("--benchmarks", nargs="+", default=list(BENCHMARKS),
+                        choices=list(BENCHMARKS),
+                        help="The benchmarks to run")
+    parser.add_argument("--repeats", type=int, default=10,
+                        help="The samples taken of every benchmark")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="The relative slowdown counted as a regression, "
+                        "for the benchmarks without a threshold of their own")
+    parser.add_argument("--threshold-for", nargs="+", default=[],
+                        metavar="NAME=THRESHOLD",
+                        help="The thresholds of single benchmarks")
+    parser.add_argument("--update", action="store_true",
+                        help="Store the samples as the new baseline, "
+                        "keeping its thresholds, instead of comparing")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """
+    Runs the regression gate given on the command line
+    """
+    arguments: argparse.Namespace = parse_arguments()
+    thresholds: Dict[str, float] = {}
+    for pair in arguments.threshold_for:
+        name, value = pair.split("=", 1)
+        thresholds[name] = float(value)
+    current: Dict[str, Dict[str, Any]] = \
+        run_benchmarks(arguments.benchmarks, arguments.repeats)
+
+    baseline: Dict[str, Any] = None
+    if os.path.exists(arguments.baseline):
+        with open(arguments.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+
+    if arguments.update or baseline is None:
+        stored: Dict[str, float] = baseline.get("thresholds", {}) \
+            if baseline is not None else {}
+        with open(arguments.baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump({"python": platform.python_version(),
+                       "machine": platform.machine(),
+                       "thresholds": {**stored, **thresholds},
+                       "benchmarks": current}, baseline_file, indent=3)
+        print(f"Baseline written to {arguments.baseline}")
+        return
+
+    results: Dict[str, Dict[str, Any]] = \
+        gate(baseline, current, arguments.threshold, thresholds)
+    for name, result in results.items():
+        print(f"{name:<20} {current[name]['mean']:>12.4g} "
+              f"({result['change']:+.1%}, threshold {result['threshold']:.0%}) "
+              f"{result['verdict']}")
+    if any(result["verdict"] == "regression" for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,11 @@ options = [["--disable=C0103",
             "src/components/node.py"],
            ["--disable=R0903", "src/components/packet.py"],
            ["src/components/routing_table.py"],
+           ["src/components/probe.py"],
+           ["src/components/buffer_policy.py"],
+           ["src/components/marker.py"],
+           ["src/components/output_queue.py"],
+           ["src/components/feedback.py"],
            ["--disable=R0914",
             "--disable=C0103",
             "--disable=R1710",
@@ -37,7 +42,35 @@ options = [["--disable=C0103",
            ["--disable=R1732",
             "--disable=R0903",
             "src/utils/logger.py"],
+           ["src/utils/instrumentation.py"],
+           ["--disable=W0212",
+            "src/utils/profiler.py"],
            ["src/utils/regex_checker.py"],
+           ["src/utils/rng.py"],
+           ["--disable=R0902",
+            "src/engine/simulator.py"],
+           ["src/engine/scenario.py"],
+           ["src/engine/sweep.py"],
+           ["--disable=R0902",
+            "--disable=R0914",
+            "--disable=R0915",
+            "src/engine/fluid.py"],
+           ["src/engine/maxmin.py"],
+           ["src/engine/topologies.py"],
+           ["src/engine/memory.py"],
+           ["src/engine/checkpoint.py"],
+           ["src/engine/fairness.py"],
+           ["src/engine/flows.py"],
+           ["src/engine/latency.py"],
+           ["--disable=R0902",
+            "src/engine/metrics.py"],
+           ["--disable=R0902",
+            "src/engine/trace.py"],
+           ["--disable=R0913",
+            "src/engine/results.py"],
+           ["--disable=R0914",
+            "--disable=R0912",
+            "src/engine/parallel.py"],
            ["--disable=R0903",
             "src/graphic_handlers/main_window.py"],
            ["--disable=R0903",
@@ -52,7 +85,12 @@ options = [["--disable=C0103",
            ["src/event_handlers/object_canvas_handler.py"],
            ["src/event_handlers/object_frame_handler.py"],
            ["src/event_handlers/statistics_frame_handler.py"],
-           ["main.py"]]
+           ["main.py"],
+           ["simulate.py"],
+           ["benchmarks/benchmark.py"],
+           ["benchmarks/regression.py"],
+           ["benchmarks/memory.py"],
+           ["benchmarks/parallel.py"]]
 
 for option in options:
     lint_file(option)
@@ -2,9 +2,13 @@
 This module makes the Simulation object available for use when imported\n
 This is the main entry point of the program
 """
+import os
+
 from src.components.network import Network
 from src.event_handlers.main_handler import MainHandler
 from src.graphic_handlers.main_window import MainWindow
+from src.utils import instrumentation
+from src.utils.profiler import SamplingProfiler
 
 
 class Simulation:
@@ -28,7 +32,18 @@ class Simulation:
         """
         Starts the simulation, opening a new window
         """
+        # The stacks of the GUI's Threads are sampled if asked to
+        profile_path: str = os.environ.get("PPV_PROFILE")
+        profiler: SamplingProfiler = None
+        if profile_path:
+            profiler = SamplingProfiler()
+            profiler.start()
         self.main_window.mainloop()
+        if profiler is not None:
+            profiler.stop()
+            profiler.write(profile_path)
+        if instrumentation.ENABLED:
+            print(instrumentation.format_report())
 
 
 if __name__ == "__main__":
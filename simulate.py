@@ -0,0 +1,408 @@
+"""
+This module is the entry point of headless simulations\n
+It runs a Scenario described in a JSON file, without any GUI, and prints
+the statistics of the run, or sweeps it over a parameter grid
+"""
+# Built-in modules
+import argparse
+import json
+import sys
+from typing import Any, Callable, Dict, List
+
+# Self-made modules
+from src.engine.checkpoint import load_checkpoint, save_checkpoint
+from src.engine.fairness import FairnessMonitor
+from src.engine.flows import FlowTable
+from src.engine.fluid import FluidSimulator
+from src.engine.latency import LatencyRecorder
+from src.engine.maxmin import MaxMinSolver
+from src.engine.metrics import MetricsPublisher, MetricsServer
+from src.engine.parallel import ParallelSimulator
+from src.engine.results import TimeSeriesRecorder, write_bundle
+from src.engine.scenario import Scenario
+from src.engine.simulator import Simulator
+from src.engine.sweep import SweepRunner
+from src.engine.trace import TraceWriter
+from src.utils import instrumentation
+from src.utils.profiler import SamplingProfiler
+
+# The options only a single-process packet-level run supports, and the
+# attributes they are parsed into
+PACKET_LEVEL_OPTIONS: Dict[str, str] = {
+    "--trace": "trace", "--flows": "flows", "--fairness": "fairness",
+    "--checkpoint": "checkpoint", "--restore": "restore",
+    "--bundle": "bundle", "--metrics-port": "metrics_port"}
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parses the command line arguments of a headless run
+
+    Returns:
+    argparse.Namespace: The parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Headless PPV simulation")
+    parser.add_argument("scenario", help="Path of the Scenario JSON file")
+    parser.add_argument("--until", type=float, default=None,
+                        help="Simulated seconds to run "
+                        "(defaults to the Scenario's duration)")
+    parser.add_argument("--partitions", type=int, default=1,
+                        help="Amount of worker processes to partition the "
+                        "Network between")
+    parser.add_argument("--grid", default=None,
+                        help="Path of a parameter grid JSON file, runs a "
+                        "sweep over the Scenario instead of a single run")
+    parser.add_argument("--results", default="sweep_results.jsonl",
+                        help="The file sweep results are appended to, and "
+                        "resumed from")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Amount of worker processes of a sweep")
+    parser.add_argument("--checkpoint", default=None,
+                        help="Path to save the state of the run to")
+    parser.add_argument("--checkpoint-every", type=float, default=None,
+                        help="Simulated seconds between checkpoints "
+                        "(by default only saved at the end)")
+    parser.add_argument("--restore", default=None,
+                        help="Path of a checkpoint to continue the run from, "
+                        "instead of starting the Scenario")
+    parser.add_argument("--trace", default=None,
+                        help="Path to write a binary trace of every Packet "
+                        "event to")
+    parser.add_argument("--flows", default=None,
+                        help="Path to write the per-flow statistics to, as a "
+                        "compressed NumPy archive")
+    parser.add_argument("--latency", action="store_true",
+                        help="Measure the end-to-end latency and hop count "
+                        "of the delivered Packets, and print their summary")
+    parser.add_argument("--fairness", type=float, default=None,
+                        metavar="SECONDS",
+                        help="Keep Jain's fairness index, the value-weighted "
+                        "goodput and the PPV-weighted drop ratio, sampled "
+                        "with the given interval, and print their summary")
+    parser.add_argument("--bundle", default=None,
+                        help="Path to write every result of the run to, as "
+                        "a columnar results bundle (with --grid: the "
+                        "directory to write a bundle per point to)")
+    parser.add_argument("--sample-interval", type=float, default=1.0,
+                        help="Simulated seconds between the node and link "
+                        "samples of a results bundle")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        metavar="PORT",
+                        help="Serve the live counters of the run on the "
+                        "given localhost port, in the Prometheus text format")
+    parser.add_argument("--profile", default=None,
+                        help="Path to write the sampled stacks of the run "
+                        "to, in the collapsed-stack format of flame graphs")
+    parser.add_argument("--profile-frequency", type=float, default=100.0,
+                        metavar="HZ",
+                        help="Stack samples taken per second with --profile")
+    parser.add_argument("--fluid", type=float, default=None, metavar="DT",
+                        help="Run the array based fluid approximation with "
+                        "the given step length (in seconds) instead")
+    parser.add_argument("--estimate", action="store_true",
+                        help="Only print the max-min fair rate of every flow "
+                        "and the utilisation of the Links and Routers, "
+                        "without simulating")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    # Nothing is measured or saved outside a single-process packet-level run
+    for mode, used in (("--partitions", arguments.partitions > 1),
+                       ("--fluid", arguments.fluid is not None)):
+        unsupported: List[str] = [option for option, name in
+                                  PACKET_LEVEL_OPTIONS.items()
+                                  if getattr(arguments, name) is not None]
+        if mode == "--fluid" and arguments.latency:
+            unsupported.append("--latency")
+        if used and unsupported:
+            parser.error(f"{', '.join(unsupported)} can't be used with {mode}")
+    return arguments
+
+
+def estimate(scenario: Scenario) -> Dict[str, Any]:
+    """
+    Estimates the steady state of a Scenario with the MaxMinSolver
+
+    Parameters:
+    scenario (Scenario): The Scenario to estimate
+
+    Returns:
+    Dict[str, Any]: The flow rates and the utilisation, keyed by strings
+    """
+    solver: MaxMinSolver = MaxMinSolver(
+        scenario.build_network(),
+        [(flow["source"], flow["target"]) for flow in scenario.flows])
+    rates: Dict = solver.solve()
+    return {"rates": {f"{source} -> {target}": rate
+                      for (source, target), rate in rates.items()},
+            "utilisation": {" -> ".join(resource): share
+                            for resource, share in solver.utilisation().items()}}
+
+
+def measurement(simulator: Simulator, kind: type, create: Callable[[], Any]) -> Any:
+    """
+    Gets the probe of a kind attached to a Simulator - a restored one keeps
+    the probes it was saved with, so their measurements cover the whole run -
+    or attaches a new one
+
+    Parameters:
+    simulator (Simulator): The Simulator to get the probe of
+    kind      (type): The class of the probe
+    create    (Callable[[], Any]): Creates the probe if there is none
+
+    Returns:
+    Any: The probe
+    """
+    for probe in simulator.network.probes.probes:
+        if isinstance(probe, kind):
+            return probe
+    probe: Any = create()
+    simulator.network.attach_probe(probe)
+    return probe
+
+
+def main() -> None:
+    """
+    Runs the Scenario given on the command line, sampling its stacks if
+    asked to
+    """
+    arguments: argparse.Namespace = parse_arguments()
+    if arguments.profile is None:
+        run(arguments)
+        return
+    profiler: SamplingProfiler = SamplingProfiler(arguments.profile_frequency)
+    profiler.start()
+    try:
+        run(arguments)
+    finally:
+        profiler.stop()
+        profiler.write(arguments.profile)
+
+
+def run_sweep(scenario: Scenario, arguments: argparse.Namespace) -> None:
+    """
+    Sweeps the Scenario over the parameter grid given on the command line
+
+    Parameters:
+    scenario  (Scenario): The Scenario to sweep
+    arguments (argparse.Namespace): The parsed command line arguments
+    """
+    with open(arguments.grid, encoding="utf-8") as grid_file:
+        grid: Dict[str, Any] = json.load(grid_file)
+    if arguments.until is not None:
+        scenario.duration = arguments.until
+    failed: int = SweepRunner(scenario, grid, arguments.results,
+                              arguments.workers,
+                              bundle_dir=arguments.bundle).run()
+    print(f"Sweep finished, {failed} point(s) failed")
+
+
+def run_fluid(scenario: Scenario,
+              arguments: argparse.Namespace,
+              until: float
+              ) -> Dict[str, Any]:
+    """
+    Runs the fluid approximation of the Scenario
+
+    Parameters:
+    scenario  (Scenario): The Scenario to run
+    arguments (argparse.Namespace): The parsed command line arguments
+    until     (float): The simulated time to run until
+
+    Returns:
+    Dict[str, Any]: The statistics of the run
+    """
+    fluid: FluidSimulator = FluidSimulator(scenario, arguments.fluid)
+    fluid.run(until)
+    return fluid.statistics()
+
+
+def run_parallel(scenario: Scenario,
+                 arguments: argparse.Namespace,
+                 until: float
+                 ) -> Dict[str, Any]:
+    """
+    Runs the Scenario cut into partitions, on multiple processes
+
+    Parameters:
+    scenario  (Scenario): The Scenario to run
+    arguments (argparse.Namespace): The parsed command line arguments
+    until     (float): The simulated time to run until
+
+    Returns:
+    Dict[str, Any]: The statistics of the run, with the latency summary if \
+                    it was measured
+    """
+    parallel: ParallelSimulator = \
+        ParallelSimulator(scenario, arguments.partitions,
+                          measure_latency=arguments.latency)
+    statistics: Dict[str, Any] = parallel.run(until)
+    if parallel.latency is not None:
+        statistics["latency"] = parallel.latency.summary()
+    return statistics
+
+
+def attach_measurements(simulator: Simulator,
+                        arguments: argparse.Namespace
+                        ) -> Dict[str, Any]:
+    """
+    Attaches the probes measuring what the command line asks for - every
+    one of them for a results bundle
+
+    Parameters:
+    simulator (Simulator): The Simulator to measure
+    arguments (argparse.Namespace): The parsed command line arguments
+
+    Returns:
+    Dict[str, Any]: The attached probes by name, None for the ones not needed
+    """
+    bundle: bool = arguments.bundle is not None
+    probes: Dict[str, Any] = {"trace": None, "latency": None,
+                              "fairness": None, "flows": None,
+                              "series": None}
+    if arguments.trace is not None:
+        probes["trace"] = TraceWriter(arguments.trace, simulator.network,
+                                      simulator.clock)
+        simulator.network.attach_probe(probes["trace"])
+    if arguments.latency or bundle:
+        probes["latency"] = measurement(
+            simulator, LatencyRecorder,
+            lambda: LatencyRecorder(simulator.clock))
+    if arguments.fairness is not None or bundle:
+        probes["fairness"] = measurement(
+            simulator, FairnessMonitor,
+            lambda: FairnessMonitor(simulator.clock,
+                                    arguments.fairness or
+                                    arguments.sample_interval))
+    if arguments.flows is not None or bundle:
+        probes["flows"] = measurement(simulator, FlowTable, FlowTable)
+    if bundle:
+        probes["series"] = measurement(
+            simulator, TimeSeriesRecorder,
+            lambda: TimeSeriesRecorder(simulator.network, simulator.clock,
+                                       arguments.sample_interval))
+    return probes
+
+
+def run_checkpointed(simulator: Simulator,
+                     arguments: argparse.Namespace,
+                     until: float
+                     ) -> None:
+    """
+    Runs the Simulator, saving its state at the end, or in chunks if asked to
+
+    Parameters:
+    simulator (Simulator): The Simulator to run
+    arguments (argparse.Namespace): The parsed command line arguments
+    until     (float): The simulated time to run until
+    """
+    if arguments.checkpoint is not None and \
+       arguments.checkpoint_every is not None:
+        # Run in chunks, saving the state after every one of them
+        while simulator.now < until:
+            simulator.run(min(simulator.now + arguments.checkpoint_every,
+                              until))
+            save_checkpoint(simulator, arguments.checkpoint)
+    else:
+        simulator.run(until)
+        if arguments.checkpoint is not None:
+            save_checkpoint(simulator, arguments.checkpoint)
+
+
+def run_with_metrics(simulator: Simulator,
+                     arguments: argparse.Namespace,
+                     until: float
+                     ) -> None:
+    """
+    Runs the Simulator, serving its live counters while it runs if asked to
+
+    Parameters:
+    simulator (Simulator): The Simulator to run
+    arguments (argparse.Namespace): The parsed command line arguments
+    until     (float): The simulated time to run until
+    """
+    if arguments.metrics_port is None:
+        run_checkpointed(simulator, arguments, until)
+        return
+    metrics: MetricsServer = MetricsServer(port=arguments.metrics_port)
+    metrics.start()
+    publisher: MetricsPublisher = MetricsPublisher(simulator, metrics)
+    publisher.publish()
+    simulator.network.attach_probe(publisher)
+    run_checkpointed(simulator, arguments, until)
+    publisher.publish()
+    metrics.stop()
+
+
+def run_packet_level(scenario: Scenario,
+                     arguments: argparse.Namespace,
+                     until: float
+                     ) -> Dict[str, Any]:
+    """
+    Runs the Scenario on a single process, Packet by Packet, measuring and
+    saving what the command line asks for
+
+    Parameters:
+    scenario  (Scenario): The Scenario to run
+    arguments (argparse.Namespace): The parsed command line arguments
+    until     (float): The simulated time to run until
+
+    Returns:
+    Dict[str, Any]: The statistics of the run, with the summaries of the \
+                    measurements asked for
+    """
+    simulator: Simulator = load_checkpoint(arguments.restore) \
+        if arguments.restore is not None \
+        else Simulator.from_scenario(scenario)
+    probes: Dict[str, Any] = attach_measurements(simulator, arguments)
+    run_with_metrics(simulator, arguments, until)
+
+    if probes["trace"] is not None:
+        probes["trace"].close()
+    if arguments.flows is not None:
+        probes["flows"].save(arguments.flows)
+    statistics: Dict[str, Any] = simulator.statistics()
+    if arguments.bundle is not None:
+        write_bundle(arguments.bundle,
+                     {"scenario": arguments.scenario, "until": until,
+                      "seed": scenario.seed, "events": simulator.processed},
+                     statistics, probes["flows"], probes["series"],
+                     probes["fairness"], probes["latency"])
+    if arguments.latency:
+        statistics["latency"] = probes["latency"].summary()
+    if arguments.fairness is not None:
+        statistics["fairness"] = probes["fairness"].summary()
+    return statistics
+
+
+def run(arguments: argparse.Namespace) -> None:
+    """
+    Runs the Scenario given on the command line, in the mode it asks for
+
+    Parameters:
+    arguments (argparse.Namespace): The parsed command line arguments
+    """
+    scenario: Scenario = Scenario.load(arguments.scenario)
+    until: float = arguments.until if arguments.until is not None \
+        else scenario.duration
+
+    if arguments.estimate:
+        print(json.dumps(estimate(scenario), indent=3))
+        return
+    if arguments.grid is not None:
+        run_sweep(scenario, arguments)
+        return
+
+    statistics: Dict[str, Any]
+    if arguments.fluid is not None:
+        statistics = run_fluid(scenario, arguments, until)
+    elif arguments.partitions > 1:
+        statistics = run_parallel(scenario, arguments, until)
+    else:
+        statistics = run_packet_level(scenario, arguments, until)
+
+    print(json.dumps(statistics, indent=3))
+    if instrumentation.ENABLED:
+        print(instrumentation.format_report(), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
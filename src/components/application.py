@@ -1,6 +1,13 @@
 """
 This module makes Application objects available for use when imported
 """
+# Built-in modules
+from typing import Dict
+
+# Third-party modules
+import numpy as np
+
+# Self-made modules
 from src.components.packet import Packet
 
 
@@ -15,6 +22,7 @@ class Application:
     send_rate (int): How many Packets to send per second
     curr_sent (int): Total number of Packets sent since initialization
     app_type  (str): The type of the application (AIMD, CONST)
+    verbose  (bool): Whether received Packets are printed or not
     """
 
     def __init__(self,
@@ -30,6 +38,7 @@ class Application:
         self.send_rate: int = send_rate
         self.app_type:  str = app_type.upper()
         self.curr_sent: int = 0
+        self.verbose:   bool = True
 
     def can_send(self) -> bool:
         """
@@ -56,11 +65,37 @@ class Application:
         if self.can_send():
             # If yes, increase the sent Packets by 1, and return the Packet
             self.curr_sent += 1
-            packet: Packet = Packet(self.ip, target_ip, ppv, size)
+            packet: Packet = Packet(self.ip, target_ip, ppv, size,
+                                    self.curr_sent)
             return packet
 
         return None
 
+    def send_batch(self,
+                   ppvs: np.ndarray,
+                   sizes: np.ndarray
+                   ) -> Dict[str, np.ndarray]:
+        """
+        Sends as many of the given Packets as the Application still can, in
+        one step, as columns instead of Packet objects
+
+        Parameters:
+        ppvs  (np.ndarray): The PPV of every Packet to send
+        sizes (np.ndarray): The size of every Packet to send
+
+        Returns:
+        Dict[str, np.ndarray]: The packet_id, ppv and size columns of the \
+                               Packets actually sent (maybe none of them)
+        """
+        count: int = max(0, min(len(ppvs), self.amount - self.curr_sent))
+        # Packet ids continue from the last one, the same way as in send()
+        packet_ids: np.ndarray = np.arange(self.curr_sent + 1,
+                                           self.curr_sent + count + 1)
+        self.curr_sent += count
+        return {"packet_id": packet_ids,
+                "ppv": ppvs[:count],
+                "size": sizes[:count]}
+
     def receive(self, packet: Packet) -> None:
         """
         Handles a Packet coming in from the Node
@@ -68,7 +103,10 @@ class Application:
         Parameters:
         packet (Packet): The Packet to handle
         """
-        print(f"Received packet on {self.name}:\n{packet}")
+        # Headless runs turn this off, since printing every single Packet
+        # would dominate the runtime
+        if self.verbose:
+            print(f"Received packet on {self.name}:\n{packet}")
 
     def __str__(self) -> str:
         return (f"{self.name} - {self.ip}:\n"
@@ -0,0 +1,228 @@
+"""
+This module makes buffer policies available for use when imported\n
+A buffer policy decides what happens to a Packet arriving at a Router:
+whether it is put into the buffer, dropped, or put into the buffer in
+place of a buffered Packet
+"""
+
+# Built-in modules
+import heapq
+from typing import Any, Dict, List, Tuple
+
+# Self-made modules
+from src.components.packet import Packet
+
+
+class FullBufferPolicy:
+    """
+    The original policy of the Router: Packets are only dropped when the
+    buffer is full, and then the lowest PPV Packet of the buffer is replaced
+    by the incoming one, if the incoming one has a higher PPV
+    """
+
+    def admit(self, router, packet: Packet) -> Packet:
+        """
+        Decides which Packet to drop because of an arriving Packet
+
+        Parameters:
+        router (Router): The Router the Packet arrives at
+        packet (Packet): The arriving Packet
+
+        Returns:
+        Packet: None if nothing has to be dropped, the incoming Packet if \
+                it has to be dropped, or the buffered Packet to replace
+        """
+        if len(router.buffer) < router.buffer_size:
+            return None
+        buffer_packet: Packet = router.lowest_buffer_ppv()
+        if buffer_packet is not None and buffer_packet.ppv < packet.ppv:
+            return buffer_packet
+        return packet
+
+    def admit_batch(self,
+                    router,
+                    packets: List[Packet]
+                    ) -> Tuple[List[Packet], List[Packet]]:
+        """
+        Decides for Packets arriving at the same time, with the exact same
+        outcome as calling admit() for them one by one\n
+        The buffer is kept as a heap keyed by (PPV, position), so finding the
+        Packet to drop - the first lowest PPV one - does not need a scan
+
+        Parameters:
+        router  (Router): The Router the Packets arrive at
+        packets (List[Packet]): The arriving Packets, in arrival order
+
+        Returns:
+        Tuple[List[Packet], List[Packet]]: The new buffer, and for every \
+                                           arriving Packet, the Packet \
+                                           dropped because of it, or None
+        """
+        entries: List[Packet] = router.buffer + packets
+        kept: int = min(router.buffer_size, len(entries))
+        drops: List[Packet] = [None] * (kept - len(router.buffer))
+
+        # Positions grow with the arrival order, the same order the
+        # sequential buffer is kept in
+        heap: List[Tuple[int, int]] = [(entry.ppv, position) for position,
+                                       entry in enumerate(entries[:kept])]
+        heapq.heapify(heap)
+        for position in range(kept, len(entries)):
+            packet: Packet = entries[position]
+            if heap and heap[0][0] < packet.ppv:
+                drops.append(entries[
+                    heapq.heapreplace(heap, (packet.ppv, position))[1]])
+            else:
+                drops.append(packet)
+
+        return ([entries[position]
+                 for position in sorted(item[1] for item in heap)], drops)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Gets the description of the policy, as used in a Scenario
+
+        Returns:
+        Dict[str, Any]: The description of the policy
+        """
+        return {"type": "FULL"}
+
+
+class CTVPolicy:
+    """
+    Core-stateless PPV active queue management\n
+    The Router keeps a histogram of the PPVs of recent arrivals, and once
+    every interval (counted in arrivals), computes the congestion threshold
+    value (CTV): the lowest PPV still admitted, picked so that the admitted
+    share of the arrivals keeps the buffer occupancy around its target.
+    Packets below the CTV are dropped on arrival, and when the buffer is
+    full, the incoming Packet is - so every arrival costs a histogram
+    increment and a comparison
+
+    Data members:
+    interval         (int): The amount of arrivals between CTV updates
+    target_occupancy (float): The target share of the buffer to keep filled
+    target_delay     (float): The target queueing delay in seconds, used \
+                              instead of target_occupancy if given
+    gain             (float): How fast the admitted share follows the error
+    ctv              (int): The current congestion threshold value
+    admitted_share   (float): The share of arrivals to admit
+    histogram        (List[int]): PPV -> arrivals since the last update
+    """
+
+    def __init__(self,
+                 interval: int = 32,
+                 target_occupancy: float = 0.5,
+                 target_delay: float = None,
+                 gain: float = 0.5
+                 ) -> None:
+        self.interval:         int = max(1, int(interval))
+        self.target_occupancy: float = target_occupancy
+        self.target_delay:     float = target_delay
+        self.gain:             float = gain
+        self.ctv:              int = 0
+        self.admitted_share:   float = 1.0
+        self.histogram:        List[int] = []
+        self.__arrivals:       int = 0
+
+    def __target(self, router) -> float:
+        """
+        Gets the buffer occupancy to aim for
+
+        Parameters:
+        router (Router): The Router the policy is used on
+
+        Returns:
+        float: The target amount of Packets in the buffer
+        """
+        if self.target_delay is not None:
+            return min(self.target_delay * router.send_rate, router.buffer_size)
+        return self.target_occupancy * router.buffer_size
+
+    def __update(self, router) -> None:
+        """
+        Computes the next CTV from the histogram and the buffer occupancy,
+        and starts a new histogram
+
+        Parameters:
+        router (Router): The Router the policy is used on
+        """
+        if router.buffer_size > 0:
+            error: float = (len(router.buffer) - self.__target(router)) / \
+                router.buffer_size
+            self.admitted_share = \
+                min(1.0, max(0.0, self.admitted_share - self.gain * error))
+
+        # The CTV is the lowest PPV where the arrivals at or above it still
+        # fit into the admitted share - but never above the highest PPV that
+        # arrived, so the most valuable Packets are admitted even when the
+        # share runs out, and the buffer can't starve
+        budget: float = self.admitted_share * self.__arrivals
+        admitted: int = 0
+        self.ctv = len(self.histogram)
+        for ppv in range(len(self.histogram) - 1, -1, -1):
+            if admitted + self.histogram[ppv] > budget:
+                break
+            admitted += self.histogram[ppv]
+            self.ctv = ppv
+        self.ctv = min(self.ctv, max((ppv for ppv, count in
+                                      enumerate(self.histogram) if count > 0),
+                                     default=0))
+        self.histogram = [0] * len(self.histogram)
+        self.__arrivals = 0
+
+    def admit(self, router, packet: Packet) -> Packet:
+        """
+        Decides which Packet to drop because of an arriving Packet
+
+        Parameters:
+        router (Router): The Router the Packet arrives at
+        packet (Packet): The arriving Packet
+
+        Returns:
+        Packet: None if nothing has to be dropped, or the incoming Packet
+        """
+        ppv: int = max(packet.ppv, 0)
+        if ppv >= len(self.histogram):
+            self.histogram.extend([0] * (ppv + 1 - len(self.histogram)))
+        self.histogram[ppv] += 1
+        self.__arrivals += 1
+
+        drop: bool = ppv < self.ctv or len(router.buffer) >= router.buffer_size
+        if self.__arrivals == self.interval:
+            self.__update(router)
+        return packet if drop else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Gets the description of the policy, as used in a Scenario
+
+        Returns:
+        Dict[str, Any]: The description of the policy
+        """
+        return {"type": "CTV", "interval": self.interval,
+                "target_occupancy": self.target_occupancy,
+                "target_delay": self.target_delay, "gain": self.gain}
+
+
+def create_policy(description: Dict[str, Any]):
+    """
+    Creates a buffer policy from its description
+
+    Parameters:
+    description (Dict[str, Any]): {type, parameters...}, where type is \
+                                  FULL or CTV
+
+    Returns:
+    FullBufferPolicy | CTVPolicy: The created policy
+
+    Raises:
+    ValueError: If the type of the policy is unknown
+    """
+    parameters: Dict[str, Any] = dict(description)
+    policy_type: str = str(parameters.pop("type", "FULL")).upper()
+    if policy_type == "FULL":
+        return FullBufferPolicy()
+    if policy_type == "CTV":
+        return CTVPolicy(**parameters)
+    raise ValueError(f"Unknown buffer policy {policy_type}")
@@ -0,0 +1,148 @@
+"""
+This module makes FeedbackRelay objects available for use when imported
+"""
+
+# Built-in modules
+from typing import Dict, List, Tuple
+
+# Self-made modules
+from src.components.routing_table import Route
+from src.utils import instrumentation
+from src.utils.instrumentation import timed
+
+
+class FeedbackRelay:
+    """
+    Sends the feedback of a Router back to the Nodes handling it\n
+    The receivers of a source are found by following the Routes back,
+    through as many Routers as needed, and are kept until the topology
+    changes
+
+    Data members:
+    router (Router): The Router the feedback is sent from
+    window (float): If positive, feedback is added up per source, and sent \
+                    once per window (in seconds) by the Simulator
+    """
+
+    def __init__(self, router) -> None:
+        self.router:      object = router
+        self.window:      float = 0.0
+        self.__receivers: Dict[str, List[Tuple[object, float]]] = {}
+        self.__topology:  object = None
+        self.__pending:   Dict[str, List[int]] = {}
+
+    def find_receivers(self,
+                       packet_source: str,
+                       visited: set
+                       ) -> List[Tuple[object, float]]:
+        """
+        Finds the Nodes that handle the feedback of the given source, by
+        following the Routes back, through as many Routers as needed
+
+        Parameters:
+        packet_source (str): The source to send feedback to
+        visited       (set): The Routers already on the way, to stop on loops
+
+        Returns:
+        List[Tuple[Node, float]]: The Nodes to give the feedback to (once per \
+                                  Link leading to them), with the delay of \
+                                  the Links on the way to them
+        """
+        route: Route = self.router.get_best_route(packet_source)
+        if route is None:
+            return []
+
+        receivers: List[Tuple[object, float]] = []
+        visited.add(self.router)
+        for connection in self.router.connections:
+            neighbour: object = connection[1][1]
+            if neighbour.ip != route.gateway:
+                continue
+            speed: int = connection[0][0].send_channel.speed
+            delay: float = 1 / speed if speed > 0 else 0.0
+            relay: FeedbackRelay = getattr(neighbour, "feedback", None)
+            if not isinstance(relay, FeedbackRelay):
+                receivers.append((neighbour, delay))
+            elif neighbour not in visited:
+                receivers.extend(
+                    (receiver, delay + further) for receiver, further in
+                    relay.find_receivers(packet_source, visited))
+        visited.discard(self.router)
+        return receivers
+
+    def get_receivers(self, packet_source: str) -> List[Tuple[object, float]]:
+        """
+        Gets the Nodes that handle the feedback of the given source\n
+        They are looked up only once, and kept until the topology changes
+
+        Parameters:
+        packet_source (str): The source to send feedback to
+
+        Returns:
+        List[Tuple[Node, float]]: The Nodes, with the delay of the path to them
+        """
+        if self.__topology is not self.router.topology:
+            self.__receivers = {}
+            self.__topology = self.router.topology
+
+        receivers: List[Tuple[object, float]] = \
+            self.__receivers.get(packet_source)
+        if receivers is None:
+            receivers = self.find_receivers(packet_source, set())
+            self.__receivers[packet_source] = receivers
+            instrumentation.count("Router.feedback_lookups")
+        return receivers
+
+    @timed()
+    def send(self, packet_source: str, feedback: int, count: int = 1) -> None:
+        """
+        Sends feedback data to the Nodes handling the given source\n
+        Sending is a single call on the cached receivers, instead of passing
+        the feedback on hop by hop - or, if there is a window, the feedback is
+        only added up, until flush() is called
+
+        Parameters:
+        packet_source (str): The received Packet's source IP
+        feedback      (int): The feedback data being sent back
+        count         (int): How many times the same feedback is sent
+        """
+        if self.window > 0:
+            pending: List[int] = self.__pending.get(packet_source)
+            if pending is None:
+                pending = [0, 0]
+                self.__pending[packet_source] = pending
+            pending[0 if feedback == 1 else 1] += count
+            return
+
+        # The method is looked up on every call, so replacing it on a Host
+        # still takes effect
+        for receiver, _ in self.get_receivers(packet_source):
+            receiver.receive_feedback(packet_source, feedback, count)
+
+    def has_pending(self) -> bool:
+        """
+        Tells whether there is added up feedback waiting to be flushed
+
+        Returns:
+        bool: Whether there is pending feedback
+        """
+        return len(self.__pending) != 0
+
+    def flush(self) -> List[Tuple[object, str, int, int, float]]:
+        """
+        Takes the feedback added up during the current window - the caller
+        delivers it to the receivers, after the delay of the path
+
+        Returns:
+        List[Tuple[Node, str, int, int, float]]: (receiver, source, \
+                                                 positive count, negative \
+                                                 count, delay) per receiver
+        """
+        flushed: List[Tuple[object, str, int, int, float]] = []
+        for packet_source, (positive, negative) in self.__pending.items():
+            for receiver, delay in self.get_receivers(packet_source):
+                flushed.append((receiver, packet_source, positive, negative,
+                                delay))
+        self.__pending = {}
+        instrumentation.count("Router.feedback_summaries", len(flushed))
+        return flushed
@@ -2,7 +2,7 @@
 This module makes Interface objects available for use when imported
 """
 # Self-made modules
-from src.components.link import Channel, Link
+from src.components.link import BACKPRESSURE, Channel, Link
 from src.components.packet import Packet
 
 
@@ -57,7 +57,7 @@ class Interface:
              before disconnecting the Link
         """
         # Get the amount of Packets dropped
-        packets_dropped: int = len(self.receive_channel.payload)
+        packets_dropped: int = self.receive_channel.in_flight
 
         # Set the Link and Channels to the default state
         self.link = None
@@ -79,14 +79,29 @@ class Interface:
 
         return None
 
-    def put_to_link(self, packet: Packet) -> None:
+    def put_to_link(self, packet: Packet) -> Packet:
         """
         Puts a packet onto the sending Channel
 
         Parameters:
         packet (Packet): The Packet to send through the sending Channel
+
+        Returns:
+        Packet: The Packet dropped because the Channel was full, or None
+        """
+        return self.send_channel.fill_payload(packet)
+
+    def is_blocked(self) -> bool:
+        """
+        Gets whether the sending Channel is full, and pushes back on the
+        Interface, so nothing should be sent through it for now
+
+        Returns:
+        bool: Whether the Interface is blocked
         """
-        self.send_channel.fill_payload(packet)
+        return self.send_channel is not None and \
+            self.send_channel.overflow == BACKPRESSURE and \
+            self.send_channel.is_full()
 
     def __str__(self) -> str:
         return (f"Interface name: {self.name}\n"
@@ -2,54 +2,138 @@
 This module makes Channel and Link objects available for use when imported
 """
 # Built-in modules
+import math
 from typing import List
 
 # Self-made modules
 from src.components.packet import Packet
 
+# What a full Channel does with one more Packet
+DROP_TAIL:    str = "DROP_TAIL"     # The incoming Packet is dropped
+DROP_LOWEST:  str = "DROP_LOWEST"   # The lowest PPV Packet is dropped
+BACKPRESSURE: str = "BACKPRESSURE"  # The sending Interface is blocked
+OVERFLOWS:    List[str] = [DROP_TAIL, DROP_LOWEST, BACKPRESSURE]
+
 
 class Channel:
     """
-    Abstract representation of a one-directional dataflow in a duplex Link
+    Abstract representation of a one-directional dataflow in a duplex Link\n
+    A Channel can hold any amount of Packets by default, or up to its
+    capacity, past which its overflow behaviour decides what happens
 
     Data members:
     speed           (int): 1 / speed is the time needed for the Packet to pass \
                     through the Channel
     metrics         (int): Abstract immutable metric number set upon creation
-    payload: List[Packet]: Packets currently traveling through the Channel
+    payload: List[Packet]: Packets currently traveling through the Channel, \
+                           with None in place of the dropped ones
+    capacity        (int): The most Packets in flight, or None if unbounded
+    overflow        (str): DROP_TAIL, DROP_LOWEST or BACKPRESSURE
+    in_flight       (int): The Packets currently traveling through the Channel
+    dropped         (int): The Packets dropped because the Channel was full
     """
 
     def __init__(self,
                  speed: int,
                  metrics: int
                  ) -> None:
-        self.speed:   int = speed
-        self.metrics: int = metrics
-        self.payload: List[Packet] = []
+        self.speed:     int = speed
+        self.metrics:   int = metrics
+        self.payload:   List[Packet] = []
+        self.capacity:  int = None
+        self.overflow:  str = DROP_TAIL
+        self.in_flight: int = 0
+        self.dropped:   int = 0
+
+    def set_capacity(self,
+                     capacity: int = None,
+                     delay: float = None,
+                     overflow: str = DROP_TAIL
+                     ) -> None:
+        """
+        Bounds the Packets in flight, either explicitly, or by the
+        bandwidth-delay product of the Channel
+
+        Parameters:
+        capacity (int): The most Packets in flight, or None
+        delay    (float): The delay (in seconds) to hold the Packets sent \
+                          at full speed for, if no capacity is given
+        overflow (str): What happens to a Packet sent into a full Channel
+
+        Raises:
+        ValueError: If the overflow behaviour is unknown, or the capacity is \
+                    not positive
+        """
+        overflow = overflow.upper()
+        if overflow not in OVERFLOWS:
+            raise ValueError(f"Unknown overflow behaviour {overflow}")
+        if capacity is None and delay is not None:
+            capacity = max(1, math.ceil(self.speed * delay))
+        if capacity is not None and capacity < 1:
+            raise ValueError(f"Invalid capacity {capacity}")
+        self.capacity = capacity
+        self.overflow = overflow
+
+    def is_full(self) -> bool:
+        """
+        Gets whether the Channel holds as many Packets as it can
+
+        Returns:
+        bool: Whether the Channel is full
+        """
+        return self.capacity is not None and self.in_flight >= self.capacity
 
-    def fill_payload(self, packet: Packet) -> None:
+    def fill_payload(self, packet: Packet) -> Packet:
         """
-        Adds a Packet to the payload to send it to the receiving side
+        Adds a Packet to the payload to send it to the receiving side\n
+        If the Channel is full, a Packet is dropped: the incoming one, or the
+        lowest PPV one in flight with DROP_LOWEST - its place is kept as None,
+        so the Packets after it still arrive in their own time
 
         Parameters:
         packet (Packet): The packet to send through the Channel
+
+        Returns:
+        Packet: The dropped Packet, or None
         """
+        if not self.is_full():
+            self.payload.append(packet)
+            self.in_flight += 1
+            return None
+
+        self.dropped += 1
+        if self.overflow != DROP_LOWEST:
+            return packet
+        lowest: int = None
+        for position, in_flight in enumerate(self.payload):
+            if in_flight is not None and \
+               (lowest is None or in_flight.ppv < self.payload[lowest].ppv):
+                lowest = position
+        if lowest is None or self.payload[lowest].ppv >= packet.ppv:
+            return packet
+        dropped: Packet = self.payload[lowest]
+        self.payload[lowest] = None
         self.payload.append(packet)
+        return dropped
 
     def pop_payload(self) -> Packet:
         """
         Removes and returns the first element from the payload
 
         Returns:
-        Packet: The Packet added first or None if the payload is empty
+        Packet: The Packet added first or None if the payload is empty, or \
+                the Packet was dropped
         """
         # The try-except block is needed in case there is no item present in the
         # payload, because the List default behaviour throws an exception in that
         # case
         try:
-            return self.payload.pop(0)
+            packet: Packet = self.payload.pop(0)
         except IndexError:
             return None
+        if packet is not None:
+            self.in_flight -= 1
+        return packet
 
     def __str__(self) -> str:
         return (f"Speed: {1 / self.speed} second(s) / Packet\n"
@@ -71,5 +155,26 @@ class Link:
         self.channels: List[Channel] = \
             [Channel(speed, metrics), Channel(speed, metrics)]
 
+    def set_capacity(self,
+                     capacity: int = None,
+                     delay: float = None,
+                     overflow: str = DROP_TAIL
+                     ) -> None:
+        """
+        Bounds the Packets in flight in both directions
+
+        Parameters:
+        capacity (int): The most Packets in flight per direction, or None
+        delay    (float): The delay (in seconds) to hold the Packets sent \
+                          at full speed for, if no capacity is given
+        overflow (str): What happens to a Packet sent into a full Channel
+
+        Raises:
+        ValueError: If the overflow behaviour is unknown, or the capacity is \
+                    not positive
+        """
+        for channel in self.channels:
+            channel.set_capacity(capacity, delay, overflow)
+
     def __str__(self) -> str:
         return f"Link:\n---\n{self.channels[0]}"
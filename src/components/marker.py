@@ -0,0 +1,299 @@
+"""
+This module makes Packet markers and DrawBlock objects available for use
+when imported\n
+A marker gives the PPV of the Packets a Host sends, using the Host's own
+random streams and its current send rate
+"""
+
+# Built-in modules
+import math
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+# Third-party modules
+import numpy as np
+
+# Throughput (Packets / second) -> value curves of the built-in traffic
+# classes, gold being worth the most at every throughput
+CURVES: Dict[str, Callable[[float], float]] = {
+    "GOLD":       lambda throughput: 10 * math.exp(-throughput / 60),
+    "SILVER":     lambda throughput: 7 * math.exp(-throughput / 30),
+    "BACKGROUND": lambda throughput: 4 * math.exp(-throughput / 10),
+}
+
+
+class TenColorGoldMarker:
+    """
+    The original marker of the Host: PPVs are uniform from 1 to 10, but
+    Hosts sending slower than 10 Packets / second only send the higher ones
+    """
+
+    def mark(self, host) -> int:
+        """
+        Gives the PPV of the next Packet of a Host
+
+        Parameters:
+        host (Host): The sending Host
+
+        Returns:
+        int: The PPV of the Packet
+        """
+        if host.send_rate < 10:
+            return host.rng.randint(10 - host.send_rate, 10)
+        return host.rng.randint(1, 10)
+
+    def mark_draw(self, host, draw: float) -> int:
+        """
+        Gives the PPV of the next Packet of a Host from a uniform draw made
+        earlier, at its current send rate
+
+        Parameters:
+        host (Host): The sending Host
+        draw (float): A uniform draw from [0, 1)
+
+        Returns:
+        int: The PPV of the Packet
+        """
+        lowest: int = 10 - host.send_rate if host.send_rate < 10 else 1
+        return lowest + int(draw * (11 - lowest))
+
+    def mark_batch(self, host, count: int) -> np.ndarray:
+        """
+        Gives the PPVs of the next Packets of a Host in one step, at its
+        current send rate
+
+        Parameters:
+        host  (Host): The sending Host
+        count (int): The amount of PPVs to give
+
+        Returns:
+        np.ndarray: The PPVs of the Packets
+        """
+        lowest: int = 10 - host.send_rate if host.send_rate < 10 else 1
+        return host.batch_rng.integers(lowest, 11, size=count)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Gets the description of the marker, as used in a Scenario
+
+        Returns:
+        Dict[str, Any]: The description of the marker
+        """
+        return {"type": "TEN_COLOR_GOLD"}
+
+
+class TVFMarker:
+    """
+    Marks Packets by a throughput-value function (TVF): a Packet of a Host
+    sending at rate R gets the value of the TVF at a uniformly random
+    throughput between 0 and R, so the first Packets / second are worth
+    the most\n
+    The TVF is evaluated only once, into a lookup table over the
+    throughputs from 0 to max_throughput - marking is a random draw and an
+    index into the table\n
+    The table ends at max_throughput, so Hosts sending faster are marked as
+    if they sent at max_throughput: the TVF should be flat by then
+
+    Data members:
+    name           (str): The traffic class, or "custom"
+    max_throughput (float): The highest throughput in the table
+    table          (np.ndarray): Throughput step -> PPV
+    points         (List[Tuple[float, float]]): The (throughput, value) \
+                                                points of the TVF, if it was \
+                                                given by points
+    """
+
+    def __init__(self,
+                 tvf: Callable[[float], float] = None,
+                 points: Sequence[Tuple[float, float]] = None,
+                 name: str = "custom",
+                 max_throughput: float = 100.0,
+                 resolution: int = 1024,
+                 table: Sequence[int] = None
+                 ) -> None:
+        if max_throughput <= 0 or resolution < 1:
+            raise ValueError("A TVF needs a positive max_throughput and "
+                             "resolution")
+        self.name:           str = name
+        self.max_throughput: float = float(max_throughput)
+        self.points:         List[Tuple[float, float]] = \
+            [tuple(point) for point in points] if points is not None else None
+
+        throughputs: np.ndarray = \
+            (np.arange(resolution) + 0.5) * self.max_throughput / resolution
+        if table is not None:
+            # A table sampled earlier, from a function that is gone
+            if len(table) < 1:
+                raise ValueError("A TVF table needs at least one value")
+            values: np.ndarray = np.array(table, dtype=np.float64)
+            resolution = len(values)
+        elif self.points is not None:
+            values = np.interp(throughputs,
+                               [point[0] for point in self.points],
+                               [point[1] for point in self.points])
+        elif tvf is not None:
+            values = np.array([tvf(throughput) for throughput in throughputs])
+        else:
+            raise ValueError("A TVF needs a function or points")
+        # PPVs are whole numbers, and every Packet is worth something
+        self.table: np.ndarray = np.maximum(np.rint(values), 1).astype(np.int64)
+        self.__scale: float = resolution / self.max_throughput
+        # Indexing a list is much cheaper than a NumPy array one by one
+        self.__values: List[int] = self.table.tolist()
+
+    def __index(self, send_rate: float, draws):
+        """
+        Gets the table indices of uniform draws at a send rate
+
+        Parameters:
+        send_rate (float): The send rate of the Host
+        draws     (float | np.ndarray): Uniform draws from [0, 1)
+
+        Returns:
+        int | np.ndarray: The indices into the table
+        """
+        return np.minimum((draws * (send_rate * self.__scale)).astype(np.int64),
+                          len(self.table) - 1)
+
+    def mark(self, host) -> int:
+        """
+        Gives the PPV of the next Packet of a Host
+
+        Parameters:
+        host (Host): The sending Host
+
+        Returns:
+        int: The PPV of the Packet
+        """
+        return self.mark_draw(host, host.rng.random())
+
+    def mark_draw(self, host, draw: float) -> int:
+        """
+        Gives the PPV of the next Packet of a Host from a uniform draw made
+        earlier, at its current send rate
+
+        Parameters:
+        host (Host): The sending Host
+        draw (float): A uniform draw from [0, 1)
+
+        Returns:
+        int: The PPV of the Packet
+        """
+        return self.__values[min(int(draw * host.send_rate * self.__scale),
+                                 len(self.__values) - 1)]
+
+    def mark_batch(self, host, count: int) -> np.ndarray:
+        """
+        Gives the PPVs of the next Packets of a Host in one step, at its
+        current send rate
+
+        Parameters:
+        host  (Host): The sending Host
+        count (int): The amount of PPVs to give
+
+        Returns:
+        np.ndarray: The PPVs of the Packets
+        """
+        return self.table[self.__index(host.send_rate,
+                                       host.batch_rng.random(count))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Gets the description of the marker, as used in a Scenario - markers
+        made from a custom function are described by their table
+
+        Returns:
+        Dict[str, Any]: The description of the marker
+        """
+        description: Dict[str, Any] = {"type": "TVF",
+                                        "max_throughput": self.max_throughput}
+        if self.points is not None:
+            description["resolution"] = len(self.table)
+            description["points"] = [list(point) for point in self.points]
+        elif self.name in CURVES:
+            description["resolution"] = len(self.table)
+            description["curve"] = self.name
+        else:
+            description["name"] = self.name
+            description["table"] = self.table.tolist()
+        return description
+
+
+class DrawBlock:
+    """
+    Uniform draws and Packet sizes, drawn from the batch_rng of a Host a
+    block at a time, instead of one by one\n
+    The marker of the Host turns each draw into a PPV at the send rate of
+    the moment, so the block is kept when the rate changes
+
+    Data members:
+    size (int): The amount of draws in a block
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size:    int = size
+        # The drawn block, and the next draw in it
+        self.__draws: List[float] = []
+        self.__sizes: List[int] = []
+        self.__drawn: int = 0
+
+    def draw(self, host) -> Tuple[int, int]:
+        """
+        Gets the PPV and size of the next Packet of a Host, drawing a new
+        block when the current one is used up
+
+        Parameters:
+        host (Host): The Host sending the Packet
+
+        Returns:
+        Tuple[int, int]: The PPV and the size
+        """
+        if self.__drawn >= len(self.__draws):
+            self.refill(host)
+        self.__drawn += 1
+        return (host.marker.mark_draw(host, self.__draws[self.__drawn - 1]),
+                self.__sizes[self.__drawn - 1])
+
+    def refill(self, host) -> None:
+        """
+        Draws a new block from the batch_rng of a Host, dropping what is left
+        of the current one
+
+        Parameters:
+        host (Host): The Host to draw for
+        """
+        self.__draws = host.batch_rng.random(self.size).tolist()
+        self.__sizes = host.batch_rng.integers(1, 11, size=self.size).tolist()
+        self.__drawn = 0
+
+
+def create_marker(description: Dict[str, Any]):
+    """
+    Creates a marker from its description
+
+    Parameters:
+    description (Dict[str, Any]): {type, parameters...}, where type is \
+                                  TEN_COLOR_GOLD or TVF, and a TVF either \
+                                  has a curve (GOLD, SILVER, BACKGROUND), \
+                                  (throughput, value) points, or the table \
+                                  of PPVs it was sampled into
+
+    Returns:
+    TenColorGoldMarker | TVFMarker: The created marker
+
+    Raises:
+    ValueError: If the type of the marker or the curve is unknown, or the \
+                TVF is invalid
+    """
+    parameters: Dict[str, Any] = dict(description)
+    marker_type: str = str(parameters.pop("type", "TEN_COLOR_GOLD")).upper()
+    if marker_type == "TEN_COLOR_GOLD":
+        return TenColorGoldMarker()
+    if marker_type == "TVF":
+        curve: str = parameters.pop("curve", None)
+        if curve is not None:
+            if curve.upper() not in CURVES:
+                raise ValueError(f"Unknown TVF curve {curve}")
+            return TVFMarker(CURVES[curve.upper()], name=curve.upper(),
+                             **parameters)
+        return TVFMarker(**parameters)
+    raise ValueError(f"Unknown marker {marker_type}")
@@ -6,13 +6,19 @@ intended way
 """
 
 # Built-in modules
-from typing import List, Tuple
+from typing import Callable, List, Tuple
 
 # Self-made modules
 from src.components.interface import Interface
+from src.components.link import DROP_TAIL
 from src.components.node import Host, Node, Router
+from src.components.packet import Packet
+from src.components.probe import Probes, ignore
 from src.components.routing_table import Route
+from src.utils import instrumentation
 from src.utils.graph import Graph
+from src.utils.instrumentation import timed
+from src.utils.rng import create_generator, create_rng
 
 
 class Network:
@@ -25,6 +31,11 @@ class Network:
     graph:       (Graph): A Graph built up of the Nodes in the Network
     total_pack   (int): The total amount of Packets sent out
     dropped_pack (int): The total amount of Packets droped
+    seed         (int): The master seed every Host's random stream is \
+                 derived from, or None for unseeded (irreproducible) runs
+    probes       (Probes): The probes attached to every Node
+    clock        (Callable[[], float]): Gives the current time to the Hosts, \
+                 to stamp their Packets with, or None
     """
 
     def __init__(self) -> None:
@@ -37,6 +48,9 @@ class Network:
         self.avg_ppv_sent:     float = 0.0
         self.avg_ppv_dropped:  float = 0.0
         self.avg_ppv_received: float = 0.0
+        self.seed:             int = None
+        self.probes:           Probes = Probes()
+        self.clock:            Callable[[], float] = None
 
     def get_nodes(self) -> List[Node]:
         """
@@ -47,6 +61,65 @@ class Network:
         """
         return self.hosts + self.routers
 
+    def set_seed(self, seed: int) -> None:
+        """
+        Sets the master seed of the Network, and reseeds the random stream
+        of every Host with one derived from it\n
+        The same seed and the same Network produce the same Packets
+
+        Parameters:
+        seed (int): The master seed, or None for unseeded runs
+        """
+        self.seed = seed
+        for host in self.hosts:
+            host.rng = create_rng(seed, host.ip)
+            host.batch_rng = create_generator(seed, host.ip)
+
+    def __set_probe(self, node: Node) -> None:
+        """
+        Gives the attached probes to a Node - or the probe ignoring every
+        event, if there are none, so the Node does not even have to loop
+
+        Parameters:
+        node (Node): The Node to set the probes of
+        """
+        node.probe = self.probes if len(self.probes) > 0 else ignore
+
+    def attach_probe(self, probe) -> None:
+        """
+        Attaches a probe to every Node, current and future, which gets called
+        with (event, Node, Packet, value) on every Packet event
+
+        Parameters:
+        probe (Callable): The probe to attach
+        """
+        self.probes.attach(probe)
+        for node in self.get_nodes():
+            self.__set_probe(node)
+
+    def detach_probe(self, probe) -> None:
+        """
+        Detaches a probe from every Node
+
+        Parameters:
+        probe (Callable): The probe to detach
+        """
+        self.probes.detach(probe)
+        for node in self.get_nodes():
+            self.__set_probe(node)
+
+    def set_clock(self, clock: Callable[[], float]) -> None:
+        """
+        Gives a clock to every Host, current and future, so the Packets they
+        send carry their birth time
+
+        Parameters:
+        clock (Callable[[], float]): Gives the current time, or None
+        """
+        self.clock = clock
+        for host in self.hosts:
+            host.clock = clock
+
     def get_host(self, host_name_or_ip: str) -> Host:
         """
         Gets the Host corresponding to the name
@@ -62,6 +135,7 @@ class Network:
                 return host
         return None
 
+    @timed()
     def __refresh_avg_ppv(self) -> None:
         # Get the sum from Hosts
         self.avg_ppv_sent = 0.0
@@ -83,6 +157,7 @@ class Network:
         if self.dropped_pack > 0:
             self.avg_ppv_dropped /= float(self.dropped_pack)
 
+    @timed()
     def __update_routing_tables(self) -> bool:
         """
         Updates the RoutingTable of every single Node in the Network with the
@@ -119,6 +194,10 @@ class Network:
                                                route_tuple[3]))
                 except:
                     return False
+        if instrumentation.ENABLED:
+            instrumentation.count("Network.routes_computed",
+                                  sum(len(node.routing_table.routes)
+                                      for node in nodes))
         return True
 
     def __is_duplicate_node(self, node_name: str, ip: str) -> bool:
@@ -158,7 +237,11 @@ class Network:
             return False
 
         # If not, create it, and then update the RoutingTable of every Node
-        self.hosts.append(Host(host_name, ip, send_rate))
+        self.hosts.append(Host(host_name, ip, send_rate,
+                               create_rng(self.seed, ip),
+                               create_generator(self.seed, ip)))
+        self.__set_probe(self.hosts[-1])
+        self.hosts[-1].clock = self.clock
         return self.__update_routing_tables()
 
     def delete_host(self, host_name_or_ip: str) -> bool:
@@ -233,6 +316,7 @@ class Network:
 
         # If not, create it, and then update the RoutingTable of every Node
         self.routers.append(Router(router_name, ip, send_rate, buffer_size))
+        self.__set_probe(self.routers[-1])
         return self.__update_routing_tables()
 
     def delete_router(self, router_name_or_ip: str) -> bool:
@@ -367,6 +451,89 @@ class Network:
 
         return True
 
+    def set_marker(self, host_name_or_ip: str, marker) -> bool:
+        """
+        Sets the marker giving the PPV of a Host's Packets
+
+        Parameters:
+        host_name_or_ip (str): The name or IP of the Host
+        marker          (TenColorGoldMarker | TVFMarker): The marker to set
+
+        Returns:
+        bool: Whether setting the marker was a success or not
+        """
+        host: Host = self.get_host(host_name_or_ip)
+
+        # If no such Host was found, return with False
+        if host is None:
+            return False
+
+        host.marker = marker
+        return True
+
+    def set_buffer_policy(self, router_name_or_ip: str, policy) -> bool:
+        """
+        Sets the policy deciding which Packets a Router drops
+
+        Parameters:
+        router_name_or_ip (str): The name or IP of the Router
+        policy            (FullBufferPolicy | CTVPolicy): The policy to set
+
+        Returns:
+        bool: Whether setting the policy was a success or not
+        """
+        router: Router = self.get_router(router_name_or_ip)
+
+        # If no such Router was found, return with False
+        if router is None:
+            return False
+
+        router.policy = policy
+        return True
+
+    def set_feedback_window(self, router_name_or_ip: str, window: float) -> bool:
+        """
+        Sets how long a Router adds up feedback before sending it
+
+        Parameters:
+        router_name_or_ip (str): The name or IP of the Router
+        window            (float): The window in seconds, 0 to send \
+                                   feedback right away
+
+        Returns:
+        bool: Whether setting the window was a success or not
+        """
+        router: Router = self.get_router(router_name_or_ip)
+
+        # If no such Router was found, or the window is invalid, return with
+        # False
+        if router is None or window < 0:
+            return False
+
+        router.feedback.window = window
+        return True
+
+    def set_output_queues(self, router_name_or_ip: str, enabled: bool) -> bool:
+        """
+        Sets whether a Router keeps a separate output queue per Interface,
+        instead of a single, shared buffer
+
+        Parameters:
+        router_name_or_ip (str): The name or IP of the Router
+        enabled           (bool): Whether to use output queues
+
+        Returns:
+        bool: Whether setting the output queues was a success or not
+        """
+        router: Router = self.get_router(router_name_or_ip)
+
+        # If no such Router was found, return with False
+        if router is None:
+            return False
+
+        router.set_output_queues(enabled)
+        return True
+
     def can_send(self, host_name_or_ip: str) -> bool:
         """
         Gets whether the Host can send or not
@@ -413,6 +580,51 @@ class Network:
         # Else, return the speed
         return interface.send_channel.speed
 
+    def set_link_capacity(self,
+                          node_name_or_ip: str,
+                          interface_name: str,
+                          capacity: int = None,
+                          delay: float = None,
+                          overflow: str = DROP_TAIL
+                          ) -> bool:
+        """
+        Bounds the Packets in flight on the Link connected to the given
+        Interface, in both directions
+
+        Parameters:
+        node_name_or_ip (str): The name or IP of the Node
+        interface_name  (str): The name of the Interface
+        capacity        (int): The most Packets in flight, or None
+        delay           (float): The delay (in seconds) to hold the Packets \
+                                 sent at full speed for, if no capacity is given
+        overflow        (str): DROP_TAIL, DROP_LOWEST or BACKPRESSURE
+
+        Returns:
+        bool: Whether setting the capacity was a success or not
+        """
+        # Get the Node
+        node: Node = self.get_host(node_name_or_ip) or \
+            self.get_router(node_name_or_ip)
+
+        # If no such Node was found, return with False
+        if node is None:
+            return False
+
+        # Get the Interface
+        interface: Interface = node.get_interface(interface_name)
+
+        # If no such Interface was found, or it's not connected, return with
+        # False
+        if interface is None or interface.link is None:
+            return False
+
+        # The capacity or the overflow behaviour can still be invalid
+        try:
+            interface.link.set_capacity(capacity, delay, overflow)
+        except ValueError:
+            return False
+        return True
+
     def connect_node_interfaces(self,
                                 node_name_or_ip: str,
                                 o_node_name_or_ip: str,
@@ -510,7 +722,8 @@ class Network:
 
     def send_packet(self,
                     node_name_or_ip: str,
-                    destination_name_or_ip: str = ""
+                    destination_name_or_ip: str = "",
+                    now: float = None
                     ) -> Tuple[str, str, str]:
         """
         Starts sending a Packet to the given destination from the given Node\n
@@ -525,6 +738,8 @@ class Network:
         Parameters:
         node_name_or_ip        (str): The Node's name or IP to send from
         destination_name_or_ip (str): The name or IP address of the goal Node
+        now                    (float): The current simulated time, used by \
+                                        Routers with output queues, or None
 
         Returns:
         Tuple[str, str, str]: A (gateway, receiver_interface, destination) trio
@@ -540,21 +755,38 @@ class Network:
         # Get the destination Node
         destination_node: Node = self.get_host(destination_name_or_ip) or \
             self.get_router(destination_name_or_ip)
+        destination_ip: str = destination_node.ip \
+            if destination_node is not None else None
+
+        # A destination outside the Network, such as in another partition of
+        # a bigger one, can still be sent to by its IP, if there is a Route
+        if destination_node is None and host is not None and \
+           host.get_best_route(destination_name_or_ip) is not None:
+            destination_ip = destination_name_or_ip
 
         # If either of them is None, return with None
         # Needed to check like this, because Router does not require a destination
         # to send
-        if ((host and destination_node) is None) and (router is None):
+        if ((host and destination_ip) is None) and (router is None):
             return None
 
         # If the source Node is a Host, we need to add a parameter when using
         # the method
+        # Packets dropped by full Links are counted on the Nodes
+        link_dropped: int = node.link_dropped
         if router is None:
-            next_hop: Tuple[str, str] = node.send_packet(destination_node.ip)
+            # Nothing is sent while the Link pushes back
+            if node.is_blocked(destination_ip):
+                return None
+            next_hop: Tuple[str, str] = node.send_packet(destination_ip)
             self.total_pack += 1
         # If it is a Router, it just pops a Packet from its buffer
         else:
-            next_hop: Tuple[str, str] = node.send_packet()
+            buffer_length: int = router.get_buffer_length()
+            next_hop: Tuple[str, str] = node.send_packet(now)
+            # Nothing was taken from the buffer, so nothing was dropped
+            if next_hop is None and router.get_buffer_length() == buffer_length:
+                return None
 
         # Check if there is a Route (or in this case, a next hop), and if there
         # is none, then increase the dropped Packets and return None
@@ -562,6 +794,7 @@ class Network:
             self.dropped_pack += 1
             self.__refresh_avg_ppv()
             return None
+        self.dropped_pack += node.link_dropped - link_dropped
 
         # Else return the next hop, the next hop's receiver interface and the
         # actual destination of the Packet, for future use by other classes
@@ -598,10 +831,12 @@ class Network:
         if node is None:
             return False
 
-        # If the Node is a Host, we are done
+        # If the Node is a Host, we are done - a slot emptied by a dropped
+        # Packet is not counted as received
         if router is None:
-            self.received_pack += 1
             success: bool = node.receive_packet(interface_name)
+            if success:
+                self.received_pack += 1
             self.__refresh_avg_ppv()
             return success
 
@@ -616,3 +851,36 @@ class Network:
 
         # Return the success / failure
         return ret_val[0]
+
+    def receive_batch(self,
+                      router_name_or_ip: str,
+                      interface_names: List[str]
+                      ) -> int:
+        """
+        Receives the Packets arriving at the same time on a Router, one from
+        each given Interface (in the given order), with a single admission
+        step - the outcome is the same as calling receive_packet() for each
+
+        Parameters:
+        router_name_or_ip (str): The name or IP of the receiving Router
+        interface_names   (List[str]): The names of the receiving Interfaces
+
+        Returns:
+        int: The amount of Packets received
+        """
+        router: Router = self.get_router(router_name_or_ip)
+        if router is None:
+            return 0
+
+        packets: List[Packet] = []
+        for interface_name in interface_names:
+            interface: Interface = router.get_interface(interface_name)
+            if interface is not None:
+                packet: Packet = interface.receive_from_link()
+                if packet is not None:
+                    packets.append(packet)
+
+        received, dropped = router.receive_batch(packets)
+        self.dropped_pack += dropped
+        self.__refresh_avg_ppv()
+        return received
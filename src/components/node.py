@@ -6,14 +6,25 @@ This module makes Node, Host and Router objects available for use when imported
 from __future__ import annotations # Needed to be able to store
                                    # the same object as the class itself
 import random
-from typing import List, Tuple
+from typing import Callable, Dict, List, Tuple
+
+# Third-party modules
+import numpy as np
 
 # Self-made modules
 from src.components.application import Application
+from src.components.buffer_policy import FullBufferPolicy
+from src.components.feedback import FeedbackRelay
 from src.components.interface import Interface
 from src.components.link import Link
+from src.components.marker import DrawBlock, TenColorGoldMarker
+from src.components.output_queue import OutputQueue, OutputQueues
 from src.components.packet import Packet
+from src.components.probe import (DELIVER, DEQUEUE, DROP, ENQUEUE, FEEDBACK,
+                                  SEND, ignore)
 from src.components.routing_table import Route, RoutingTable
+from src.utils import instrumentation
+from src.utils.instrumentation import timed
 
 
 class Node:
@@ -30,8 +41,20 @@ class Node:
     connections  (List[(Interface, Node), \
                       (Interface, Node)]): Node - Node connections
     routing_table          (RoutingTable): Routing table on the Node
+    probe                      (Callable): Called with (event, Node, Packet, \
+                                           value) on Packet events - by \
+                                           default, the one ignoring them
+    link_dropped                    (int): The Packets dropped because a \
+                                           sending Channel was full
     """
 
+    # Replaced whenever the Routes or connections of any Node change, so
+    # anything cached from other Nodes can tell it is out of date
+    topology: object = object()
+
+    # Replaced by the Network with the probes attached to it
+    probe: Callable[[int, Node, Packet, int], None] = staticmethod(ignore)
+
     def __init__(self, name: str, ip: str, send_rate: int) -> None:
         self.name:          str = name
         self.ip:            str = ip
@@ -40,6 +63,7 @@ class Node:
         self.connections:   List[Tuple[Tuple[Interface, Node],
                                  Tuple[Interface, Node]]] = []
         self.routing_table: RoutingTable = RoutingTable()
+        self.link_dropped:  int = 0
 
     def add_route(self, route: Route) -> None:
         """
@@ -48,8 +72,10 @@ class Node:
         Parameters:
         route (Route): The route to add
         """
+        Node.topology = object()
         self.routing_table.set_route(route)
 
+    @timed()
     def get_best_route(self, destination: str) -> Route:
         """
         Get the best Route that matches the destination's IP address or nothing
@@ -73,10 +99,46 @@ class Node:
 
         return best_route
 
+    def is_blocked(self, destination: str) -> bool:
+        """
+        Gets whether the Interface towards the destination is blocked by a
+        full Channel pushing back
+
+        Parameters:
+        destination (str): The IP address of the destination Node
+
+        Returns:
+        bool: Whether nothing should be sent towards the destination for now
+        """
+        route: Route = self.get_best_route(destination)
+        if route is None:
+            return False
+        interface: Interface = self.get_interface(route.interface)
+        return interface is not None and interface.is_blocked()
+
+    def _put_to_link(self, interface: Interface, packet: Packet) -> Packet:
+        """
+        Puts a Packet onto the Link of an Interface, accounting for the
+        Packet dropped if the Channel is full
+
+        Parameters:
+        interface (Interface): The sending Interface
+        packet    (Packet): The Packet to send
+
+        Returns:
+        Packet: The dropped Packet (the sent one or one in flight), or None
+        """
+        dropped: Packet = interface.put_to_link(packet)
+        if dropped is not None:
+            self.link_dropped += 1
+            self.probe(DROP, self, dropped, 0)
+        return dropped
+
     def reset_routes(self):
         """
         Resets the Node's RoutingTable to a default state - making it empty
         """
+        Node.topology = object()
         self.routing_table.reset_routes()
 
     def add_interface(self, name: str) -> bool:
@@ -127,6 +189,7 @@ class Node:
         Tuple[bool, int]: Whether deleting the interface was successful or not \
                           and the amount of Packets dropped
         """
+        Node.topology = object()
         interface: Interface = self.get_interface(name)
         pack_dropped: int = 0
 
@@ -170,6 +233,7 @@ class Node:
         Tuple[bool, int]: Whether creating the connection was successful or not \
                           and how many Packets were dropped
         """
+        Node.topology = object()
         pack_dropped: int = 0
 
         # Check if the __o Node is equal to the Node itself
@@ -222,6 +286,7 @@ class Node:
         Tuple[bool, int]: Whether disconnecting the Interface was successful or not, \
                           and how many Packets were dropped
         """
+        Node.topology = object()
         self_interface: Interface = self.get_interface(name)
         pack_dropped: int = 0
 
@@ -250,7 +315,11 @@ class Node:
 
         return (True, pack_dropped)
 
-    def receive_feedback(self, packet_source: str, feedback: int) -> None:
+    def receive_feedback(self,
+                         packet_source: str,
+                         feedback: int,
+                         count: int = 1
+                         ) -> None:
         """
         Receives feedback - should not be called, only used
         because of polymorphism's sake
@@ -275,17 +344,37 @@ class Host(Node):
     application             (Application): The Application on the Host
     ppv_received            (int): The PPV sum of the Packets received
     ppv_sent                (int): The PPV sum of the Packets sent
+    rng           (random.Random): The Host's own random number stream, \
+                                   used for PPV and Packet size
+    batch_rng (np.random.Generator): The Host's own stream for drawing PPVs \
+                                     and sizes in bulk
+    marker (TenColorGoldMarker | TVFMarker): Gives the PPV of the Packets
+    clock     (Callable[[], float]): Gives the current time, to stamp the \
+                                     Packets sent with, or None
+    draws             (DrawBlock): If set, the PPVs and sizes are drawn \
+                                   with batch_rng a block at a time, \
+                                   instead of one by one with rng
     """
 
+    # Replaced by the Network with its clock, and the marker set for the Host
+    clock:  Callable[[], float] = None
+    marker: TenColorGoldMarker = TenColorGoldMarker()
+
     def __init__(self,
                  name: str,
                  ip: str,
                  send_rate: int,
+                 rng: random.Random = None,
+                 batch_rng: np.random.Generator = None
                  ) -> None:
         super().__init__(name, ip, send_rate)
         self.application: Application = None
         self.ppv_received: int = 0
         self.ppv_sent:     int = 0
+        self.rng:          random.Random = rng or random.Random()
+        self.batch_rng:    np.random.Generator = \
+            batch_rng if batch_rng is not None else np.random.default_rng()
+        self.draws:        DrawBlock = None
 
     def set_application(self,
                         name: str,
@@ -316,8 +405,9 @@ class Host(Node):
         Returns:
         Tuple[str, str]: The next hop in the Route and the receiving Interface
         """
-        # Check if the destination we would like to send to is equal to this Host
-        if destination == self.ip:
+        # Check if the destination we would like to send to is equal to this
+        # Host, or the Link towards it pushes back
+        if destination == self.ip or self.is_blocked(destination):
             return None
 
         # Only send, if the Application still have Packets to send
@@ -326,13 +416,14 @@ class Host(Node):
             # Also fetch the best possible Route to the destination
             # Currently, the size of a Packet does not matter, because
             # there is no policy enforced that could use it
-            ppv: int = self.calculate_ppv()
-            packet: Packet = self.application.send(destination, ppv,
-                                                   random.randint(1, 10))
+            ppv, size = self.__draw()
+            packet: Packet = self.application.send(destination, ppv, size)
             route: Route = self.get_best_route(destination)
 
             # Check if the destination can be reached, and the Packet was created
             if (route and packet) is None:
+                if packet is not None:
+                    self.probe(DROP, self, packet, 0)
                 return None
 
             # Go through the Interfaces until we find the one that matches the
@@ -346,17 +437,34 @@ class Host(Node):
                             receiver_interface = connection[1][0].name
                             break
 
-                    # Put the Packet to the Link
-                    interface.put_to_link(packet)
+                    if self.clock is not None:
+                        packet.birth_time = self.clock()
 
                     # Save the PPV for statistics in Network
                     self.ppv_sent += ppv
+                    self.probe(SEND, self, packet, 0)
+
+                    # Put the Packet to the Link, unless it is full
+                    if self._put_to_link(interface, packet) is packet:
+                        return None
 
                     # Return the next hop and it's corresponding receiver Interface
                     return route.gateway, receiver_interface
 
         return None
 
+    def __draw(self) -> Tuple[int, int]:
+        """
+        Gets the PPV and size of the next Packet - one by one, or from the
+        block of draws, if there is one
+
+        Returns:
+        Tuple[int, int]: The PPV and the size
+        """
+        if self.draws is None:
+            return self.calculate_ppv(), self.rng.randint(1, 10)
+        return self.draws.draw(self)
+
     def receive_packet(self, name: str) -> bool:
         """
         Handles an incoming Packet accordingly - consumes it in this case
@@ -383,35 +491,46 @@ class Host(Node):
 
             # Save the PPV for statistics in Network
             self.ppv_received += packet.ppv
+            self.probe(DELIVER, self, packet, 0)
             return True
 
         return False
 
-    def __handle_feedback(self, feedback: int) -> None:
+    def __handle_feedback(self, feedback: int, count: int = 1) -> None:
         """
-        Adjusts sending rate on the Node and Application based on feedback
+        Adjusts sending rate on the Node and Application based on feedback\n
+        Handling the same feedback count times in one call gives the same
+        sending rate as handling it one by one
 
         Parameters:
         feedback (int): The feedback received from the Router
+        count    (int): How many times the feedback was received
         """
         # If the feedback was positive (the buffer was not full), we can increase
         # the speed
         if feedback == 1:
-            self.send_rate += 1
-            self.application.send_rate += 1
+            self.send_rate += count
+            self.application.send_rate += count
             if self.send_rate > 99:
                 self.send_rate = 99
                 self.application.send_rate = 99
         # If the feedback was negative (the buffer was full), we need to decrease
         # the speed the Host is sending at
         elif feedback == -1:
-            self.send_rate //= 2
-            self.application.send_rate //= 2
-            if self.send_rate == 0:
-                self.send_rate = 1
-                self.application.send_rate = 1
-
-    def receive_feedback(self, packet_source: str, feedback: int) -> None:
+            for _ in range(count):
+                self.send_rate //= 2
+                self.application.send_rate //= 2
+                if self.send_rate == 0:
+                    # Halving again would not change anything from here
+                    self.send_rate = 1
+                    self.application.send_rate = 1
+                    break
+
+    def receive_feedback(self,
+                         packet_source: str,
+                         feedback: int,
+                         count: int = 1
+                         ) -> None:
         """
         Gets a feedback from the receiving Node in the Network,
         and adjusts the sending rate according to that (if needed)
@@ -419,34 +538,68 @@ class Host(Node):
         Parameters:
         packet_source (str): This Node's IP address
         feedback      (int): The feedback data being sent back
+        count         (int): How many times the same feedback was sent, \
+                             when it is sent in aggregate
         """
+        self.probe(FEEDBACK, self, None, feedback * count)
+
         # Check if the Host's type is equal to AIMD or not - only that type of
         # Host has an use for the feedback mechanism
         if self.application.app_type == "AIMD":
             # Only handle the feedback when the Packet was sent from here
             # (should always be the case, unless some logical error occurs)
             if packet_source == self.ip:
-                self.__handle_feedback(feedback)
-
-    def __ten_color_gold(self) -> int:
-        """
-        Gives a random PPV based on what the actual send_rate is
-        """
-        if self.send_rate < 10:
-            return random.randint(10 - self.send_rate, 10)
-        else:
-            return random.randint(1, 10)
+                self.__handle_feedback(feedback, count)
 
     def calculate_ppv(self) -> int:
         """
         Calculates the PPV for the next Packet \n
-        This is a specific, simple policy, and thus new policies can be
-        easily added for future use
+        The policy is up to the marker of the Host, and thus new policies
+        can be easily added for future use
 
         Returns:
         int: The calculated PPV value for the next Packet
         """
-        return self.__ten_color_gold()
+        return self.marker.mark(self)
+
+    def calculate_ppv_batch(self, count: int) -> np.ndarray:
+        """
+        Calculates the PPV of the next Packets in one step, following the
+        same policy as calculate_ppv()\n
+        The send_rate is taken as it is now, for every Packet of the batch
+
+        Parameters:
+        count (int): The amount of PPVs to calculate
+
+        Returns:
+        np.ndarray: The calculated PPV values
+        """
+        return self.marker.mark_batch(self, count)
+
+    def generate_batch(self, count: int) -> Dict[str, np.ndarray]:
+        """
+        Creates the next Packets of the Application in one step, as columns,
+        without putting them on any Link - meant for headless engines that
+        keep Packets in arrays instead of Packet objects\n
+        The ppv_sent counter is left for the engine to update, once it
+        actually sends the Packets
+
+        Parameters:
+        count (int): The amount of Packets to create at most
+
+        Returns:
+        Dict[str, np.ndarray]: The packet_id, ppv and size columns of the \
+                               created Packets (fewer, if the Application \
+                               runs out of Packets to send)
+        """
+        if self.application is None:
+            count = 0
+        ppvs: np.ndarray = self.calculate_ppv_batch(count)
+        sizes: np.ndarray = self.batch_rng.integers(1, 11, size=count)
+        if self.application is None:
+            return {"packet_id": np.empty(0, dtype=np.int64),
+                    "ppv": ppvs, "size": sizes}
+        return self.application.send_batch(ppvs, sizes)
 
     def __str__(self) -> str:
         to_return: str = ""
@@ -486,6 +639,11 @@ class Router(Node):
     buffer_size   (int): Maximum buffer size available
     ppv_dropped   (int): The PPV sum of Packets dropped, only accounted for \
                   when the algorithm drops it
+    policy        (FullBufferPolicy | CTVPolicy): Decides which Packets \
+                  to drop
+    feedback      (FeedbackRelay): Sends the feedback back to the sources
+    output_queues (OutputQueues): The Packets leaving through each \
+                  Interface, used instead of buffer, or None
     """
 
     def __init__(self,
@@ -495,9 +653,12 @@ class Router(Node):
                  buffer_size: int,
                  ) -> None:
         super().__init__(name, ip, int(send_rate))
-        self.buffer:      List[Packet] = []
-        self.buffer_size: int = 0 if buffer_size < 0 else buffer_size
-        self.ppv_dropped: int = 0
+        self.buffer:        List[Packet] = []
+        self.buffer_size:   int = 0 if buffer_size < 0 else buffer_size
+        self.ppv_dropped:   int = 0
+        self.policy:        FullBufferPolicy = FullBufferPolicy()
+        self.feedback:      FeedbackRelay = FeedbackRelay(self)
+        self.output_queues: OutputQueues = None
 
     def get_buffer_length(self) -> int:
         """
@@ -506,8 +667,33 @@ class Router(Node):
         Returns:
         int: The Packets inside the buffer
         """
+        if self.output_queues is not None:
+            return len(self.output_queues)
         return len(self.buffer)
 
+    def set_output_queues(self, enabled: bool) -> None:
+        """
+        Switches between the single, shared buffer, and a separate output
+        queue for every Interface the Packets leave through\n
+        The Packets waiting are moved over
+
+        Parameters:
+        enabled (bool): Whether to use output queues
+        """
+        if enabled == (self.output_queues is not None):
+            return
+        if enabled:
+            waiting: List[Packet] = self.buffer
+            self.buffer = []
+            self.output_queues = OutputQueues(self)
+            for packet in waiting:
+                queue: OutputQueue = self.output_queues.queue_of(packet)
+                if queue is not None:
+                    queue.buffer.append(packet)
+        else:
+            self.buffer.extend(self.output_queues.packets())
+            self.output_queues = None
+
     def lowest_buffer_ppv(self) -> Packet:
         """
         Gets the lowest PPV Packet in the buffer if there is any
@@ -524,22 +710,36 @@ class Router(Node):
 
         return min_packet
 
-    def send_packet(self) -> Tuple[str, str]:
+    @timed()
+    def send_packet(self, now: float = None) -> Tuple[str, str]:
         """
-        Takes a Packet from the buffer, or nothing
+        Takes a Packet from the buffer, or nothing\n
+        With output queues, the queues whose Link is free are served in turns
+
+        Parameters:
+        now (float): The current simulated time, used to keep the Links of \
+                     output queues busy while sending, or None
 
         Returns:
         Tuple[str, str]: The next hop in the Route and the receiving Interface
         """
+        if self.output_queues is not None:
+            return self.__send_from_queue(now)
+
         # Check if the buffer has any Packet to send
         if len(self.buffer) > 0:
             # Get the next Packet to send, and the best Route for it to send it
             # through
-            packet: Packet = self.buffer.pop()
+            position: int = self.__sendable_position()
+            if position is None:
+                return None
+            packet: Packet = self.buffer.pop(position)
             route: Route = self.get_best_route(packet.target_ip)
 
             # Check if the destination can be reached, and the Packet was popped
             if (route and packet) is None:
+                if packet is not None:
+                    self.probe(DROP, self, packet, 0)
                 return None
 
             # Go through the Interfaces until we find the one that matches the
@@ -553,14 +753,74 @@ class Router(Node):
                             receiver_interface = connection[1][0].name
                             break
 
-                    # Put the Packet to the Link
-                    interface.put_to_link(packet)
+                    # Put the Packet to the Link, unless it is full
+                    packet.hops += 1
+                    if self._put_to_link(interface, packet) is packet:
+                        return None
+                    self.probe(DEQUEUE, self, packet, 0)
 
                     # Return the next hop and it's corresponding receiver Interface
                     return route.gateway, receiver_interface
 
         return None
 
+    def __sendable_position(self) -> int:
+        """
+        Gets the position of the next Packet to send: the last one, or if
+        its Interface is blocked, the last one with an Interface that is not
+
+        Returns:
+        int: The position in the buffer, or None if every Packet is held back
+        """
+        blocked: List[str] = [interface.name for interface in self.interfaces
+                              if interface.is_blocked()]
+        if not blocked:
+            return len(self.buffer) - 1
+        for position in range(len(self.buffer) - 1, -1, -1):
+            route: Route = self.get_best_route(self.buffer[position].target_ip)
+            if route is None or route.interface not in blocked:
+                return position
+        return None
+
+    def _put_to_link(self, interface: Interface, packet: Packet) -> Packet:
+        # The dropped Packet is accounted for, like the ones in the buffer
+        dropped: Packet = super()._put_to_link(interface, packet)
+        if dropped is not None:
+            self.ppv_dropped += dropped.ppv
+        return dropped
+
+    def __send_from_queue(self, now: float) -> Tuple[str, str]:
+        """
+        Sends a Packet from the next ready output queue
+
+        Parameters:
+        now (float): The current simulated time, or None
+
+        Returns:
+        Tuple[str, str]: The next hop in the Route and the receiving Interface
+        """
+        queue: OutputQueue = self.output_queues.next_ready(now)
+        if queue is None:
+            return None
+
+        packet: Packet = queue.buffer.pop()
+        route: Route = self.get_best_route(packet.target_ip)
+        if route is None or queue.interface.link is None:
+            self.probe(DROP, self, packet, 0)
+            return None
+
+        if now is not None and queue.send_rate > 0:
+            queue.busy_until = now + 1 / queue.send_rate
+        receiver_interface: str = next(
+            (connection[1][0].name for connection in self.connections
+             if connection[0][0] is queue.interface), None)
+        packet.hops += 1
+        if self._put_to_link(queue.interface, packet) is packet:
+            return None
+        self.probe(DEQUEUE, self, packet, 0)
+        return route.gateway, receiver_interface
+
+    @timed()
     def receive_packet(self, name: str) -> Tuple[bool, bool]:
         """
         Handles an incoming Packet accordingly\n
@@ -587,69 +847,156 @@ class Router(Node):
         packet: Packet = interface.receive_from_link()
 
         # Check if there was actually a Packet to receive
-        if packet is not None:
-            # Check if there is still space in the buffer
-            if len(self.buffer) < self.buffer_size:
-                # If there is, simply just add it to the buffer, and send a
-                # positive feedback
-                self.buffer.append(packet)
-                self.__send_feedback(packet.source_ip, 1)
-                return (True, dropped_pack)
-            if len(self.buffer) == self.buffer_size:
-                # If there is none, get the lowest PPV Packet from the Buffer
-                buffer_packet: Packet = self.lowest_buffer_ppv()
-
-                # Drop the Packet from the buffer or the incoming one, based on
-                # which one has a lower PPV
-                if buffer_packet.ppv < packet.ppv:
-                    self.buffer.remove(buffer_packet)
-                    self.buffer.append(packet)
-                    self.ppv_dropped += buffer_packet.ppv
-                else:
-                    self.ppv_dropped += packet.ppv
-
-                dropped_pack = True
-
-                # Send a negative feedback to the source of the Packet
-                self.__send_feedback(packet.source_ip, -1)
-                return (True, dropped_pack)
-
-        return (False, dropped_pack)
-
-    def __send_feedback(self, packet_source: str, feedback: int) -> None:
-        """
-        Sends feedback data to the Node the Packet was received from
+        if packet is None:
+            return (False, dropped_pack)
+
+        # A buffer over its size (it can be after shrinking it) takes nothing
+        if len(self.buffer) > self.buffer_size:
+            self.__reject([packet])
+            return (False, True)
+
+        dropped_pack = self.__admit(packet)
+        return (True, dropped_pack)
+
+    def __reject(self, packets: List[Packet]) -> None:
+        """
+        Drops the Packets arriving at a buffer over its size, accounting for
+        them like for the ones the policy drops
 
         Parameters:
-        packet (Packet): The received Packet's source IP
-        feedback  (int): The feedback data being sent back
+        packets (List[Packet]): The dropped Packets
         """
-        route: Route = self.get_best_route(packet_source)
-        if route is None:
-            return
-        from_ip: str = route.gateway
+        negative: Dict[str, int] = {}
+        for packet in packets:
+            self.ppv_dropped += packet.ppv
+            self.probe(DROP, self, packet, 0)
+            negative[packet.source_ip] = negative.get(packet.source_ip, 0) + 1
+        for source, amount in negative.items():
+            self.feedback.send(source, -1, amount)
 
-        # Send the feedback to a neighbouring Node, so that it can keep passing
-        # it on, or handle it
-        for connection in self.connections:
-            if connection[1][1].ip == from_ip:
-                connection[1][1].receive_feedback(packet_source, feedback)
+    def __admit(self, packet: Packet) -> bool:
+        """
+        Puts a received Packet into the buffer, or drops it, as the policy
+        decides, and sends the feedback to the source of the Packet
+
+        Parameters:
+        packet (Packet): The received Packet
+
+        Returns:
+        bool: Whether a Packet (the incoming or a buffered one) was dropped
+        """
+        # With output queues, the queue of the Packet decides by its own policy
+        holder: Router = self
+        if self.output_queues is not None:
+            holder = self.output_queues.queue_of(packet)
+            if holder is None:
+                # There is nowhere to send it
+                self.ppv_dropped += packet.ppv
+                self.probe(DROP, self, packet, 0)
+                return True
+        drop: Packet = holder.policy.admit(holder, packet)
+
+        # If nothing has to be dropped, simply just add it to the buffer, and
+        # send a positive feedback
+        if drop is None:
+            holder.buffer.append(packet)
+            self.probe(ENQUEUE, self, packet, 0)
+            self.feedback.send(packet.source_ip, 1)
+            return False
+
+        # Drop the Packet from the buffer or the incoming one, based on what
+        # the policy decided
+        self.ppv_dropped += drop.ppv
+        self.probe(DROP, self, drop, 0)
+        if drop is not packet:
+            holder.buffer.remove(drop)
+            holder.buffer.append(packet)
+            self.probe(ENQUEUE, self, packet, 0)
+
+        # Send a negative feedback to the source of the Packet
+        self.feedback.send(packet.source_ip, -1)
+        return True
 
-    def receive_feedback(self, packet_source: str, feedback: int) -> None:
+    @timed()
+    def receive_batch(self, packets: List[Packet]) -> Tuple[int, int]:
+        """
+        Handles Packets arriving at the same time in one step, with the exact
+        same outcome as receiving them one by one with receive_packet()\n
+        The policy decides for all of them at once, and feedback is sent
+        once per source, in aggregate
+
+        Parameters:
+        packets (List[Packet]): The arriving Packets, in arrival order
+
+        Returns:
+        Tuple[int, int]: The amount of Packets received and dropped
+        """
+        space: int = self.buffer_size - len(self.buffer)
+        # An over-full buffer (after shrinking it) takes no Packets at all,
+        # just like receive_packet()
+        if space < 0:
+            self.__reject(packets)
+            return (0, len(packets))
+        instrumentation.count("Router.batched_packets", len(packets))
+        # Other policies and output queues can't be batched, they see the
+        # Packets one by one
+        if not isinstance(self.policy, FullBufferPolicy) or \
+           self.output_queues is not None:
+            return (len(packets),
+                    sum(self.__admit(packet) for packet in packets))
+        if space >= len(packets):
+            # Everything fits, nothing to compare
+            self.buffer.extend(packets)
+            drops: List[Packet] = [None] * len(packets)
+        else:
+            self.buffer, drops = self.policy.admit_batch(self, packets)
+
+        positive: Dict[str, int] = {}
+        negative: Dict[str, int] = {}
+        dropped: int = 0
+        for packet, drop in zip(packets, drops):
+            if drop is None:
+                positive[packet.source_ip] = \
+                    positive.get(packet.source_ip, 0) + 1
+                self.probe(ENQUEUE, self, packet, 0)
+                continue
+            negative[packet.source_ip] = negative.get(packet.source_ip, 0) + 1
+            self.ppv_dropped += drop.ppv
+            self.probe(DROP, self, drop, 0)
+            if drop is not packet:
+                self.probe(ENQUEUE, self, packet, 0)
+            dropped += 1
+
+        for source, amount in positive.items():
+            self.feedback.send(source, 1, amount)
+        for source, amount in negative.items():
+            self.feedback.send(source, -1, amount)
+
+        instrumentation.count("Router.feedback_messages",
+                              len(positive) + len(negative))
+        return (len(packets), dropped)
+
+    def receive_feedback(self,
+                         packet_source: str,
+                         feedback: int,
+                         count: int = 1
+                         ) -> None:
         """
         Receives feedback data, sending it to the intended Node
 
         Parameters:
         packet_source (str): The source to send feedback to
         feedback      (int): The feedback data being sent back
+        count         (int): How many times the same feedback is sent
         """
-        self.__send_feedback(packet_source, feedback)
+        self.feedback.send(packet_source, feedback, count)
 
     def __str__(self) -> str:
         to_return: str = ""
         to_return += (f"\nROUTER {self.name} - {self.ip}:\n\n"
                       f"Send rate: {self.send_rate} Packet(s) / s\n\n"
-                      f"Buffer: {len(self.buffer)} / {self.buffer_size}\n\n")
+                      f"Buffer: {self.get_buffer_length()} / "
+                      f"{self.buffer_size}\n\n")
         to_return += self.routing_table.__str__()
         to_return += "\n\nAvailable Interfaces on Node:\n"
         if len(self.interfaces) == 0:
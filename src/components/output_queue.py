@@ -0,0 +1,175 @@
+"""
+This module makes OutputQueue and OutputQueues objects available for use when
+imported
+"""
+
+# Built-in modules
+import copy
+from typing import Dict, List
+
+# Self-made modules
+from src.components.interface import Interface
+from src.components.packet import Packet
+from src.components.routing_table import Route
+
+
+class OutputQueue:
+    """
+    The Packets of a Router waiting to be sent through one of its
+    Interfaces\n
+    It looks like a Router to buffer policies (buffer, buffer_size,
+    send_rate, lowest_buffer_ppv()), so every queue drops Packets by its own
+    copy of the Router's policy, and sends at the speed of its Link
+
+    Data members:
+    router     (Router): The Router the queue belongs to
+    interface  (Interface): The Interface the Packets are sent through
+    buffer     (List[Packet]): The waiting Packets
+    policy     (FullBufferPolicy | CTVPolicy): Decides which Packets to drop
+    busy_until (float): When the Link is done sending the last Packet
+    """
+
+    def __init__(self, router, interface: Interface, policy) -> None:
+        self.router:     object = router
+        self.interface:  Interface = interface
+        self.buffer:     List[Packet] = []
+        self.policy:     object = policy
+        self.busy_until: float = 0.0
+
+    @property
+    def buffer_size(self) -> int:
+        """
+        The Router's buffer is split evenly between its Interfaces, so the
+        queues together hold as many Packets as the shared buffer would
+
+        Returns:
+        int: The size of the queue
+        """
+        interfaces: List[Interface] = self.router.interfaces
+        if self.interface not in interfaces:
+            return 0
+        share, rest = divmod(self.router.buffer_size, len(interfaces))
+        return share + (1 if interfaces.index(self.interface) < rest else 0)
+
+    @property
+    def send_rate(self) -> int:
+        """
+        The queue sends as fast as its Link carries Packets
+
+        Returns:
+        int: The speed of the Link, or 0 if the Interface is not connected
+        """
+        if self.interface.send_channel is None:
+            return 0
+        return self.interface.send_channel.speed
+
+    def lowest_buffer_ppv(self) -> Packet:
+        """
+        Gets the lowest PPV Packet in the queue if there is any
+
+        Returns:
+        Packet: The lowest PPV Packet or None
+        """
+        min_packet: Packet = None
+        for packet in self.buffer:
+            if min_packet is None or packet.ppv < min_packet.ppv:
+                min_packet = packet
+        return min_packet
+
+    def is_ready(self, now: float = None) -> bool:
+        """
+        Tells whether the queue has a Packet to send, and its Link is free,
+        and not pushing back
+
+        Parameters:
+        now (float): The current simulated time, or None to ignore the Link
+
+        Returns:
+        bool: Whether a Packet can be sent from the queue
+        """
+        return len(self.buffer) != 0 and \
+            (now is None or self.busy_until <= now) and \
+            not self.interface.is_blocked()
+
+
+class OutputQueues:
+    """
+    The output queues of a Router, one for every Interface the Packets
+    leave through, created when the first Packet towards it arrives
+
+    Data members:
+    router (Router): The Router the queues belong to
+    queues (Dict[str, OutputQueue]): Interface name -> its output queue
+    """
+
+    def __init__(self, router) -> None:
+        self.router: object = router
+        self.queues: Dict[str, OutputQueue] = {}
+        self.__next: int = 0
+
+    def queue_of(self, packet: Packet) -> OutputQueue:
+        """
+        Gets the output queue of the Interface a Packet leaves through,
+        creating it if needed
+
+        Parameters:
+        packet (Packet): The Packet to send
+
+        Returns:
+        OutputQueue: The queue, or None if there is no Route for the Packet
+        """
+        route: Route = self.router.get_best_route(packet.target_ip)
+        if route is None:
+            return None
+        queue: OutputQueue = self.queues.get(route.interface)
+        if queue is None:
+            interface: Interface = self.router.get_interface(route.interface)
+            if interface is None:
+                return None
+            queue = OutputQueue(self.router, interface,
+                                copy.deepcopy(self.router.policy))
+            self.queues[route.interface] = queue
+        return queue
+
+    def packets(self) -> List[Packet]:
+        """
+        Gets the Packets waiting in every queue
+
+        Returns:
+        List[Packet]: The Packets, queue by queue
+        """
+        return [packet for queue in self.queues.values()
+                for packet in queue.buffer]
+
+    def __len__(self) -> int:
+        return sum(len(queue.buffer) for queue in self.queues.values())
+
+    def next_ready_time(self) -> float:
+        """
+        Gets when the first queue with Packets has its Link free
+
+        Returns:
+        float: The time, or None if there are no queues with Packets
+        """
+        times: List[float] = [queue.busy_until for queue in
+                              self.queues.values() if len(queue.buffer) != 0]
+        return min(times) if times else None
+
+    def next_ready(self, now: float = None) -> OutputQueue:
+        """
+        Gets the next queue that can send, serving the queues in turns
+
+        Parameters:
+        now (float): The current simulated time, or None to ignore the Links
+
+        Returns:
+        OutputQueue: The queue, or None if none of them can send
+        """
+        names: List[str] = list(self.queues)
+        for offset in range(len(names)):
+            position: int = (self.__next + offset) % len(names)
+            queue: OutputQueue = self.queues[names[position]]
+            if queue.is_ready(now):
+                self.__next = position + 1
+                return queue
+        return None
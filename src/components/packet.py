@@ -8,23 +8,33 @@ class Packet:
     A simplified network packet representation
 
     Data members:
-    source_ip (str): What Node IP the Packet was created at
-    target_ip (str): What is the Node destination IP of the Packet
-    ppv       (int): Per-packet value, used by aggregate points in the Network
-                     Used by the proposed algorithm's logic to handle Packets
-    size      (int): The size of the Packet
+    source_ip  (str): What Node IP the Packet was created at
+    target_ip  (str): What is the Node destination IP of the Packet
+    ppv        (int): Per-packet value, used by aggregate points in the Network
+                      Used by the proposed algorithm's logic to handle Packets
+    size       (int): The size of the Packet
+    packet_id  (int): The sequence number of the Packet in its Application
+    birth_time (float): When the Packet was sent by its Host, if the Host \
+                        has a clock
+    hops       (int): The amount of Routers that forwarded the Packet
     """
 
     def __init__(self,
                  source_ip: str,
                  target_ip: str,
                  ppv: int,
-                 size: int
+                 size: int,
+                 packet_id: int = 0,
+                 birth_time: float = 0.0,
+                 hops: int = 0
                  ) -> None:
-        self.source_ip: str = source_ip
-        self.target_ip: str = target_ip
-        self.ppv:       int = ppv
-        self.size:      int = size
+        self.source_ip:  str = source_ip
+        self.target_ip:  str = target_ip
+        self.ppv:        int = ppv
+        self.size:       int = size
+        self.packet_id:  int = packet_id
+        self.birth_time: float = birth_time
+        self.hops:       int = hops
 
     def __str__(self) -> str:
         return (f"Source IP: {self.source_ip}\nTarget IP: {self.target_ip}\n"
@@ -0,0 +1,78 @@
+"""
+This module makes Packet event types, the ignore() probe and Probes objects
+available for use when imported\n
+A probe is any callable taking (event, node, packet, value), called by the
+Nodes whenever something happens to a Packet - a Node without any probes
+calls ignore(), which does nothing\n
+Only the probes with a true persistent attribute (the measurements kept in
+memory) are saved with a checkpoint - the ones holding files, sockets or
+threads are left out, and are attached again after restoring, if needed
+"""
+
+# Built-in modules
+from typing import Callable, List
+
+# Packet event types
+SEND:     int = 0  # A Host put a new Packet on a Link
+ENQUEUE:  int = 1  # A Router put a Packet into its buffer
+DROP:     int = 2  # A Router dropped a Packet (incoming or from its buffer)
+DEQUEUE:  int = 3  # A Router took a Packet from its buffer, and forwarded it
+DELIVER:  int = 4  # A Host received a Packet
+FEEDBACK: int = 5  # A Host got feedback, the Packet is None, value is the data
+
+EVENT_NAMES: List[str] = ["SEND", "ENQUEUE", "DROP", "DEQUEUE", "DELIVER",
+                          "FEEDBACK"]
+
+
+def ignore(_event: int, _node, _packet, _value: int = 0) -> None:
+    """
+    The probe of the Nodes without any probes attached, doing nothing
+
+    Parameters:
+    _event  (int): The type of the Packet event
+    _node   (Node): The Node the event happened on
+    _packet (Packet): The Packet, or None for feedback
+    _value  (int): The data of the event
+    """
+
+
+class Probes:
+    """
+    Calls every attached probe for every Packet event, in attaching order
+
+    Data members:
+    probes (List[Callable]): The attached probes
+    """
+
+    def __init__(self) -> None:
+        self.probes: List[Callable] = []
+
+    def attach(self, probe: Callable) -> None:
+        """
+        Attaches a probe
+
+        Parameters:
+        probe (Callable): The probe to attach
+        """
+        self.probes.append(probe)
+
+    def detach(self, probe: Callable) -> None:
+        """
+        Detaches a probe, if it is attached
+
+        Parameters:
+        probe (Callable): The probe to detach
+        """
+        if probe in self.probes:
+            self.probes.remove(probe)
+
+    def __len__(self) -> int:
+        return len(self.probes)
+
+    def __getstate__(self) -> dict:
+        return {"probes": [probe for probe in self.probes
+                           if getattr(probe, "persistent", False)]}
+
+    def __call__(self, event: int, node, packet, value: int = 0) -> None:
+        for probe in self.probes:
+            probe(event, node, packet, value)
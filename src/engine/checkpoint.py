@@ -0,0 +1,144 @@
+"""
+This module makes saving and restoring Simulator checkpoints available for
+use when imported\n
+A checkpoint holds the whole state of a run: the Network with its Nodes,
+RoutingTables, buffers, Packets in flight on the Channels, Application
+counters, send rates, statistics, random streams, the pending events and
+the persistent probes\n
+The Nodes, Interfaces, Links and Channels reference each other in chains as
+long as the Network, so they are pickled one by one after the Simulator,
+referring to each other by index - the pickled graph stays shallow whatever
+the size of the Network
+"""
+
+# Built-in modules
+import io
+import os
+import pickle
+import struct
+import zlib
+from typing import Any, Dict, List, Tuple
+
+# Self-made modules
+from src.components.interface import Interface
+from src.components.link import Channel, Link
+from src.components.node import Node
+from src.engine.simulator import Simulator
+
+# Every checkpoint file starts with these, followed by the compressed state
+MAGIC:   bytes = b"PPVCKPT"
+VERSION: int = 2
+HEADER:  struct.Struct = struct.Struct("<7sH")
+
+# The components pickled one by one, referred to by index everywhere else
+FLAT: Tuple[type, ...] = (Node, Interface, Link, Channel)
+
+
+class FlatPickler(pickle.Pickler):
+    """
+    A Pickler writing the FLAT components as references, collecting them to
+    be written one by one afterwards
+
+    Data members:
+    components (List[Any]): The referenced components, in order of indices
+    """
+
+    def __init__(self, file: io.BytesIO) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.components: List[Any] = []
+        self.__indices:  Dict[int, int] = {}
+
+    def persistent_id(self, obj: Any) -> Tuple[int, type]:
+        if not isinstance(obj, FLAT):
+            return None
+        index: int = self.__indices.get(id(obj))
+        if index is None:
+            index = len(self.components)
+            self.__indices[id(obj)] = index
+            self.components.append(obj)
+        return (index, type(obj))
+
+
+class FlatUnpickler(pickle.Unpickler):
+    """
+    An Unpickler creating the FLAT components on their first reference, and
+    filling them in as their states are read
+
+    Data members:
+    components (Dict[int, Any]): Index -> the created component
+    """
+
+    def __init__(self, file: io.BytesIO) -> None:
+        super().__init__(file)
+        self.components: Dict[int, Any] = {}
+
+    def persistent_load(self, pid: Tuple[int, type]) -> Any:
+        index, kind = pid
+        if not isinstance(kind, type) or not issubclass(kind, FLAT):
+            raise pickle.UnpicklingError(f"Unexpected component {kind}")
+        if index not in self.components:
+            self.components[index] = kind.__new__(kind)
+        return self.components[index]
+
+
+def save_checkpoint(simulator: Simulator, path: str) -> None:
+    """
+    Saves the state of a Simulator to a file\n
+    The file is written next to its final place first, so a crash while
+    saving never leaves a broken checkpoint behind
+
+    Parameters:
+    simulator (Simulator): The Simulator to save
+    path      (str): The path of the checkpoint file
+    """
+    stream: io.BytesIO = io.BytesIO()
+    pickler: FlatPickler = FlatPickler(stream)
+    pickler.dump(simulator)
+    # Pickling a component's state can reference further ones
+    written: int = 0
+    while written < len(pickler.components):
+        pickler.dump(pickler.components[written].__dict__)
+        written += 1
+    state: bytes = stream.getvalue()
+
+    temporary: str = path + ".tmp"
+    with open(temporary, "wb") as checkpoint_file:
+        checkpoint_file.write(HEADER.pack(MAGIC, VERSION))
+        checkpoint_file.write(zlib.compress(state))
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path: str) -> Simulator:
+    """
+    Restores a Simulator from a checkpoint file\n
+    Running the restored Simulator continues exactly where the saved one was
+
+    Parameters:
+    path (str): The path of the checkpoint file
+
+    Returns:
+    Simulator: The restored Simulator
+
+    Raises:
+    ValueError: If the file is not a checkpoint, or it has another version
+    """
+    with open(path, "rb") as checkpoint_file:
+        header: bytes = checkpoint_file.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise ValueError(f"{path} is not a checkpoint file")
+        magic, version = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a checkpoint file")
+        if version != VERSION:
+            raise ValueError(f"Checkpoint version {version} is not supported, "
+                             f"expected version {VERSION}")
+        state: bytes = zlib.decompress(checkpoint_file.read())
+
+    stream: io.BytesIO = io.BytesIO(state)
+    unpickler: FlatUnpickler = FlatUnpickler(stream)
+    simulator: Simulator = unpickler.load()
+    index: int = 0
+    while stream.tell() < len(state):
+        unpickler.components[index].__dict__.update(unpickler.load())
+        index += 1
+    return simulator
@@ -0,0 +1,226 @@
+"""
+This module makes FairnessMonitor objects available for use when imported\n
+The FairnessMonitor is a probe keeping Jain's fairness index across flows,
+the value-weighted goodput and the PPV-weighted drop ratio of a run up to
+date with a few additions per Packet event, and sampling them into time
+series as the simulated time passes
+"""
+
+# Built-in modules
+from typing import Callable, Dict, List, Tuple
+
+# Third-party modules
+import numpy as np
+
+# Self-made modules
+from src.components.node import Node
+from src.components.packet import Packet
+from src.components.probe import DELIVER, DROP, SEND
+
+# The columns of the time series
+# interval_goodput is the PPV delivered per second during the interval, and
+# cumulative_goodput since the start of the run
+COLUMNS: List[str] = ["time", "jain", "jain_total", "interval_goodput",
+                      "cumulative_goodput", "drop_ratio"]
+
+
+def jain_index(total: float, squares: float, flows: int) -> float:
+    """
+    Gets Jain's fairness index of the flows from the sum of their rates and
+    the sum of their squares
+
+    Parameters:
+    total   (float): The sum of the rates
+    squares (float): The sum of the squared rates
+    flows   (int): The amount of flows
+
+    Returns:
+    float: The index, from 1 / flows (one flow gets everything) to 1 \
+           (every flow gets the same), or 1 if there is nothing to share
+    """
+    if flows == 0 or squares == 0:
+        return 1.0
+    return total * total / (flows * squares)
+
+
+class FairnessMonitor:
+    """
+    A probe computing PPV evaluation metrics incrementally\n
+    The delivered Packets of every flow, and their sum and sum of squares
+    are kept both for the whole run and for the current sampling interval,
+    so Jain's index is a division. A flow counts from its first sent Packet
+    on, so a flow starved of every delivery lowers the index. The PPV sums
+    sent, delivered and dropped give the value-weighted goodput and the
+    drop ratio\n
+    A sample is taken on the first event after every interval (with the
+    interval's end as its time), and by sample()
+
+    Data members:
+    clock        (Callable[[], float]): Gives the current simulated time
+    interval     (float): The time between samples (in seconds)
+    ppv_sent     (int): The PPV sum of the Packets sent
+    ppv_received (int): The PPV sum of the Packets delivered
+    ppv_dropped  (int): The PPV sum of the Packets dropped
+    samples      (List[Tuple[float, ...]]): The sampled rows, in the order \
+                                            of COLUMNS
+    """
+
+    # Kept in memory only, so saved with checkpoints
+    persistent: bool = True
+
+    def __init__(self,
+                 clock: Callable[[], float],
+                 interval: float = 1.0
+                 ) -> None:
+        if interval <= 0:
+            raise ValueError(f"Invalid sampling interval {interval}")
+        self.clock:        Callable[[], float] = clock
+        self.interval:     float = interval
+        self.ppv_sent:     int = 0
+        self.ppv_received: int = 0
+        self.ppv_dropped:  int = 0
+        self.samples:      List[Tuple[float, ...]] = []
+        # (source IP, target IP) -> [delivered, delivered in the interval,
+        # the interval the previous one was counted in]
+        self.__flows:          Dict[Tuple[str, str], List[int]] = {}
+        self.__total:          int = 0
+        self.__squares:        int = 0
+        self.__interval_total: int = 0
+        self.__interval_sq:    int = 0
+        self.__interval_ppv:   int = 0
+        self.__epoch:          int = 0
+        self.__next_sample:    float = interval
+        self.__last_sample:    float = 0.0
+
+    def __call__(self,
+                 event: int,
+                 node: Node,
+                 packet: Packet,
+                 value: int = 0
+                 ) -> None:
+        if event not in (SEND, DROP, DELIVER):
+            return
+        # The event belongs to the interval after the ones that passed
+        while self.clock() >= self.__next_sample:
+            self.sample(self.__next_sample)
+        if event == SEND:
+            self.ppv_sent += packet.ppv
+            self.__flow((packet.source_ip, packet.target_ip))
+        elif event == DROP:
+            self.ppv_dropped += packet.ppv
+        else:
+            self.ppv_received += packet.ppv
+            self.__interval_ppv += packet.ppv
+            self.__deliver((packet.source_ip, packet.target_ip))
+
+    def __flow(self, key: Tuple[str, str]) -> List[int]:
+        """
+        Gets the counters of a flow, registering it with nothing delivered
+        if it is new, and starting its count of the current interval
+
+        Parameters:
+        key (Tuple[str, str]): (source IP, target IP) of the flow
+
+        Returns:
+        List[int]: [delivered, delivered in the interval, interval]
+        """
+        flow: List[int] = self.__flows.get(key)
+        if flow is None:
+            flow = [0, 0, self.__epoch]
+            self.__flows[key] = flow
+        if flow[2] != self.__epoch:
+            flow[1] = 0
+            flow[2] = self.__epoch
+        return flow
+
+    def __deliver(self, key: Tuple[str, str]) -> None:
+        """
+        Counts a delivered Packet of a flow, keeping the sums of the
+        delivered Packets and of their squares
+
+        Parameters:
+        key (Tuple[str, str]): (source IP, target IP) of the flow
+        """
+        flow: List[int] = self.__flow(key)
+        self.__total += 1
+        self.__squares += 2 * flow[0] + 1
+        self.__interval_total += 1
+        self.__interval_sq += 2 * flow[1] + 1
+        flow[0] += 1
+        flow[1] += 1
+
+    def jain(self) -> float:
+        """
+        Gets Jain's fairness index of the Packets delivered per flow so far,
+        over every flow that sent a Packet
+
+        Returns:
+        float: The index
+        """
+        return jain_index(self.__total, self.__squares, len(self.__flows))
+
+    def drop_ratio(self) -> float:
+        """
+        Gets the PPV-weighted drop ratio: the share of the value sent that
+        was dropped
+
+        Returns:
+        float: The ratio, or 0 if nothing was sent
+        """
+        return self.ppv_dropped / self.ppv_sent if self.ppv_sent > 0 else 0.0
+
+    def sample(self, time: float = None) -> Tuple[float, ...]:
+        """
+        Takes a sample of the metrics, and starts a new interval
+
+        Parameters:
+        time (float): The time of the sample, or None for the current time
+
+        Returns:
+        Tuple[float, ...]: The sample, in the order of COLUMNS
+        """
+        if time is None:
+            time = self.clock()
+        length: float = time - self.__last_sample
+        row: Tuple[float, ...] = (
+            time,
+            jain_index(self.__interval_total, self.__interval_sq,
+                       len(self.__flows)),
+            self.jain(),
+            self.__interval_ppv / length if length > 0 else 0.0,
+            self.ppv_received / time if time > 0 else 0.0,
+            self.drop_ratio())
+        self.samples.append(row)
+
+        self.__interval_total = 0
+        self.__interval_sq = 0
+        self.__interval_ppv = 0
+        self.__epoch += 1
+        self.__last_sample = time
+        while self.__next_sample <= time:
+            self.__next_sample += self.interval
+        return row
+
+    def series(self) -> Dict[str, np.ndarray]:
+        """
+        Gets the samples as NumPy columns
+
+        Returns:
+        Dict[str, np.ndarray]: Column name -> the sampled values
+        """
+        rows: np.ndarray = np.array(self.samples, dtype=np.float64) \
+            .reshape(len(self.samples), len(COLUMNS))
+        return {name: rows[:, column] for column, name in enumerate(COLUMNS)}
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Gets the metrics of the whole run so far
+
+        Returns:
+        Dict[str, float]: {jain, cumulative_goodput, drop_ratio}
+        """
+        now: float = self.clock()
+        return {"jain": self.jain(),
+                "cumulative_goodput":
+                    self.ppv_received / now if now > 0 else 0.0,
+                "drop_ratio": self.drop_ratio()}
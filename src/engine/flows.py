@@ -0,0 +1,195 @@
+"""
+This module makes FlowRecord and FlowTable objects available for use when
+imported\n
+The FlowTable is a probe keeping per-flow statistics - a flow being every
+Packet from a source IP to a target IP - updated with a dictionary lookup
+and a few increments per Packet event, and exported into NumPy columns in
+one step
+"""
+
+# Built-in modules
+from typing import Dict, List, Tuple
+
+# Third-party modules
+import numpy as np
+
+# Self-made modules
+from src.components.node import Node
+from src.components.packet import Packet
+from src.components.probe import DELIVER, DROP, SEND
+
+# The columns of the PPV histograms of a FlowRecord
+SENT:      int = 0
+DELIVERED: int = 1
+DROPPED:   int = 2
+
+# The counters of a FlowRecord, in export order
+COUNTERS: List[str] = ["sent", "delivered", "dropped",
+                       "bytes_sent", "bytes_delivered", "bytes_dropped"]
+
+
+class FlowRecord:
+    """
+    The statistics of a single flow
+
+    Data members:
+    sent            (int): The Packets sent
+    delivered       (int): The Packets delivered
+    dropped         (int): The Packets dropped (in a buffer or on a Link)
+    bytes_sent      (int): The size sum of the Packets sent
+    bytes_delivered (int): The size sum of the Packets delivered
+    bytes_dropped   (int): The size sum of the Packets dropped
+    histograms      (List[List[int]]): [SENT, DELIVERED, DROPPED][PPV] -> \
+                                       the Packets with that PPV
+    """
+
+    def __init__(self) -> None:
+        self.sent:            int = 0
+        self.delivered:       int = 0
+        self.dropped:         int = 0
+        self.bytes_sent:      int = 0
+        self.bytes_delivered: int = 0
+        self.bytes_dropped:   int = 0
+        self.histograms:      List[List[int]] = [[], [], []]
+
+    def count(self, column: int, ppv: int) -> None:
+        """
+        Counts a Packet in one of the PPV histograms
+
+        Parameters:
+        column (int): SENT, DELIVERED or DROPPED
+        ppv    (int): The PPV of the Packet
+        """
+        histogram: List[int] = self.histograms[column]
+        if ppv >= len(histogram):
+            histogram.extend([0] * (ppv + 1 - len(histogram)))
+        histogram[ppv] += 1
+
+    def merge(self, other: "FlowRecord") -> None:
+        """
+        Adds the statistics of an other record of the same flow to this one
+
+        Parameters:
+        other (FlowRecord): The record to add
+        """
+        for counter in COUNTERS:
+            setattr(self, counter, getattr(self, counter) + getattr(other, counter))
+        for histogram, other_histogram in zip(self.histograms, other.histograms):
+            if len(other_histogram) > len(histogram):
+                histogram.extend([0] * (len(other_histogram) - len(histogram)))
+            for ppv, packets in enumerate(other_histogram):
+                histogram[ppv] += packets
+
+
+class FlowTable:
+    """
+    A probe counting the Packets of every flow as they are sent, delivered
+    and dropped\n
+    It can be read at any time during a run, as the records are always up
+    to date
+
+    Data members:
+    records (Dict[Tuple[str, str], FlowRecord]): (source IP, target IP) -> \
+                                                 the statistics of the flow
+    """
+
+    # Kept in memory only, so saved with checkpoints
+    persistent: bool = True
+
+    def __init__(self) -> None:
+        self.records: Dict[Tuple[str, str], FlowRecord] = {}
+
+    def __call__(self, event: int, node: Node, packet: Packet, value: int = 0) -> None:
+        if event == SEND:
+            column: int = SENT
+        elif event == DELIVER:
+            column = DELIVERED
+        elif event == DROP:
+            column = DROPPED
+        else:
+            return
+
+        key: Tuple[str, str] = (packet.source_ip, packet.target_ip)
+        record: FlowRecord = self.records.get(key)
+        if record is None:
+            record = FlowRecord()
+            self.records[key] = record
+        if column == SENT:
+            record.sent += 1
+            record.bytes_sent += packet.size
+        elif column == DELIVERED:
+            record.delivered += 1
+            record.bytes_delivered += packet.size
+        else:
+            record.dropped += 1
+            record.bytes_dropped += packet.size
+        record.count(column, max(packet.ppv, 0))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def get(self, source_ip: str, target_ip: str) -> FlowRecord:
+        """
+        Gets the statistics of a flow
+
+        Parameters:
+        source_ip (str): The IP of the source Host
+        target_ip (str): The IP of the target Node
+
+        Returns:
+        FlowRecord: The statistics, or None if the flow had no Packets yet
+        """
+        return self.records.get((source_ip, target_ip))
+
+    def merge(self, other: "FlowTable") -> None:
+        """
+        Adds the statistics of an other table to this one, such as the table
+        of an other partition or run
+
+        Parameters:
+        other (FlowTable): The table to add
+        """
+        for key, other_record in other.records.items():
+            record: FlowRecord = self.records.get(key)
+            if record is None:
+                record = FlowRecord()
+                self.records[key] = record
+            record.merge(other_record)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Gets every flow as NumPy columns, a row per flow
+
+        Returns:
+        Dict[str, np.ndarray]: source and target IPs, the counters, and \
+                               ppv_sent, ppv_delivered and ppv_dropped: the \
+                               histograms as [flow, PPV] matrices
+        """
+        keys: List[Tuple[str, str]] = list(self.records)
+        records: List[FlowRecord] = list(self.records.values())
+        arrays: Dict[str, np.ndarray] = {
+            "source": np.array([key[0] for key in keys], dtype=str),
+            "target": np.array([key[1] for key in keys], dtype=str)}
+        for counter in COUNTERS:
+            arrays[counter] = np.array([getattr(record, counter)
+                                        for record in records], dtype=np.int64)
+
+        width: int = max([len(histogram) for record in records
+                          for histogram in record.histograms] + [0])
+        for column, name in ((SENT, "ppv_sent"), (DELIVERED, "ppv_delivered"),
+                             (DROPPED, "ppv_dropped")):
+            matrix: np.ndarray = np.zeros((len(records), width), dtype=np.int64)
+            for row, record in enumerate(records):
+                histogram: List[int] = record.histograms[column]
+                matrix[row, :len(histogram)] = histogram
+            arrays[name] = matrix
+        return arrays
+
+    def save(self, path: str) -> None:
+        """
+        Writes every flow into a compressed NumPy archive, in one step
+
+        Parameters:
+        path (str): The path of the archive
+        """
+        np.savez_compressed(path, **self.to_arrays())
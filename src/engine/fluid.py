@@ -0,0 +1,408 @@
+"""
+This module makes FluidSimulator objects available for use when imported\n
+The FluidSimulator keeps the whole state of a Network in NumPy arrays, and
+moves Packets as (fractional) amounts in fixed time steps, instead of moving
+Packet objects one event at a time - it gives up per-Packet detail, and in
+exchange, a step costs a handful of array operations however big the
+Network is
+"""
+
+# Built-in modules
+import heapq
+from typing import Any, Dict, List, Tuple
+
+# Third-party modules
+import numpy as np
+
+# Self-made modules
+from src.engine.scenario import Scenario
+
+# PPVs go from 1 to 10, PPV p is kept at index p - 1
+PPV_LEVELS: int = 10
+PPVS:       np.ndarray = np.arange(1, PPV_LEVELS + 1, dtype=np.float64)
+
+# The limits of an AIMD Host's send rate, the same as on the Host
+MIN_RATE: float = 1.0
+MAX_RATE: float = 99.0
+
+
+class FluidSimulator:
+    """
+    A time-stepped, array based approximation of the Simulator\n
+    Every flow is followed along its (static, shortest) path: the amount of
+    its Packets on the Link into each hop, and in the buffer of the Router at
+    each hop, both kept per PPV. In every step, Links deliver the share of
+    what is on them their delay allows, Routers admit the highest PPVs that
+    fit into their buffer (preferring what they already hold on ties, like
+    the Router does), serve at their send rate, and Hosts send at theirs,
+    adjusting it by the aggregated feedback if they are AIMD\n
+    The results agree with the Simulator on average, not Packet by Packet\n
+    Only the default behaviour of the Nodes and Links is modelled, so
+    Scenarios with markers, buffer policies, feedback windows, output queues
+    or Link capacities are refused
+
+    Data members:
+    dt           (float): The length of a step in seconds
+    now          (float): The current simulated time
+    ips          (List[str]): The IPs of the Nodes, Routers first, then Hosts
+    targets      (List[int]): The Nodes the flows are sent to
+    next_hop     (np.ndarray): [node, target] -> the next Node towards the \
+                               target, or -1 if there is none
+    paths        (np.ndarray): [flow, hop] -> the Router at the hop, or -1
+    path_length  (np.ndarray): [flow] -> the amount of Routers on the path, \
+                               or -1 if there is no path
+    router_rate  (np.ndarray): [router] -> the send rate of the Router
+    buffer_size  (np.ndarray): [router] -> the buffer size of the Router
+    host_rate    (np.ndarray): [host] -> the current send rate of the Host
+    remaining    (np.ndarray): [host] -> Packets the Application can still send
+    aimd         (np.ndarray): [host] -> whether the Application is AIMD
+    queued       (np.ndarray): [flow, hop, ppv] -> amount in the Router buffers
+    in_flight    (np.ndarray): [flow, hop, ppv] -> amount on the Link into the \
+                               hop (the last hop being the target)
+    """
+
+    def __init__(self, scenario: Scenario, dt: float = 0.01) -> None:
+        unsupported: List[str] = self.unsupported(scenario)
+        if unsupported:
+            raise ValueError("The fluid approximation does not model "
+                             f"{', '.join(unsupported)}")
+        self.dt:  float = dt
+        self.now: float = 0.0
+
+        nodes: List[Dict] = scenario.routers + scenario.hosts
+        routers: int = len(scenario.routers)
+        self.ips: List[str] = [node["ip"] for node in nodes]
+        index: Dict[str, int] = {}
+        for position, node in enumerate(nodes):
+            index[node["name"]] = position
+            index[node["ip"]] = position
+
+        self.router_rate: np.ndarray = np.array(
+            [router["send_rate"] for router in scenario.routers], dtype=np.float64)
+        self.buffer_size: np.ndarray = np.array(
+            [router["buffer_size"] for router in scenario.routers],
+            dtype=np.float64)
+        # Setting the Application sets the send rate of the Host as well
+        self.host_rate: np.ndarray = np.array(
+            [host["application"]["send_rate"] if host.get("application")
+             else host["send_rate"] for host in scenario.hosts],
+            dtype=np.float64)
+        self.remaining: np.ndarray = np.array(
+            [host["application"]["amount"] if host.get("application") else 0
+             for host in scenario.hosts], dtype=np.float64)
+        self.aimd: np.ndarray = np.array(
+            [bool(host.get("application")) and
+             host["application"]["app_type"].upper() == "AIMD"
+             for host in scenario.hosts])
+
+        # Neighbour -> (metrics, delay), keeping the cheapest parallel Link
+        neighbours: List[Dict[int, Tuple[int, float]]] = [{} for _ in nodes]
+        for link in scenario.links:
+            first: int = index[link["node"]]
+            second: int = index[link["other_node"]]
+            cost: Tuple[int, float] = (int(link["metrics"]),
+                                       1 / link["speed"] if link["speed"] > 0
+                                       else 0.0)
+            for start, end in ((first, second), (second, first)):
+                if end not in neighbours[start] or \
+                   cost[0] < neighbours[start][end][0]:
+                    neighbours[start][end] = cost
+
+        flows: List[Tuple[int, int]] = [(index[flow["source"]],
+                                         index[flow["target"]])
+                                        for flow in scenario.flows]
+        self.targets: List[int] = sorted({target for _, target in flows})
+        self.next_hop: np.ndarray = np.full((len(nodes), len(self.targets)), -1,
+                                            dtype=np.int32)
+        for column, target in enumerate(self.targets):
+            self.next_hop[:, column] = self.__shortest_paths(neighbours, target,
+                                                             routers)
+
+        # Follow the next hops to get the path of every flow
+        column_of: Dict[int, int] = \
+            {target: column for column, target in enumerate(self.targets)}
+        routes: List[List[int]] = []
+        for source, target in flows:
+            route: List[int] = []
+            node: int = source
+            while node not in (target, -1) and \
+                  (node == source or node < routers):
+                node = int(self.next_hop[node, column_of[target]])
+                route.append(node)
+            routes.append(route if node == target and source != target
+                          else None)
+
+        hops: int = max([len(route) - 1 for route in routes if route] or [0])
+        self.paths: np.ndarray = np.full((len(flows), hops), -1, dtype=np.int64)
+        self.path_length: np.ndarray = np.full(len(flows), -1, dtype=np.int64)
+        delays: np.ndarray = np.zeros((len(flows), hops + 1))
+        for flow, route in enumerate(routes):
+            if route is None:
+                continue
+            self.path_length[flow] = len(route) - 1
+            self.paths[flow, :len(route) - 1] = route[:-1]
+            previous: int = flows[flow][0]
+            for hop, node in enumerate(route):
+                delays[flow, hop] = neighbours[previous][node][1]
+                previous = node
+
+        self.queued:    np.ndarray = np.zeros((len(flows), hops, PPV_LEVELS))
+        self.in_flight: np.ndarray = np.zeros((len(flows), hops + 1, PPV_LEVELS))
+
+        # Everything that does not change between steps
+        routed: np.ndarray = self.path_length >= 0
+        self.__routers:  int = routers
+        self.__source:   np.ndarray = np.array([source - routers
+                                                for source, _ in flows],
+                                               dtype=np.int64)
+        self.__target:   List[int] = [target for _, target in flows]
+        self.__routed:   np.ndarray = routed
+        self.__flows_of: np.ndarray = np.bincount(self.__source,
+                                                  minlength=len(scenario.hosts))
+        on_path: np.ndarray = np.arange(hops + 1)[None, :] <= \
+            self.path_length[:, None]
+        self.__delivery: np.ndarray = np.where(
+            on_path, np.minimum(1.0, dt / np.maximum(delays, 1e-300)), 0.0
+        )[:, :, None]
+        self.__last_hop: np.ndarray = np.maximum(self.path_length, 0)
+        self.__hop_flow, self.__hop = np.nonzero(self.paths >= 0)
+        self.__hop_router: np.ndarray = self.paths[self.__hop_flow, self.__hop]
+        self.__bins: np.ndarray = (self.__hop_router[:, None] * PPV_LEVELS +
+                                   np.arange(PPV_LEVELS)[None, :]).ravel()
+
+        self.total_pack:    float = 0.0
+        self.dropped_pack:  float = 0.0
+        self.received_pack: float = 0.0
+        self.ppv_sent:      float = 0.0
+        self.ppv_dropped:   float = 0.0
+        self.ppv_received:  float = 0.0
+
+    @classmethod
+    def from_network(cls,
+                     network,
+                     flows: List[Tuple[str, str]],
+                     dt: float = 0.01
+                     ) -> "FluidSimulator":
+        """
+        Creates a FluidSimulator of an already built Network
+
+        Parameters:
+        network (Network): The Network to simulate
+        flows   (List[Tuple[str, str]]): (source, target) names or IPs
+        dt      (float): The length of a step in seconds
+
+        Returns:
+        FluidSimulator: The created FluidSimulator
+        """
+        return cls(Scenario.from_network(network,
+                                         [{"source": source, "target": target}
+                                          for source, target in flows]), dt)
+
+    @staticmethod
+    def unsupported(scenario: Scenario) -> List[str]:
+        """
+        Gets what a Scenario uses that the fluid approximation would ignore
+
+        Parameters:
+        scenario (Scenario): The Scenario to check
+
+        Returns:
+        List[str]: "<setting> of <Node or Link>" for every such setting
+        """
+        found: List[str] = []
+        for router in scenario.routers:
+            policy: Dict = router.get("policy") or {}
+            if str(policy.get("type", "FULL")).upper() != "FULL":
+                found.append(f"the buffer policy of {router['name']}")
+            if router.get("feedback_window"):
+                found.append(f"the feedback window of {router['name']}")
+            if router.get("output_queues"):
+                found.append(f"the output queues of {router['name']}")
+        for host in scenario.hosts:
+            marker: Dict = (host.get("application") or {}).get("marker") or {}
+            if str(marker.get("type", "TEN_COLOR_GOLD")).upper() != \
+               "TEN_COLOR_GOLD":
+                found.append(f"the marker of {host['name']}")
+        for link in scenario.links:
+            if link.get("capacity") is not None:
+                found.append(f"the capacity of {link['node']} - "
+                             f"{link['other_node']}")
+        return found
+
+    @staticmethod
+    def __shortest_paths(neighbours: List[Dict[int, Tuple[int, float]]],
+                         target: int,
+                         routers: int
+                         ) -> np.ndarray:
+        """
+        Runs Dijkstra's algorithm from the target, giving every Node its next
+        hop towards it - Hosts don't forward, so paths only cross Routers
+
+        Parameters:
+        neighbours (List[Dict[int, Tuple[int, float]]]): The adjacency lists
+        target     (int): The Node to find the paths to
+        routers    (int): The amount of Routers (the first Nodes)
+
+        Returns:
+        np.ndarray: [node] -> the next hop towards the target, or -1
+        """
+        next_hop: np.ndarray = np.full(len(neighbours), -1, dtype=np.int32)
+        dist: List[float] = [float("inf")] * len(neighbours)
+        dist[target] = 0
+        queue: List[Tuple[float, int]] = [(0, target)]
+        while queue:
+            distance, node = heapq.heappop(queue)
+            if distance > dist[node] or (node != target and node >= routers):
+                continue
+            for other, (metrics, _) in neighbours[node].items():
+                if distance + metrics < dist[other]:
+                    dist[other] = distance + metrics
+                    next_hop[other] = node
+                    heapq.heappush(queue, (dist[other], other))
+        return next_hop
+
+    def __per_router(self, values: np.ndarray) -> np.ndarray:
+        """
+        Sums per-hop values into per-Router values
+
+        Parameters:
+        values (np.ndarray): [hop entry, ppv] values
+
+        Returns:
+        np.ndarray: [router, ppv] sums
+        """
+        return np.bincount(self.__bins, weights=values.ravel(),
+                           minlength=self.__routers * PPV_LEVELS) \
+            .reshape(self.__routers, PPV_LEVELS)
+
+    def step(self) -> None:
+        """
+        Advances the simulation by one step
+        """
+        flow, hop, router = self.__hop_flow, self.__hop, self.__hop_router
+
+        # Links deliver a share of their Packets, according to their delay
+        arrived: np.ndarray = self.in_flight * self.__delivery
+        self.in_flight -= arrived
+        delivered: np.ndarray = arrived[np.arange(len(arrived)), self.__last_hop]
+        self.received_pack += delivered.sum()
+        self.ppv_received += delivered.sum(axis=0) @ PPVS
+
+        # Routers keep the highest PPVs that fit into their buffer, the
+        # buffered ones first on ties
+        queued: np.ndarray = self.queued[flow, hop]
+        arriving: np.ndarray = arrived[flow, hop]
+        buffered: np.ndarray = self.__per_router(queued)
+        incoming: np.ndarray = self.__per_router(arriving)
+        total: np.ndarray = buffered + incoming
+        higher: np.ndarray = np.cumsum(total[:, ::-1], axis=1)[:, ::-1] - total
+        kept: np.ndarray = np.clip(self.buffer_size[:, None] - higher, 0, total)
+        kept_buffered: np.ndarray = np.minimum(kept, buffered)
+        buffered_share: np.ndarray = np.divide(
+            kept_buffered, buffered, out=np.ones_like(total), where=buffered > 0)
+        incoming_share: np.ndarray = np.divide(
+            kept - kept_buffered, incoming, out=np.ones_like(total),
+            where=incoming > 0)
+        queued = queued * buffered_share[router] + \
+            arriving * incoming_share[router]
+        dropped: np.ndarray = (self.queued[flow, hop] + arriving - queued) \
+            .sum(axis=0)
+        self.dropped_pack += dropped.sum()
+        self.ppv_dropped += dropped @ PPVS
+
+        # Every arrival at a full buffer is a negative feedback, every other
+        # one is a positive
+        arrivals: np.ndarray = incoming.sum(axis=1)
+        negative_share: np.ndarray = np.divide(
+            (total - kept).sum(axis=1), arrivals,
+            out=np.zeros_like(arrivals), where=arrivals > 0)
+        arriving_sum: np.ndarray = arriving.sum(axis=1)
+        negative: np.ndarray = arriving_sum * np.minimum(negative_share[router], 1)
+        hosts: int = len(self.host_rate)
+        positive_count: np.ndarray = np.bincount(
+            self.__source[flow], weights=arriving_sum - negative, minlength=hosts)
+        negative_count: np.ndarray = np.bincount(
+            self.__source[flow], weights=negative, minlength=hosts)
+        rate: np.ndarray = np.minimum(self.host_rate + positive_count, MAX_RATE)
+        rate = np.maximum(rate * 0.5 ** negative_count, MIN_RATE)
+        self.host_rate = np.where(self.aimd, rate, self.host_rate)
+
+        # Routers serve their buffer at their send rate, evenly across it
+        occupancy: np.ndarray = self.__per_router(queued).sum(axis=1)
+        served_share: np.ndarray = np.divide(
+            np.minimum(self.router_rate * self.dt, occupancy), occupancy,
+            out=np.zeros_like(occupancy), where=occupancy > 0)
+        served: np.ndarray = queued * served_share[router][:, None]
+        self.queued[flow, hop] = queued - served
+        self.in_flight[flow, hop + 1] += served
+
+        # Hosts send at their send rate, while their Application has Packets
+        demand: np.ndarray = self.host_rate * self.dt * self.__flows_of
+        scale: np.ndarray = np.divide(np.minimum(demand, self.remaining), demand,
+                                      out=np.zeros_like(demand),
+                                      where=demand > 0)
+        sent: np.ndarray = (self.host_rate * self.dt * scale)[self.__source]
+        self.remaining -= np.bincount(self.__source, weights=sent,
+                                      minlength=hosts)
+        # Slow Hosts send high PPVs, like in Host.calculate_ppv()
+        rate = self.host_rate[self.__source]
+        lowest: np.ndarray = np.where(rate < 10, 10 - np.floor(rate), 1)
+        spread: np.ndarray = (PPVS[None, :] >= lowest[:, None]).astype(np.float64)
+        sent_ppv: np.ndarray = sent[:, None] * spread / \
+            spread.sum(axis=1, keepdims=True)
+        self.total_pack += sent.sum()
+        self.ppv_sent += sent_ppv.sum(axis=0) @ PPVS
+        self.in_flight[self.__routed, 0] += sent_ppv[self.__routed]
+        # Packets without a Route are dropped right away
+        unrouted: np.ndarray = sent_ppv[~self.__routed].sum(axis=0)
+        self.dropped_pack += unrouted.sum()
+        self.ppv_dropped += unrouted @ PPVS
+
+        self.now += self.dt
+
+    def run(self, until: float) -> None:
+        """
+        Steps the simulation until the given time
+
+        Parameters:
+        until (float): The time to stop at
+        """
+        while self.now + self.dt / 2 < until:
+            self.step()
+
+    def link_in_flight(self) -> Dict[Tuple[str, str], float]:
+        """
+        Gets the amount of Packets on every used Link
+
+        Returns:
+        Dict[Tuple[str, str], float]: (sender IP, receiver IP) -> amount
+        """
+        amounts: Dict[Tuple[str, str], float] = {}
+        per_hop: np.ndarray = self.in_flight.sum(axis=2)
+        for flow in np.nonzero(self.__routed)[0]:
+            route: List[int] = [int(self.__source[flow]) + self.__routers] + \
+                [int(node) for node in self.paths[flow, :self.path_length[flow]]] + \
+                [self.__target[flow]]
+            for hop in range(len(route) - 1):
+                link: Tuple[str, str] = (self.ips[route[hop]],
+                                         self.ips[route[hop + 1]])
+                amounts[link] = amounts.get(link, 0.0) + per_hop[flow, hop]
+        return amounts
+
+    def statistics(self) -> Dict[str, Any]:
+        """
+        Gets the statistics of the simulation, in the same shape as the ones
+        of the Simulator (but with fractional counts)
+
+        Returns:
+        Dict[str, Any]: The statistics of the simulation
+        """
+        return {"total_pack": float(self.total_pack),
+                "dropped_pack": float(self.dropped_pack),
+                "received_pack": float(self.received_pack),
+                "avg_ppv_sent": float(self.ppv_sent / self.total_pack)
+                                if self.total_pack > 0 else 0.0,
+                "avg_ppv_dropped": float(self.ppv_dropped / self.dropped_pack)
+                                   if self.dropped_pack > 0 else 0.0,
+                "avg_ppv_received": float(self.ppv_received / self.received_pack)
+                                    if self.received_pack > 0 else 0.0}
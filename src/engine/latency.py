@@ -0,0 +1,319 @@
+"""
+This module makes LatencySketch and LatencyRecorder objects available for
+use when imported\n
+A LatencySketch keeps the quantiles of a stream of values within a
+relative error, in logarithmic buckets, without storing the values - so
+p99 latencies of millions of Packets take a few hundred counters, and the
+sketches of different runs or partitions can simply be added up
+"""
+
+# Built-in modules
+import math
+from typing import Any, Callable, Dict, List, Tuple
+
+# Self-made modules
+from src.components.node import Node
+from src.components.packet import Packet
+from src.components.probe import DELIVER
+
+# Values below this are counted as zero
+MIN_VALUE: float = 1e-9
+
+# The quantiles reported in summaries
+QUANTILES: Dict[str, float] = {"p50": 0.5, "p99": 0.99, "p999": 0.999}
+
+
+class LatencySketch:
+    """
+    A mergeable streaming quantile sketch with logarithmic buckets: bucket i
+    holds the values between gamma^(i - 1) and gamma^i, where gamma is
+    (1 + relative_accuracy) / (1 - relative_accuracy), so any quantile is
+    known within the relative accuracy
+
+    Data members:
+    relative_accuracy (float): The relative error of the quantiles
+    buckets           (Dict[int, int]): Bucket index -> amount of values
+    zeros             (int): The amount of values below MIN_VALUE
+    count             (int): The amount of values
+    total             (float): The sum of the values
+    minimum           (float): The smallest value, or None
+    maximum           (float): The largest value, or None
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"Invalid relative accuracy {relative_accuracy}")
+        self.relative_accuracy: float = relative_accuracy
+        self.buckets:           Dict[int, int] = {}
+        self.zeros:             int = 0
+        self.count:             int = 0
+        self.total:             float = 0.0
+        self.minimum:           float = None
+        self.maximum:           float = None
+        self.__gamma:           float = \
+            (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.__log_gamma:       float = math.log(self.__gamma)
+
+    def add(self, value: float, count: int = 1) -> None:
+        """
+        Adds a value to the sketch
+
+        Parameters:
+        value (float): The value to add
+        count (int): How many times the value is added
+        """
+        if value < MIN_VALUE:
+            self.zeros += count
+        else:
+            index: int = math.ceil(math.log(value) / self.__log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def quantile(self, quantile: float) -> float:
+        """
+        Gets a quantile of the values added so far
+
+        Parameters:
+        quantile (float): The quantile, from 0 to 1
+
+        Returns:
+        float: The estimated quantile, or None if the sketch is empty
+        """
+        if self.count == 0:
+            return None
+        if quantile <= 0:
+            return self.minimum
+        if quantile >= 1:
+            return self.maximum
+        rank: float = quantile * (self.count - 1)
+        seen: int = self.zeros
+        if rank < seen:
+            return max(self.minimum, 0.0)
+        value: float = self.maximum
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # The middle of the bucket, in relative terms
+                value = 2 * self.__gamma ** index / (self.__gamma + 1)
+                break
+        return min(max(value, self.minimum), self.maximum)
+
+    def merge(self, other: "LatencySketch") -> None:
+        """
+        Adds the values of an other sketch to this one
+
+        Parameters:
+        other (LatencySketch): The sketch to add
+
+        Raises:
+        ValueError: If the sketches have different accuracies
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Sketches of different accuracies can't be merged")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        for value in (other.minimum, other.maximum):
+            if value is not None:
+                self.minimum = value if self.minimum is None \
+                    else min(self.minimum, value)
+                self.maximum = value if self.maximum is None \
+                    else max(self.maximum, value)
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Gets the count, mean, extremes and the reported quantiles
+
+        Returns:
+        Dict[str, float]: {count, mean, min, max, p50, p99, p999}
+        """
+        summary: Dict[str, float] = {
+            "count": self.count,
+            "mean": self.total / self.count if self.count > 0 else None,
+            "min": self.minimum, "max": self.maximum}
+        for name, quantile in QUANTILES.items():
+            summary[name] = self.quantile(quantile)
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Gets the (JSON serializable) dictionary representation of the sketch
+
+        Returns:
+        Dict[str, Any]: The sketch as a dictionary
+        """
+        return {"relative_accuracy": self.relative_accuracy,
+                "buckets": [[index, count]
+                            for index, count in sorted(self.buckets.items())],
+                "zeros": self.zeros, "count": self.count, "total": self.total,
+                "minimum": self.minimum, "maximum": self.maximum}
+
+    @classmethod
+    def from_dict(cls, description: Dict[str, Any]) -> "LatencySketch":
+        """
+        Creates a sketch from its dictionary representation
+
+        Parameters:
+        description (Dict[str, Any]): The sketch as a dictionary
+
+        Returns:
+        LatencySketch: The created sketch
+        """
+        sketch: LatencySketch = cls(description["relative_accuracy"])
+        sketch.buckets = {int(index): int(count)
+                          for index, count in description["buckets"]}
+        sketch.zeros = description["zeros"]
+        sketch.count = description["count"]
+        sketch.total = description["total"]
+        sketch.minimum = description["minimum"]
+        sketch.maximum = description["maximum"]
+        return sketch
+
+
+class LatencyRecorder:
+    """
+    A probe measuring the end-to-end latency of every delivered Packet,
+    from its birth time, into a sketch per flow and per PPV, and counting
+    the hops the Packets took per flow
+
+    Data members:
+    clock             (Callable[[], float]): Gives the current simulated time
+    relative_accuracy (float): The relative error of the sketches
+    flows             (Dict[Tuple[str, str], LatencySketch]): (source IP, \
+                      target IP) -> the latencies of the flow
+    classes           (Dict[int, LatencySketch]): PPV -> the latencies of \
+                      the Packets with that PPV
+    hops              (Dict[Tuple[str, str], List[int]]): (source IP, \
+                      target IP) -> hop count -> delivered Packets
+    """
+
+    # Kept in memory only, so saved with checkpoints
+    persistent: bool = True
+
+    def __init__(self,
+                 clock: Callable[[], float],
+                 relative_accuracy: float = 0.01
+                 ) -> None:
+        self.clock:             Callable[[], float] = clock
+        self.relative_accuracy: float = relative_accuracy
+        self.flows:             Dict[Tuple[str, str], LatencySketch] = {}
+        self.classes:           Dict[int, LatencySketch] = {}
+        self.hops:              Dict[Tuple[str, str], List[int]] = {}
+
+    def __call__(self, event: int, node: Node, packet: Packet, value: int = 0) -> None:
+        if event != DELIVER:
+            return
+        latency: float = self.clock() - packet.birth_time
+        key: Tuple[str, str] = (packet.source_ip, packet.target_ip)
+
+        sketch: LatencySketch = self.flows.get(key)
+        if sketch is None:
+            sketch = LatencySketch(self.relative_accuracy)
+            self.flows[key] = sketch
+        sketch.add(latency)
+
+        sketch = self.classes.get(packet.ppv)
+        if sketch is None:
+            sketch = LatencySketch(self.relative_accuracy)
+            self.classes[packet.ppv] = sketch
+        sketch.add(latency)
+
+        hops: List[int] = self.hops.setdefault(key, [])
+        if packet.hops >= len(hops):
+            hops.extend([0] * (packet.hops + 1 - len(hops)))
+        hops[packet.hops] += 1
+
+    def total(self) -> LatencySketch:
+        """
+        Gets the latencies of every delivered Packet in a single sketch
+
+        Returns:
+        LatencySketch: The merged sketch of every flow
+        """
+        total: LatencySketch = LatencySketch(self.relative_accuracy)
+        for sketch in self.flows.values():
+            total.merge(sketch)
+        return total
+
+    def merge(self, other: "LatencyRecorder") -> None:
+        """
+        Adds the measurements of an other recorder to this one, such as the
+        recorder of an other partition or run
+
+        Parameters:
+        other (LatencyRecorder): The recorder to add
+        """
+        for mine, theirs in ((self.flows, other.flows),
+                             (self.classes, other.classes)):
+            for key, sketch in theirs.items():
+                mine.setdefault(key, LatencySketch(self.relative_accuracy)) \
+                    .merge(sketch)
+        for key, other_hops in other.hops.items():
+            hops: List[int] = self.hops.setdefault(key, [])
+            if len(other_hops) > len(hops):
+                hops.extend([0] * (len(other_hops) - len(hops)))
+            for count, packets in enumerate(other_hops):
+                hops[count] += packets
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Gets the latency summaries of the whole run, every flow and PPV, and
+        the hop counts of every flow, keyed by strings
+
+        Returns:
+        Dict[str, Any]: {total, flows, ppv, hops}
+        """
+        return {"total": self.total().summary(),
+                "flows": {f"{source} -> {target}": sketch.summary()
+                          for (source, target), sketch in self.flows.items()},
+                "ppv": {str(ppv): self.classes[ppv].summary()
+                        for ppv in sorted(self.classes)},
+                "hops": {f"{source} -> {target}": hops
+                         for (source, target), hops in self.hops.items()}}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Gets the (JSON serializable) dictionary representation of the
+        recorder, without its clock
+
+        Returns:
+        Dict[str, Any]: The recorder as a dictionary
+        """
+        return {"relative_accuracy": self.relative_accuracy,
+                "flows": [[source, target, sketch.to_dict()]
+                          for (source, target), sketch in self.flows.items()],
+                "classes": [[ppv, sketch.to_dict()]
+                            for ppv, sketch in self.classes.items()],
+                "hops": [[source, target, hops]
+                         for (source, target), hops in self.hops.items()]}
+
+    @classmethod
+    def from_dict(cls,
+                  description: Dict[str, Any],
+                  clock: Callable[[], float] = None
+                  ) -> "LatencyRecorder":
+        """
+        Creates a recorder from its dictionary representation
+
+        Parameters:
+        description (Dict[str, Any]): The recorder as a dictionary
+        clock       (Callable[[], float]): The clock of the new recorder
+
+        Returns:
+        LatencyRecorder: The created recorder
+        """
+        recorder: LatencyRecorder = cls(clock, description["relative_accuracy"])
+        recorder.flows = {(source, target): LatencySketch.from_dict(sketch)
+                          for source, target, sketch in description["flows"]}
+        recorder.classes = {ppv: LatencySketch.from_dict(sketch)
+                            for ppv, sketch in description["classes"]}
+        recorder.hops = {(source, target): list(hops)
+                         for source, target, hops in description["hops"]}
+        return recorder
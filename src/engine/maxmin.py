@@ -0,0 +1,168 @@
+"""
+This module makes MaxMinSolver objects available for use when imported\n
+The MaxMinSolver estimates the steady state of a Network analytically:
+the max-min fair rate of every flow, and how much of every Link and Router
+they use - in milliseconds, as a pre-check before (and a sanity reference
+for) packet-level simulations
+"""
+
+# Built-in modules
+from typing import Dict, List, Tuple
+
+# Third-party modules
+import numpy as np
+
+# Self-made modules
+from src.components.network import Network
+from src.components.node import Node
+from src.components.routing_table import Route
+
+# A resource is either a Link direction (sender IP, receiver IP), or a
+# Router (its IP)
+Resource = Tuple[str, ...]
+
+
+class MaxMinSolver:
+    """
+    Computes max-min fair flow rates by water-filling: every unfrozen flow's
+    rate grows at the same pace, until the flow reaches its demand (the
+    Application's send rate) or one of the resources it uses is saturated,
+    at which point it is frozen\n
+    The resources are Link directions, with their speed as the capacity,
+    and Routers, with their send rate as the capacity, as every Packet
+    passing through a Router takes one of its sends\n
+    Flows follow the Routes in the RoutingTables (set by the Graph)
+
+    Data members:
+    flows     (List[Tuple[str, str]]): (source IP, target IP) per flow
+    demands   (np.ndarray): [flow] -> the send rate of the source Application
+    routes    (List[List[str]]): [flow] -> the IPs on its path, or None if \
+                                 the target can't be reached
+    resources (List[Resource]): The resources used by any flow
+    capacity  (np.ndarray): [resource] -> the capacity of the resource
+    usage     (np.ndarray): [resource, flow] -> whether the flow uses it
+    rates     (np.ndarray): [flow] -> the fair rate, after solve()
+    """
+
+    def __init__(self, network: Network, flows: List[Tuple[str, str]]) -> None:
+        self.flows:   List[Tuple[str, str]] = []
+        demands:      List[float] = []
+        for source, target in flows:
+            host: Node = network.get_host(source)
+            destination: Node = network.get_host(target) or \
+                network.get_router(target)
+            if host is None or destination is None:
+                raise ValueError(f"No flow can go from {source} to {target}")
+            self.flows.append((host.ip, destination.ip))
+            demands.append(float(host.application.send_rate)
+                           if host.application is not None else 0.0)
+        self.demands: np.ndarray = np.array(demands, dtype=np.float64)
+
+        index: Dict[Resource, int] = {}
+        capacity: List[float] = []
+        used: List[Tuple[int, int]] = []
+        self.routes: List[List[str]] = []
+        for flow, (source, target) in enumerate(self.flows):
+            route: List[str] = self.__follow(network, source, target)
+            self.routes.append(route)
+            if route is None:
+                continue
+            for hop, ip in enumerate(route[:-1]):
+                node: Node = network.get_host(ip) or network.get_router(ip)
+                interface: str = node.get_best_route(target).interface
+                resources: List[Tuple[Resource, float]] = \
+                    [((ip, route[hop + 1]),
+                      float(network.get_link_speed(ip, interface)))]
+                if hop > 0:
+                    resources.append(((ip,), float(node.send_rate)))
+                for resource, resource_capacity in resources:
+                    if resource not in index:
+                        index[resource] = len(capacity)
+                        capacity.append(resource_capacity)
+                    used.append((index[resource], flow))
+
+        self.resources: List[Resource] = list(index)
+        self.capacity:  np.ndarray = np.array(capacity, dtype=np.float64)
+        self.usage:     np.ndarray = np.zeros((len(capacity), len(self.flows)),
+                                              dtype=bool)
+        for resource, flow in used:
+            self.usage[resource, flow] = True
+        self.rates:     np.ndarray = np.zeros(len(self.flows))
+
+    @staticmethod
+    def __follow(network: Network, source: str, target: str) -> List[str]:
+        """
+        Follows the Routes from the source to the target
+
+        Parameters:
+        network (Network): The Network the flow runs in
+        source  (str): The IP of the source Host
+        target  (str): The IP of the target Node
+
+        Returns:
+        List[str]: The IPs on the path, or None if there is no path
+        """
+        route: List[str] = [source]
+        visited: set = {source}
+        while route[-1] != target:
+            node: Node = network.get_host(route[-1]) or \
+                network.get_router(route[-1])
+            # Hosts don't forward Packets, only send their own
+            if node is None or (len(route) > 1 and
+                                network.get_host(route[-1]) is not None):
+                return None
+            best: Route = node.get_best_route(target)
+            if best is None or best.gateway in visited:
+                return None
+            route.append(best.gateway)
+            visited.add(best.gateway)
+        return route if len(route) > 1 else None
+
+    def solve(self) -> Dict[Tuple[str, str], float]:
+        """
+        Computes the max-min fair rates
+
+        Returns:
+        Dict[Tuple[str, str], float]: (source IP, target IP) -> rate, in \
+                                      Packets per second
+        """
+        rates: np.ndarray = np.zeros(len(self.flows))
+        routed: np.ndarray = np.array([route is not None for route in self.routes],
+                                      dtype=bool)
+        active: np.ndarray = routed & (self.demands > 0)
+        usage: np.ndarray = self.usage.astype(np.float64)
+
+        # Every round freezes at least one flow
+        while active.any():
+            remaining: np.ndarray = self.capacity - usage @ rates
+            sharing: np.ndarray = usage @ active
+            fill: float = np.min(self.demands[active] - rates[active])
+            if (sharing > 0).any():
+                fill = min(fill, np.min(remaining[sharing > 0] /
+                                        sharing[sharing > 0]))
+            rates[active] += max(fill, 0.0)
+
+            saturated: np.ndarray = \
+                (self.capacity - usage @ rates) <= 1e-9 * np.maximum(self.capacity, 1)
+            active &= (rates < self.demands - 1e-9) & \
+                ~(usage[saturated].any(axis=0))
+
+        self.rates = rates
+        rates_by_flow: Dict[Tuple[str, str], float] = {}
+        for flow, rate in zip(self.flows, rates):
+            rates_by_flow[flow] = rates_by_flow.get(flow, 0.0) + float(rate)
+        return rates_by_flow
+
+    def utilisation(self) -> Dict[Resource, float]:
+        """
+        Gets how much of every resource the solved rates use
+
+        Returns:
+        Dict[Resource, float]: Resource -> used share of its capacity
+        """
+        load: np.ndarray = self.usage.astype(np.float64) @ self.rates
+        shares: np.ndarray = np.divide(load, self.capacity,
+                                       out=np.zeros_like(load),
+                                       where=self.capacity > 0)
+        return {resource: float(share)
+                for resource, share in zip(self.resources, shares)}
@@ -0,0 +1,346 @@
+"""
+This module makes the memory footprint report available for use when
+imported\n
+The report builds the Network of a Scenario under tracemalloc, and breaks
+its memory down by component (Routes, connections, Interfaces, Links,
+Packets) and by type, walking the objects reachable from the Network, and
+by allocation site. A MemoryGrowthRecorder then follows the Router buffers,
+the Channel payloads and the traced memory as the simulated time passes, so
+leaks show up as growth that the Packets in flight do not explain
+"""
+
+# Built-in modules
+import gc
+import sys
+import tracemalloc
+from types import BuiltinFunctionType, FunctionType, ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple
+
+# Third-party modules
+import numpy as np
+
+# Self-made modules
+from src.components.interface import Interface
+from src.components.link import Channel, Link
+from src.components.network import Network
+from src.components.node import Host, Node
+from src.components.packet import Packet
+from src.components.routing_table import Route
+from src.engine.scenario import Scenario
+from src.engine.simulator import Simulator
+
+# Objects that are never counted, nor walked into: they belong to the
+# program, not to a Network
+SKIPPED: Tuple[type, ...] = (type, ModuleType, FunctionType,
+                             BuiltinFunctionType)
+
+# The components every other one holds references to, but does not own
+OWNERS: Tuple[type, ...] = (Node, Interface, Link, Channel, Packet, Route)
+
+# The columns of the growth samples
+COLUMNS: List[str] = ["time", "buffered", "max_buffer", "payload_slots",
+                      "in_flight", "traced_bytes"]
+
+
+def walk(roots: Iterable[Any],
+         stop: Tuple[type, ...] = (),
+         seen: Set[int] = None
+         ) -> Iterable[Any]:
+    """
+    Goes through every object reachable from the roots once
+
+    Parameters:
+    roots (Iterable[Any]): The objects to start from
+    stop  (Tuple[type, ...]): The types that are neither gone through nor \
+                              walked into, unless they are roots
+    seen  (Set[int]): The ids of the objects already gone through, shared \
+                      between walks so nothing is counted twice
+
+    Returns:
+    Iterable[Any]: The objects, every one of them once
+    """
+    seen = set() if seen is None else seen
+    pending: List[Any] = []
+    for root in roots:
+        if id(root) not in seen:
+            seen.add(id(root))
+            pending.append(root)
+    while pending:
+        current: Any = pending.pop()
+        yield current
+        for referent in gc.get_referents(current):
+            if id(referent) in seen or isinstance(referent, SKIPPED) or \
+               isinstance(referent, stop):
+                continue
+            seen.add(id(referent))
+            pending.append(referent)
+
+
+def deep_size(roots: Iterable[Any],
+              stop: Tuple[type, ...] = (),
+              seen: Set[int] = None
+              ) -> int:
+    """
+    Gets the bytes taken by the objects reachable from the roots, without
+    walking into other instances of the stop types
+
+    Parameters:
+    roots (Iterable[Any]): The objects to measure
+    stop  (Tuple[type, ...]): The types owned by other components
+    seen  (Set[int]): The ids of the objects already counted
+
+    Returns:
+    int: The bytes
+    """
+    return sum(sys.getsizeof(current) for current in walk(roots, stop, seen))
+
+
+def held_packets(network: Network) -> List[Packet]:
+    """
+    Gets the Packets waiting in the Router buffers and in flight on the
+    Links of a Network
+
+    Parameters:
+    network (Network): The Network to get the Packets of
+
+    Returns:
+    List[Packet]: The Packets
+    """
+    return [packet for router in network.routers for packet in router.buffer] + \
+        [packet for node in network.get_nodes()
+         for interface in node.interfaces if interface.send_channel is not None
+         for packet in interface.send_channel.payload if packet is not None]
+
+
+def component_sizes(network: Network) -> Dict[str, Dict[str, float]]:
+    """
+    Gets the bytes taken by every kind of component of a Network\n
+    Strings shared between components (such as the IPs) are counted with
+    the first component that references them, in the order below
+
+    Parameters:
+    network (Network): The Network to measure
+
+    Returns:
+    Dict[str, Dict[str, float]]: Component -> {count, bytes, bytes_each}, \
+                                 for routes, connections, interfaces, links \
+                                 and packets
+    """
+    nodes: List[Node] = network.get_nodes()
+    links: List[Link] = list({id(interface.link): interface.link
+                              for node in nodes for interface in node.interfaces
+                              if interface.link is not None}.values())
+    packets: List[Packet] = held_packets(network)
+    routes: List[Route] = [route for node in nodes
+                           for route in node.routing_table.routes]
+    seen: Set[int] = set()
+    parts: List[Tuple[str, int, List[Any]]] = [
+        ("routes", len(routes),
+         routes + [node.routing_table.routes for node in nodes]),
+        ("connections", sum(len(node.connections) for node in nodes),
+         [node.connections for node in nodes]),
+        ("interfaces", sum(len(node.interfaces) for node in nodes),
+         [interface for node in nodes for interface in node.interfaces]),
+        ("links", len(links),
+         links + [channel for link in links for channel in link.channels]),
+        ("packets", len(packets), packets)]
+    sizes: Dict[str, Dict[str, float]] = {}
+    for name, count, roots in parts:
+        size: int = deep_size(roots, OWNERS, seen)
+        sizes[name] = {"count": count, "bytes": size,
+                       "bytes_each": size / count if count > 0 else 0.0}
+    return sizes
+
+
+def type_breakdown(roots: Iterable[Any], top: int = 15) -> List[Dict[str, Any]]:
+    """
+    Counts the objects reachable from the roots by type
+
+    Parameters:
+    roots (Iterable[Any]): The objects to start from
+    top   (int): The amount of types to keep, the largest first
+
+    Returns:
+    List[Dict[str, Any]]: {type, count, bytes} per type
+    """
+    types: Dict[str, List[int]] = {}
+    for current in walk(roots):
+        entry: List[int] = types.setdefault(type(current).__qualname__, [0, 0])
+        entry[0] += 1
+        entry[1] += sys.getsizeof(current)
+    return [{"type": name, "count": count, "bytes": size}
+            for name, (count, size) in
+            sorted(types.items(), key=lambda item: -item[1][1])[:top]]
+
+
+def allocation_sites(before: tracemalloc.Snapshot,
+                     after: tracemalloc.Snapshot,
+                     top: int = 15
+                     ) -> List[Dict[str, Any]]:
+    """
+    Gets the source lines that allocated the most memory between two
+    tracemalloc snapshots
+
+    Parameters:
+    before (tracemalloc.Snapshot): The earlier snapshot
+    after  (tracemalloc.Snapshot): The later snapshot
+    top    (int): The amount of lines to keep
+
+    Returns:
+    List[Dict[str, Any]]: {site, bytes, count} per line, the largest first
+    """
+    return [{"site": f"{difference.traceback[0].filename}:"
+                     f"{difference.traceback[0].lineno}",
+             "bytes": difference.size_diff, "count": difference.count_diff}
+            for difference in after.compare_to(before, "lineno")[:top]]
+
+
+class MemoryGrowthRecorder:
+    """
+    A probe sampling the Packets held by a Network and the traced memory
+    once every interval of simulated time - on the first Packet event after
+    it, with the interval's end as the time of the sample\n
+    payload_slots counts every slot of the Channel payloads, and in_flight
+    the Packets in them, so slots that are never freed show up as the
+    difference of the two\n
+    Whenever more Packets are held than ever before, their size is measured
+
+    Data members:
+    network      (Network): The Network to sample
+    clock        (Callable[[], float]): Gives the current simulated time
+    interval     (float): The time between samples (in seconds)
+    samples      (List[Tuple[float, ...]]): The sampled rows, in the order \
+                                            of COLUMNS
+    peak_packets (int): The most Packets held at a sample
+    peak_bytes   (int): The bytes the Packets took at that sample
+    """
+
+    # Kept in memory only, so saved with checkpoints
+    persistent: bool = True
+
+    def __init__(self,
+                 network: Network,
+                 clock: Callable[[], float],
+                 interval: float = 1.0
+                 ) -> None:
+        if interval <= 0:
+            raise ValueError(f"Invalid sampling interval {interval}")
+        self.network:  Network = network
+        self.clock:    Callable[[], float] = clock
+        self.interval: float = interval
+        self.samples:  List[Tuple[float, ...]] = []
+        self.peak_packets: int = 0
+        self.peak_bytes:   int = 0
+        self.__next_sample: float = interval
+
+    def __call__(self, event: int, node: Node, packet: Packet, value: int = 0) -> None:
+        while self.clock() >= self.__next_sample:
+            self.sample(self.__next_sample)
+
+    def sample(self, time: float = None) -> Tuple[float, ...]:
+        """
+        Takes a sample of the buffers, the payloads and the traced memory
+
+        Parameters:
+        time (float): The time of the sample, or None for the current time
+
+        Returns:
+        Tuple[float, ...]: The sample, in the order of COLUMNS
+        """
+        if time is None:
+            time = self.clock()
+        buffers: List[int] = [router.get_buffer_length()
+                              for router in self.network.routers]
+        channels: List[Channel] = [interface.send_channel
+                                   for node in self.network.get_nodes()
+                                   for interface in node.interfaces
+                                   if interface.send_channel is not None]
+        row: Tuple[float, ...] = (
+            time, sum(buffers), max(buffers, default=0),
+            sum(len(channel.payload) for channel in channels),
+            sum(channel.in_flight for channel in channels),
+            tracemalloc.get_traced_memory()[0]
+            if tracemalloc.is_tracing() else 0)
+        self.samples.append(row)
+        if row[1] + row[4] > self.peak_packets:
+            packets: List[Packet] = held_packets(self.network)
+            self.peak_packets = len(packets)
+            self.peak_bytes = deep_size(packets, OWNERS)
+        while self.__next_sample <= time:
+            self.__next_sample += self.interval
+        return row
+
+    def series(self) -> Dict[str, np.ndarray]:
+        """
+        Gets the samples as NumPy columns
+
+        Returns:
+        Dict[str, np.ndarray]: Column name -> the sampled values
+        """
+        rows: np.ndarray = np.array(self.samples, dtype=np.float64) \
+            .reshape(len(self.samples), len(COLUMNS))
+        return {name: rows[:, column] for column, name in enumerate(COLUMNS)}
+
+
+def memory_report(scenario: Scenario,
+                  until: float = None,
+                  interval: float = 1.0,
+                  top: int = 15
+                  ) -> Dict[str, Any]:
+    """
+    Builds the Network of a Scenario under tracemalloc and reports its
+    memory footprint, then - if asked to - runs it, following the growth
+
+    Parameters:
+    scenario (Scenario): The Scenario to build
+    until    (float): The simulated time to run until, or None to only build
+    interval (float): The simulated time between growth samples
+    top      (int): The amount of types and allocation sites to report
+
+    Returns:
+    Dict[str, Any]: The counts of the Network, build_bytes and \
+                    bytes_per_node (traced), components, types, \
+                    allocation_sites, and growth (as lists, when run)
+    """
+    tracing: bool = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        gc.collect()
+        before: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+        start: int = tracemalloc.get_traced_memory()[0]
+        network: Network = scenario.build_network()
+        built: int = tracemalloc.get_traced_memory()[0] - start
+        after: tracemalloc.Snapshot = tracemalloc.take_snapshot()
+
+        nodes: List[Node] = network.get_nodes()
+        report: Dict[str, Any] = {
+            "nodes": len(nodes), "routers": len(network.routers),
+            "hosts": len([node for node in nodes if isinstance(node, Host)]),
+            "build_bytes": built,
+            "bytes_per_node": built / len(nodes) if nodes else 0.0,
+            "components": component_sizes(network),
+            "types": type_breakdown([network], top),
+            "allocation_sites": allocation_sites(before, after, top)}
+        del before, after
+
+        if until is not None:
+            simulator: Simulator = Simulator(
+                network, [(flow["source"], flow["target"])
+                          for flow in scenario.flows])
+            growth: MemoryGrowthRecorder = \
+                MemoryGrowthRecorder(network, simulator.clock, interval)
+            network.attach_probe(growth)
+            simulator.run(until)
+            growth.sample()
+            report["growth"] = {name: column.tolist()
+                                for name, column in growth.series().items()}
+            # The Packets held when the most of them were held
+            report["components"]["packets"] = {
+                "count": growth.peak_packets, "bytes": growth.peak_bytes,
+                "bytes_each": growth.peak_bytes / growth.peak_packets
+                if growth.peak_packets > 0 else 0.0}
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return report
@@ -0,0 +1,243 @@
+"""
+This module makes MetricsServer and MetricsPublisher objects available for
+use when imported\n
+The MetricsServer serves the live counters of a run on a local port, in the
+Prometheus text format, from an asyncio server on a background thread\n
+The simulation never waits for the server: the MetricsPublisher builds an
+immutable snapshot every now and then, and hands it over by replacing a
+single reference, which the server reads whenever it is scraped - there is
+no lock, and without a publisher attached nothing is done at all
+"""
+
+# Built-in modules
+import asyncio
+import threading
+import time
+from typing import List, Tuple
+
+# Self-made modules
+from src.components.node import Host, Node, Router
+from src.components.packet import Packet
+
+# A metric: (name, type, help, ((labels, value), ...)), where labels is a
+# tuple of (label name, label value) pairs
+Metric = Tuple[str, str, str, Tuple[Tuple[Tuple[Tuple[str, str], ...], float], ...]]
+
+
+def render(snapshot: Tuple[Metric, ...]) -> str:
+    """
+    Renders metrics in the Prometheus text exposition format
+
+    Parameters:
+    snapshot (Tuple[Metric, ...]): The metrics to render
+
+    Returns:
+    str: The rendered metrics
+    """
+    lines: List[str] = []
+    for name, metric_type, description, samples in snapshot:
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in samples:
+            label_text: str = ",".join(f'{label}="{label_value}"'
+                                       for label, label_value in labels)
+            lines.append(f"{name}{{{label_text}}} {value}" if label_text
+                         else f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    Serves the last published snapshot over HTTP, on /metrics\n
+    The asyncio loop runs on a daemon thread, and also measures its own lag:
+    how late a periodic wake-up comes, which is high when the simulation
+    holds the interpreter for too long
+
+    Data members:
+    host     (str): The address to listen on
+    port     (int): The port to listen on, the actual one after start() \
+                    if it was 0
+    snapshot (Tuple[Metric, ...]): The last published metrics
+    lag      (float): The last measured lag of the server's loop (seconds)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9464) -> None:
+        self.host:     str = host
+        self.port:     int = port
+        self.snapshot: Tuple[Metric, ...] = ()
+        self.lag:      float = 0.0
+        self.__thread: threading.Thread = None
+        self.__loop:   asyncio.AbstractEventLoop = None
+        self.__stop:   asyncio.Event = None
+        self.__ready:  threading.Event = threading.Event()
+
+    def publish(self, snapshot: Tuple[Metric, ...]) -> None:
+        """
+        Hands over a new snapshot - replacing the reference is atomic, so
+        the server sees either the old or the new one, never a mix
+
+        Parameters:
+        snapshot (Tuple[Metric, ...]): The metrics to serve from now on
+        """
+        self.snapshot = snapshot
+
+    def start(self) -> None:
+        """
+        Starts serving on the background thread, and waits until the port
+        is open
+        """
+        self.__thread = threading.Thread(target=self.__run, daemon=True,
+                                         name="MetricsServer")
+        self.__thread.start()
+        self.__ready.wait()
+
+    def stop(self) -> None:
+        """
+        Stops serving, and waits for the background thread to finish
+        """
+        if self.__loop is not None and self.__thread.is_alive():
+            self.__loop.call_soon_threadsafe(self.__stop.set)
+            self.__thread.join()
+
+    def __run(self) -> None:
+        """
+        The body of the background thread
+        """
+        asyncio.run(self.__serve())
+
+    async def __serve(self) -> None:
+        """
+        Listens until stopped, measuring the lag of the loop meanwhile
+        """
+        self.__loop = asyncio.get_running_loop()
+        self.__stop = asyncio.Event()
+        server: asyncio.AbstractServer = \
+            await asyncio.start_server(self.__handle, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        self.__ready.set()
+        async with server:
+            while not self.__stop.is_set():
+                expected: float = time.perf_counter() + 0.1
+                try:
+                    await asyncio.wait_for(self.__stop.wait(), 0.1)
+                except asyncio.TimeoutError:
+                    self.lag = max(0.0, time.perf_counter() - expected)
+
+    async def __handle(self,
+                       reader: asyncio.StreamReader,
+                       writer: asyncio.StreamWriter
+                       ) -> None:
+        """
+        Answers a single HTTP request
+
+        Parameters:
+        reader (asyncio.StreamReader): The request stream
+        writer (asyncio.StreamWriter): The response stream
+        """
+        try:
+            request: bytes = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            writer.close()
+            return
+        parts: List[str] = request.split(b"\r\n", 1)[0].decode("latin-1").split()
+        if len(parts) >= 2 and parts[0] == "GET" and \
+           parts[1].split("?")[0] in ("/", "/metrics"):
+            status: str = "200 OK"
+            body: bytes = (render(self.snapshot) +
+                           render(self.__own_metrics())).encode("utf-8")
+        else:
+            status = "404 Not Found"
+            body = b"Not found\n"
+        writer.write(f"HTTP/1.1 {status}\r\n"
+                     "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                     f"Content-Length: {len(body)}\r\n"
+                     "Connection: close\r\n\r\n".encode("latin-1") + body)
+        await writer.drain()
+        writer.close()
+
+    def __own_metrics(self) -> Tuple[Metric, ...]:
+        """
+        Gets the metrics of the server itself
+
+        Returns:
+        Tuple[Metric, ...]: The metrics
+        """
+        return (("ppv_event_loop_lag_seconds", "gauge",
+                 "How late the metrics server's loop wakes up", (((), self.lag),)),)
+
+
+class MetricsPublisher:
+    """
+    A probe publishing a snapshot of a Simulator's counters to a
+    MetricsServer at most once per period of wall-clock time\n
+    The clock is only read on every check_every-th Packet event, so the
+    probe costs a counter increment per event otherwise
+
+    Data members:
+    simulator   (Simulator): The Simulator to take the snapshots of
+    server      (MetricsServer): The server to publish to
+    period      (float): The wall-clock seconds between snapshots
+    check_every (int): The amount of Packet events between clock reads
+    """
+
+    def __init__(self,
+                 simulator,
+                 server: MetricsServer,
+                 period: float = 1.0,
+                 check_every: int = 1024
+                 ) -> None:
+        self.simulator:   object = simulator
+        self.server:      MetricsServer = server
+        self.period:      float = period
+        self.check_every: int = max(1, check_every)
+        self.__events:    int = 0
+        self.__published: float = time.perf_counter()
+        self.__processed: int = simulator.processed
+
+    def __call__(self, event: int, node: Node, packet: Packet, value: int = 0) -> None:
+        self.__events += 1
+        if self.__events < self.check_every:
+            return
+        self.__events = 0
+        if time.perf_counter() - self.__published >= self.period:
+            self.publish()
+
+    def publish(self) -> None:
+        """
+        Takes a snapshot of the counters, and publishes it
+        """
+        now: float = time.perf_counter()
+        elapsed: float = now - self.__published
+        rate: float = (self.simulator.processed - self.__processed) / elapsed \
+            if elapsed > 0 else 0.0
+        self.__published = now
+        self.__processed = self.simulator.processed
+
+        network = self.simulator.network
+        routers: List[Router] = list(network.routers)
+        hosts: List[Host] = list(network.hosts)
+        self.server.publish((
+            ("ppv_packets_sent_total", "counter", "Packets sent by the Hosts",
+             (((), network.total_pack),)),
+            ("ppv_packets_dropped_total", "counter", "Packets dropped",
+             (((), network.dropped_pack),)),
+            ("ppv_packets_received_total", "counter",
+             "Packets received by the Hosts", (((), network.received_pack),)),
+            ("ppv_avg_ppv", "gauge", "Average PPV of the Packets",
+             (((("kind", "sent"),), network.avg_ppv_sent),
+              ((("kind", "dropped"),), network.avg_ppv_dropped),
+              ((("kind", "received"),), network.avg_ppv_received))),
+            ("ppv_router_buffer_packets", "gauge",
+             "Packets waiting in the buffer of a Router",
+             tuple(((("router", router.name),), router.get_buffer_length())
+                   for router in routers)),
+            ("ppv_host_send_rate", "gauge",
+             "Send rate of a Host (Packets / second)",
+             tuple(((("host", host.name),), host.send_rate) for host in hosts)),
+            ("ppv_simulated_seconds", "gauge", "The current simulated time",
+             (((), self.simulator.now),)),
+            ("ppv_events_total", "counter", "Events processed",
+             (((), self.simulator.processed),)),
+            ("ppv_events_per_second", "gauge",
+             "Events processed per wall-clock second since the last snapshot",
+             (((), rate),))))
@@ -0,0 +1,695 @@
+"""
+This module makes conservative, process-parallel simulation of a Scenario
+available for use when imported\n
+The Network is cut into partitions along Links, every partition runs its
+own Simulator in a worker process, building only its own Nodes, and the
+partitions only exchange the Packets crossing the cut Links (and the
+feedback for the Hosts reacting to it), in batches, once per lookahead
+window
+"""
+
+# Built-in modules
+import multiprocessing
+from collections import deque
+from math import inf
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Set, Tuple
+
+# Self-made modules
+from src.components.feedback import FeedbackRelay
+from src.components.link import Channel
+from src.components.network import Network
+from src.components.node import Router
+from src.components.packet import Packet
+from src.components.routing_table import Route
+from src.engine.latency import LatencyRecorder
+from src.engine.scenario import Scenario
+from src.engine.simulator import ARRIVE, FEEDBACK, Simulator
+from src.utils.graph import Graph
+
+
+def _node_ips(scenario: Scenario) -> Dict[str, str]:
+    """
+    Gets the IP of every Node of a Scenario, in the order the Network built
+    out of it has them - the Hosts first, then the Routers
+
+    Parameters:
+    scenario (Scenario): The Scenario
+
+    Returns:
+    Dict[str, str]: Node name -> IP
+    """
+    return {node["name"]: node["ip"]
+            for node in scenario.hosts + scenario.routers}
+
+
+def _reacting_hosts(scenario: Scenario) -> Set[str]:
+    """
+    Gets the Hosts whose Application reacts to feedback - the AIMD ones
+
+    Parameters:
+    scenario (Scenario): The Scenario
+
+    Returns:
+    Set[str]: The IPs of the Hosts
+    """
+    return {host["ip"] for host in scenario.hosts
+            if host.get("application") is not None and
+            host["application"]["app_type"].upper() == "AIMD"}
+
+
+def _path(graph: Graph, source: str, target: str) -> List[str]:
+    """
+    Follows the Routes the Nodes would have from a Node to another
+
+    Parameters:
+    graph  (Graph): The Graph of the Network
+    source (str): The IP of the first Node
+    target (str): The IP of the last Node
+
+    Returns:
+    List[str]: The IPs of the Nodes on the way, or None if there is no Route
+    """
+    path: List[str] = [source]
+    while path[-1] != target:
+        route: Tuple[str, str, str, int] = graph.dijkstra(path[-1], target)
+        if route is None or len(path) > len(graph.vertices):
+            return None
+        path.append(route[1])
+    return path
+
+
+def _linked_nodes(scenario: Scenario) -> Dict[str, List[str]]:
+    """
+    Gets the Nodes every Node of a Scenario is linked to
+
+    Parameters:
+    scenario (Scenario): The Scenario
+
+    Returns:
+    Dict[str, List[str]]: Node IP -> the IPs of the Nodes linked to it, in \
+                          the order of the Links
+    """
+    ips: Dict[str, str] = _node_ips(scenario)
+    linked: Dict[str, List[str]] = {ip: [] for ip in ips.values()}
+    for link in scenario.links:
+        node: str = ips.get(link["node"], link["node"])
+        other_node: str = ips.get(link["other_node"], link["other_node"])
+        linked[node].append(other_node)
+        linked[other_node].append(node)
+    return linked
+
+
+def partition_scenario(scenario: Scenario, parts: int) -> Dict[str, int]:
+    """
+    Splits the Nodes of a Scenario into the given amount of partitions\n
+    Routers are ordered by a breadth-first walk on the Router-Router Links,
+    and that order is cut into equal, contiguous chunks - this keeps
+    neighbouring Routers together, so only a few Links cross partitions\n
+    Hosts always go to the partition of the first Router they are connected to
+
+    Parameters:
+    scenario (Scenario): The Scenario to partition
+    parts    (int): The amount of partitions to create
+
+    Returns:
+    Dict[str, int]: Node IP -> partition index
+    """
+    linked: Dict[str, List[str]] = _linked_nodes(scenario)
+    routers: List[str] = [router["ip"] for router in scenario.routers]
+
+    # Breadth-first walk, restarted for every disconnected component
+    order: List[str] = []
+    visited: set = set()
+    for start in routers:
+        if start in visited:
+            continue
+        visited.add(start)
+        queue: deque = deque([start])
+        while queue:
+            current: str = queue.popleft()
+            order.append(current)
+            for neighbour in linked[current]:
+                if neighbour in routers and neighbour not in visited:
+                    visited.add(neighbour)
+                    queue.append(neighbour)
+
+    parts = max(1, min(parts, len(order))) if order else 1
+    assignment: Dict[str, int] = {}
+    for position, ip in enumerate(order):
+        assignment[ip] = position * parts // len(order)
+
+    for host in scenario.hosts:
+        assignment[host["ip"]] = \
+            next((assignment[ip] for ip in linked[host["ip"]]
+                  if ip in assignment), 0)
+
+    return assignment
+
+
+def lookahead(scenario: Scenario, assignment: Dict[str, int]) -> float:
+    """
+    Gets the conservative lookahead of a partitioning: the smallest delay
+    of any Link crossing two partitions
+
+    Parameters:
+    scenario   (Scenario): The partitioned Scenario
+    assignment (Dict[str, int]): Node IP -> partition index
+
+    Returns:
+    float: The lookahead in seconds, or infinity if no Link is cut
+    """
+    ips: Dict[str, str] = _node_ips(scenario)
+    smallest: float = inf
+    for link in scenario.links:
+        if assignment[ips.get(link["node"], link["node"])] != \
+           assignment[ips.get(link["other_node"], link["other_node"])]:
+            speed: int = link["speed"]
+            smallest = min(smallest, 1 / speed if speed > 0 else 0.0)
+    return smallest
+
+
+def crossing_feedback(scenario: Scenario,
+                      assignment: Dict[str, int]
+                      ) -> List[Tuple[str, str]]:
+    """
+    Gets the Routers whose immediate feedback would cross partitions on its
+    way back to an AIMD Host - it has no delay the lookahead could bound,
+    so it would only take effect at the start of the next window
+
+    Parameters:
+    scenario   (Scenario): The partitioned Scenario
+    assignment (Dict[str, int]): Node IP -> partition index
+
+    Returns:
+    List[Tuple[str, str]]: (Router IP, Host IP) per crossing feedback
+    """
+    ips: Dict[str, str] = _node_ips(scenario)
+    graph: Graph = scenario.build_graph()
+    windows: Dict[str, float] = {router["ip"]: router.get("feedback_window")
+                                 or 0.0 for router in scenario.routers}
+    reacting: Set[str] = _reacting_hosts(scenario)
+    crossing: List[Tuple[str, str]] = []
+    for flow in scenario.flows:
+        source: str = ips.get(flow["source"], flow["source"])
+        route: List[str] = _path(graph, source,
+                                 ips.get(flow["target"], flow["target"]))
+        if route is None or source not in reacting:
+            continue
+        for ip in route[1:]:
+            if ip not in windows or windows[ip] > 0 or (ip, source) in crossing:
+                continue
+            back: List[str] = _path(graph, ip, source) or []
+            if any(assignment[hop] != assignment[source] for hop in back):
+                crossing.append((ip, source))
+    return crossing
+
+
+def _receive(connection: Connection, partition: int) -> Any:
+    """
+    Receives a reply of a worker process
+
+    Parameters:
+    connection (Connection): The Pipe end connected to the worker
+    partition  (int): The index of the worker's partition
+
+    Returns:
+    Any: The reply
+
+    Raises:
+    RuntimeError: If the worker exited, so no reply can ever come
+    """
+    try:
+        return connection.recv()
+    except EOFError as error:
+        raise RuntimeError(f"The worker of partition {partition} exited "
+                           "unexpectedly") from error
+
+
+def _send(connection: Connection, partition: int, command: Tuple) -> None:
+    """
+    Sends a command to a worker process
+
+    Parameters:
+    connection (Connection): The Pipe end connected to the worker
+    partition  (int): The index of the worker's partition
+    command    (Tuple): The command
+
+    Raises:
+    RuntimeError: If the worker exited
+    """
+    try:
+        connection.send(command)
+    except (BrokenPipeError, ConnectionResetError) as error:
+        raise RuntimeError(f"The worker of partition {partition} exited "
+                           "unexpectedly") from error
+
+
+def _message_key(message: Tuple) -> Tuple:
+    """
+    Gets the sorting key of a message between partitions
+
+    Parameters:
+    message (Tuple): A packet, an event or a feedback message
+
+    Returns:
+    Tuple: The key to sort by - feedback first, then Packets and events by \
+           event key
+    """
+    if message[0] != "feedback":
+        return (message[1][0], 1, message[1][1:4])
+    return (message[1], 0, (message[2],))
+
+
+class PartitionSimulator(Simulator):
+    """
+    A Simulator processing only the events of the Nodes in its partition\n
+    Its Network only has the Nodes of the partition, and a stub for every
+    Node at the other end of a cut Link, routed as in the whole Network -
+    Packets sent to a stub are taken off the Link and put in the outbox
+    instead, and so is the feedback going on through a stub, if it is for
+    a Host that reacts to it
+
+    Data members:
+    partition  (int): The index of the partition
+    assignment (Dict[str, int]): Node IP -> partition index
+    reacting   (Set[str]): The IPs of the Hosts reacting to feedback
+    outbox     (List[Tuple]): Messages to other partitions since the last \
+               exchange
+    """
+
+    def __init__(self,
+                 scenario: Scenario,
+                 assignment: Dict[str, int],
+                 partition: int
+                 ) -> None:
+        ips: Dict[str, str] = _node_ips(scenario)
+        self.partition:  int = partition
+        self.assignment: Dict[str, int] = assignment
+        self.reacting:   Set[str] = _reacting_hosts(scenario)
+        self.outbox:     List[Tuple] = []
+        self.__owned:    List[bool] = [assignment[ip] == partition
+                                       for ip in ips.values()]
+
+        # The stubs are the Nodes at the other end of the cut Links
+        owned: Set[str] = {name for name, ip in ips.items()
+                           if assignment[ip] == partition}
+        names: Set[str] = set(owned)
+        for link in scenario.links:
+            ends: Set[str] = {link["node"], link["other_node"]}
+            if ends & owned:
+                names |= ends
+        network: Network = scenario.build_network(names)
+        built: Dict[str, object] = {node.ip: node
+                                    for node in network.get_nodes()}
+
+        # The flows are given by IP, as their targets might not be built
+        flows: List[Tuple[str, str]] = \
+            [(ips.get(flow["source"], flow["source"]),
+              ips.get(flow["target"], flow["target"]))
+             for flow in scenario.flows]
+        super().__init__(network,
+                         [flow for flow in flows
+                          if assignment[flow[0]] == partition],
+                         [built.get(ip) for ip in ips.values()])
+
+        for index, node in enumerate(self.nodes):
+            if node is not None and not self.__owned[index]:
+                node.receive_feedback = self.__feedback_catcher(index)
+                if isinstance(node, Router):
+                    node.feedback.find_receivers = \
+                        self.__stub_receivers(node.feedback)
+
+    def __feedback_catcher(self, index: int):
+        """
+        Creates a replacement for the receive_feedback method of a stub
+
+        Parameters:
+        index (int): The index of the stub
+
+        Returns:
+        Callable[[str, int, int], None]: The replacement method
+        """
+        def catch(packet_source: str, feedback: int, count: int = 1) -> None:
+            if packet_source in self.reacting:
+                self.outbox.append(("feedback", self.now, index,
+                                    packet_source, feedback, count))
+        return catch
+
+    @staticmethod
+    def __stub_receivers(relay: FeedbackRelay):
+        """
+        Creates a replacement for the find_receivers method of a stub
+        Router's FeedbackRelay: feedback walks on through the stub while its
+        Links lead back into the partition, and is handed to the stub where
+        they don't - to be shipped to its partition, and walk on from there
+
+        Parameters:
+        relay (FeedbackRelay): The FeedbackRelay of the stub
+
+        Returns:
+        Callable[[str, set], List[Tuple[Node, float]]]: The replacement method
+        """
+        find_receivers = relay.find_receivers
+
+        def find(packet_source: str,
+                 visited: set
+                 ) -> List[Tuple[object, float]]:
+            route: Route = relay.router.get_best_route(packet_source)
+            if route is not None and \
+               all(connection[1][1].ip != route.gateway
+                   for connection in relay.router.connections):
+                return [(relay.router, 0.0)]
+            return find_receivers(packet_source, visited)
+        return find
+
+    def owns(self, index: int) -> bool:
+        """
+        Tells whether the events of the given Node are processed by this
+        Simulator - only the Nodes of the partition, not the stubs
+
+        Parameters:
+        index (int): The index of the Node
+
+        Returns:
+        bool: Whether the Node's events are processed here
+        """
+        return self.__owned[index]
+
+    def _resolve(self, node_name_or_ip: str) -> str:
+        return node_name_or_ip
+
+    def _forward(self,
+                 sender: int,
+                 next_hop: str,
+                 interface_name: str
+                 ) -> None:
+        index: int = self.node_index[next_hop]
+        if self.__owned[index]:
+            super()._forward(sender, next_hop, interface_name)
+            return
+
+        # The Packet was just appended to the Link, so it is the last one -
+        # the capacity of cut Links is not enforced, as their Packets are only
+        # ever in flight on the receiving side
+        channel: Channel = self.nodes[index].get_interface(interface_name) \
+            .receive_channel
+        packet: Packet = channel.payload.pop()
+        channel.in_flight -= 1
+        self.outbox.append(("packet",
+                            (self.now + self._link_delay(next_hop, interface_name),
+                             index, sender, self._next_key(sender),
+                             ARRIVE, interface_name),
+                            (packet.source_ip, packet.target_ip,
+                             packet.ppv, packet.size, packet.packet_id,
+                             packet.birth_time, packet.hops)))
+
+    def _send_feedback(self,
+                       delay: float,
+                       receiver: int,
+                       sender: int,
+                       feedback: Tuple[str, int, int]
+                       ) -> None:
+        if self.__owned[receiver]:
+            super()._send_feedback(delay, receiver, sender, feedback)
+        elif feedback[0] in self.reacting:
+            # The path back crosses a cut Link, so the feedback arrives at the
+            # stub after the lookahead, and walks on from there, like a Packet
+            # would - the time it was sent at is kept, to add up the delays
+            # in the same order as the whole Network
+            self.outbox.append(("event",
+                                (self.now + delay, receiver, sender,
+                                 self._next_key(sender), FEEDBACK,
+                                 feedback + (self.now, delay))))
+
+    def _receive_feedback(self, event: Tuple) -> None:
+        node: object = self.nodes[event[1]]
+        if not isinstance(node, Router):
+            super()._receive_feedback(event[:5] + (event[5][:3],))
+            return
+
+        # The feedback came through a stub in another partition, it walks on
+        # to the Nodes handling it, keeping the key it was sent with
+        source, positive, negative, sent, delay = event[5]
+        for receiver, further in node.feedback.get_receivers(source):
+            index: int = self.node_index[receiver.ip]
+            relayed: Tuple = (sent + (delay + further), index, event[2],
+                              event[3], FEEDBACK,
+                              (source, positive, negative))
+            if self.__owned[index]:
+                self._push(relayed)
+            else:
+                self.outbox.append(("event", relayed[:5] +
+                                    ((source, positive, negative, sent,
+                                      delay + further),)))
+
+    def deliver(self, messages: List[Tuple]) -> None:
+        """
+        Takes the messages sent by other partitions into account
+
+        Parameters:
+        messages (List[Tuple]): The messages addressed to this partition
+        """
+        # Messages are sorted by their time (and Packets by their key), so
+        # Packets sharing a Link keep the order they were sent in
+        for message in sorted(messages, key=_message_key):
+            if message[0] == "packet":
+                event: Tuple = message[1]
+                channel: Channel = self.nodes[event[1]] \
+                    .get_interface(event[5]).receive_channel
+                channel.payload.append(Packet(*message[2]))
+                channel.in_flight += 1
+                self._push(event)
+            elif message[0] == "event":
+                self._push(message[1])
+            else:
+                _, _, index, packet_source, feedback, count = message
+                node: object = self.nodes[index]
+                if isinstance(node, Router):
+                    node.feedback.send(packet_source, feedback, count)
+                else:
+                    node.receive_feedback(packet_source, feedback, count)
+
+    def counters(self) -> Dict[str, int]:
+        """
+        Gets the raw counters of the Nodes owned by this partition
+
+        Returns:
+        Dict[str, int]: The counters to merge with other partitions'
+        """
+        owned_hosts: List[object] = [host for host in self.network.hosts
+                                   if self.assignment[host.ip] == self.partition]
+        owned_routers = [router for router in self.network.routers
+                         if self.assignment[router.ip] == self.partition]
+        return {"total_pack": self.network.total_pack,
+                "dropped_pack": self.network.dropped_pack,
+                "received_pack": self.network.received_pack,
+                "ppv_sent": sum(host.ppv_sent for host in owned_hosts),
+                "ppv_received": sum(host.ppv_received for host in owned_hosts),
+                "ppv_dropped": sum(router.ppv_dropped
+                                   for router in owned_routers),
+                "processed": self.processed}
+
+
+def _worker(connection: Connection,
+            scenario: Dict,
+            assignment: Dict[str, int],
+            partition: int,
+            latency: bool = False
+            ) -> None:
+    """
+    The main loop of a worker process: runs windows of its partition on
+    request, until it is told to stop
+
+    Parameters:
+    connection (Connection): The Pipe end connected to the coordinator
+    scenario   (Dict): The dictionary representation of the Scenario
+    assignment (Dict[str, int]): Node IP -> partition index
+    partition  (int): The index of the partition the worker handles
+    latency    (bool): Whether to measure the latency of the delivered Packets
+    """
+    simulator: PartitionSimulator = PartitionSimulator(
+        Scenario.from_dict(scenario), assignment, partition)
+    recorder: LatencyRecorder = None
+    if latency:
+        recorder = LatencyRecorder(simulator.clock)
+        simulator.network.attach_probe(recorder)
+    connection.send(simulator.next_time())
+
+    while True:
+        command: Tuple = connection.recv()
+        if command[0] == "stop":
+            connection.send((simulator.counters(),
+                             recorder.to_dict() if recorder is not None
+                             else None))
+            connection.close()
+            return
+        _, until, messages = command
+        simulator.deliver(messages)
+        simulator.run(until)
+        outbox: List[Tuple] = simulator.outbox
+        simulator.outbox = []
+        connection.send((simulator.next_time(), outbox))
+
+
+class ParallelSimulator:
+    """
+    Runs a Scenario on multiple processes, using conservative synchronization\n
+    Every window starts at the earliest pending event (or message) of any
+    partition, and lasts for the lookahead, so no message sent inside a window
+    can arrive before its end\n
+    Immediate feedback has no delay, so it can't be bounded by the
+    lookahead, and would only take effect at the start of the next window -
+    so partitionings where it would cross to an AIMD Host are refused.
+    Routers with a feedback window send their feedback with the delay of
+    the path, so those runs match the single-process one
+
+    Data members:
+    scenario   (Scenario): The Scenario to run
+    assignment (Dict[str, int]): Node IP -> partition index
+    parts      (int): The amount of partitions
+    lookahead  (float): The length of a synchronization window
+    windows    (int): The amount of windows the last run took
+    latency    (LatencyRecorder): The merged latencies of every partition \
+                                  after a run, if they are measured
+    __ips      (List[str]): Node index -> IP, used to route messages
+    """
+
+    def __init__(self,
+                 scenario: Scenario,
+                 parts: int = None,
+                 assignment: Dict[str, int] = None,
+                 measure_latency: bool = False
+                 ) -> None:
+        self.scenario: Scenario = scenario
+        if assignment is None:
+            assignment = partition_scenario(
+                scenario, parts or multiprocessing.cpu_count())
+        self.assignment: Dict[str, int] = assignment
+        self.parts:      int = max(assignment.values()) + 1 if assignment else 1
+        self.lookahead:  float = lookahead(scenario, assignment)
+        crossing: List[Tuple[str, str]] = crossing_feedback(scenario,
+                                                            assignment)
+        if crossing:
+            raise ValueError(f"Immediate feedback of Router {crossing[0][0]} "
+                             f"would cross partitions to AIMD Host "
+                             f"{crossing[0][1]}, give the Routers a "
+                             "feedback_window to run them in parallel")
+        self.windows:    int = 0
+        self.latency:    LatencyRecorder = None
+        self.__measure_latency: bool = measure_latency
+        self.__ips:      List[str] = list(_node_ips(scenario).values())
+
+    def run(self, until: float) -> Dict[str, Any]:
+        """
+        Runs the Scenario until the given time
+
+        Parameters:
+        until (float): The time to stop at
+
+        Returns:
+        Dict[str, Any]: The merged statistics, the same as \
+                        Simulator.statistics() would return
+        """
+        if self.lookahead <= 0:
+            raise ValueError("Partitions connected by zero-delay Links "
+                             "can't be simulated in parallel")
+
+        connections: List[Connection] = []
+        processes: List[multiprocessing.Process] = []
+        for partition in range(self.parts):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_worker,
+                                              args=(child,
+                                                    self.scenario.to_dict(),
+                                                    self.assignment,
+                                                    partition,
+                                                    self.__measure_latency),
+                                              daemon=True)
+            process.start()
+            # Only the worker holds this end, so its exit closes the Pipe
+            child.close()
+            connections.append(parent)
+            processes.append(process)
+
+        try:
+            next_times: List[float] = [_receive(connection, partition)
+                                       for partition, connection
+                                       in enumerate(connections)]
+            inboxes: List[List[Tuple]] = [[] for _ in connections]
+            self.windows = 0
+
+            while True:
+                start: float = min(next_times)
+                for inbox in inboxes:
+                    for message in inbox:
+                        start = min(start, message[1][0]
+                                    if message[0] != "feedback" else message[1])
+                if start >= until:
+                    break
+                end: float = min(start + self.lookahead, until)
+
+                for partition, (connection, inbox) in \
+                        enumerate(zip(connections, inboxes)):
+                    _send(connection, partition, ("run", end, inbox))
+                inboxes = [[] for _ in connections]
+
+                for partition, connection in enumerate(connections):
+                    next_times[partition], outbox = \
+                        _receive(connection, partition)
+                    for message in outbox:
+                        # Packet messages are (type, event, packet), event
+                        # messages are (type, event), feedback messages are
+                        # (type, time, host_index, ...)
+                        if message[0] != "feedback":
+                            ip: str = self.__ips[message[1][1]]
+                        else:
+                            ip: str = self.__ips[message[2]]
+                        inboxes[self.assignment[ip]].append(message)
+                self.windows += 1
+
+            for partition, connection in enumerate(connections):
+                _send(connection, partition, ("stop",))
+            results: List[Tuple] = [_receive(connection, partition)
+                                    for partition, connection
+                                    in enumerate(connections)]
+            counters: List[Dict[str, int]] = [result[0] for result in results]
+            if self.__measure_latency:
+                self.latency = LatencyRecorder(None)
+                for result in results:
+                    self.latency.merge(LatencyRecorder.from_dict(result[1]))
+        except BaseException:
+            # The other workers would wait for their next command forever
+            for process in processes:
+                process.terminate()
+            raise
+        finally:
+            for process in processes:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+
+        return self.__merge(counters)
+
+    @staticmethod
+    def __merge(counters: List[Dict[str, int]]) -> Dict[str, Any]:
+        """
+        Merges the counters of the partitions into Network statistics
+
+        Parameters:
+        counters (List[Dict[str, int]]): The counters of every partition
+
+        Returns:
+        Dict[str, Any]: The statistics of the whole Network
+        """
+        total: Dict[str, int] = {key: sum(counter[key] for counter in counters)
+                                 for key in counters[0]}
+        return {"total_pack": total["total_pack"],
+                "dropped_pack": total["dropped_pack"],
+                "received_pack": total["received_pack"],
+                "avg_ppv_sent": total["ppv_sent"] / total["total_pack"]
+                if total["total_pack"] > 0 else 0.0,
+                "avg_ppv_dropped": total["ppv_dropped"] / total["dropped_pack"]
+                if total["dropped_pack"] > 0 else 0.0,
+                "avg_ppv_received": total["ppv_received"] / total["received_pack"]
+                if total["received_pack"] > 0 else 0.0}
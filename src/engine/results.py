@@ -0,0 +1,210 @@
+"""
+This module makes columnar results bundles available for use when
+imported\n
+A bundle holds everything measured in a run - its metadata, the final
+Network counters, the per-flow table, the per-node and per-link time
+series, the fairness samples and the latency sketches - as NumPy columns
+in a single compressed archive, written in one step\n
+Columns are stored under "<section>.<name>" keys, and the parts that are
+not tabular (metadata, statistics, latency sketches) as JSON strings
+"""
+
+# Built-in modules
+import json
+from typing import Any, Callable, Dict, List
+
+# Third-party modules
+import numpy as np
+
+# Self-made modules
+from src.components.network import Network
+from src.components.node import Host, Node
+from src.components.packet import Packet
+from src.engine.fairness import FairnessMonitor
+from src.engine.flows import FlowTable
+from src.engine.latency import LatencyRecorder
+
+VERSION: int = 1
+
+
+class TimeSeriesRecorder:
+    """
+    A probe sampling the state of every Node and Link of a Network once
+    every interval of simulated time - on the first Packet event after it,
+    with the interval's end as the time of the sample\n
+    Nodes sample their buffer length (Routers) or send rate (Hosts), and
+    every Link direction the Packets in flight
+
+    Data members:
+    network  (Network): The Network to sample
+    clock    (Callable[[], float]): Gives the current simulated time
+    interval (float): The time between samples (in seconds)
+    times    (List[float]): The times of the samples
+    nodes    (List[str]): The IPs of the sampled Nodes, in column order
+    links    (List[str]): "<IP>:<Interface>" of the sending side of every \
+                          sampled Link direction, in column order
+    """
+
+    # Kept in memory only, so saved with checkpoints
+    persistent: bool = True
+
+    def __init__(self,
+                 network: Network,
+                 clock: Callable[[], float],
+                 interval: float = 1.0
+                 ) -> None:
+        if interval <= 0:
+            raise ValueError(f"Invalid sampling interval {interval}")
+        self.network:  Network = network
+        self.clock:    Callable[[], float] = clock
+        self.interval: float = interval
+        self.times:    List[float] = []
+        self.nodes:    List[str] = [node.ip for node in network.get_nodes()]
+        self.links:    List[str] = [f"{node.ip}:{interface.name}"
+                                    for node in network.get_nodes()
+                                    for interface in node.interfaces
+                                    if interface.link is not None]
+        self.__node_rows:   List[List[int]] = []
+        self.__link_rows:   List[List[int]] = []
+        self.__next_sample: float = interval
+
+    def __call__(self, event: int, node: Node, packet: Packet, value: int = 0) -> None:
+        while self.clock() >= self.__next_sample:
+            self.sample(self.__next_sample)
+
+    def sample(self, time: float = None) -> None:
+        """
+        Takes a sample of every Node and Link
+
+        Parameters:
+        time (float): The time of the sample, or None for the current time
+        """
+        if time is None:
+            time = self.clock()
+        nodes: List[Node] = self.network.get_nodes()
+        self.times.append(time)
+        self.__node_rows.append([node.send_rate if isinstance(node, Host)
+                                 else node.get_buffer_length()
+                                 for node in nodes])
+        self.__link_rows.append([interface.send_channel.in_flight
+                                 for node in nodes
+                                 for interface in node.interfaces
+                                 if interface.link is not None])
+        while self.__next_sample <= time:
+            self.__next_sample += self.interval
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Gets the samples as NumPy columns\n
+        Nodes or Links added or removed during the run make the rows uneven,
+        so only the samples with the starting columns are kept
+
+        Returns:
+        Dict[str, np.ndarray]: time, node_ip, node ([sample, Node]), \
+                               link_id and link ([sample, Link direction])
+        """
+        node_rows: List[List[int]] = [row for row in self.__node_rows
+                                      if len(row) == len(self.nodes)]
+        link_rows: List[List[int]] = [row for row in self.__link_rows
+                                      if len(row) == len(self.links)]
+        return {"time": np.array(self.times, dtype=np.float64),
+                "node_ip": np.array(self.nodes, dtype=str),
+                "node": np.array(node_rows, dtype=np.int64)
+                .reshape(len(node_rows), len(self.nodes)),
+                "link_id": np.array(self.links, dtype=str),
+                "link": np.array(link_rows, dtype=np.int64)
+                .reshape(len(link_rows), len(self.links))}
+
+
+def write_bundle(path: str,
+                 metadata: Dict[str, Any],
+                 statistics: Dict[str, Any],
+                 flows: FlowTable = None,
+                 series: TimeSeriesRecorder = None,
+                 fairness: FairnessMonitor = None,
+                 latency: LatencyRecorder = None
+                 ) -> None:
+    """
+    Writes the results of a run into a compressed NumPy archive, in one step
+
+    Parameters:
+    path       (str): The path of the archive
+    metadata   (Dict[str, Any]): The description of the run (JSON serializable)
+    statistics (Dict[str, Any]): The final counters of the Network
+    flows      (FlowTable): The per-flow statistics, or None
+    series     (TimeSeriesRecorder): The per-node and per-link time series, \
+                                     or None
+    fairness   (FairnessMonitor): The fairness samples, or None
+    latency    (LatencyRecorder): The latency sketches, or None
+    """
+    arrays: Dict[str, np.ndarray] = {
+        "version": np.array(VERSION),
+        "metadata": np.array(json.dumps(metadata)),
+        "statistics": np.array(json.dumps(statistics))}
+    for section, columns in (("flows", flows.to_arrays() if flows else {}),
+                             ("series", series.to_arrays() if series else {}),
+                             ("fairness",
+                              fairness.series() if fairness else {})):
+        for name, column in columns.items():
+            arrays[f"{section}.{name}"] = column
+    if latency is not None:
+        arrays["latency"] = np.array(json.dumps(latency.to_dict()))
+    np.savez_compressed(path, **arrays)
+
+
+def read_bundle(path: str) -> Dict[str, Any]:
+    """
+    Reads a results bundle
+
+    Parameters:
+    path (str): The path of the archive
+
+    Returns:
+    Dict[str, Any]: metadata and statistics as dictionaries, flows, series \
+                    and fairness as column name -> NumPy array, and latency \
+                    as a LatencyRecorder (or None)
+
+    Raises:
+    ValueError: If the bundle was written by a newer version
+    """
+    with np.load(path) as archive:
+        version: int = int(archive["version"])
+        if version > VERSION:
+            raise ValueError(f"Results bundle version {version} is not "
+                             f"supported, expected version {VERSION}")
+        bundle: Dict[str, Any] = {
+            "metadata": json.loads(str(archive["metadata"])),
+            "statistics": json.loads(str(archive["statistics"])),
+            "flows": {}, "series": {}, "fairness": {},
+            "latency": LatencyRecorder.from_dict(json.loads(str(archive["latency"])))
+            if "latency" in archive.files else None}
+        for key in archive.files:
+            if "." in key:
+                section, name = key.split(".", 1)
+                bundle[section][name] = archive[key]
+    return bundle
+
+
+def collect_statistics(paths: List[str]) -> Dict[str, np.ndarray]:
+    """
+    Reads the final counters of many bundles into columns, a row per run -
+    only the small JSON parts are decompressed, not the tables
+
+    Parameters:
+    paths (List[str]): The paths of the archives
+
+    Returns:
+    Dict[str, np.ndarray]: path, and every statistic present in all runs
+    """
+    rows: List[Dict[str, Any]] = []
+    for path in paths:
+        with np.load(path) as archive:
+            rows.append(json.loads(str(archive["statistics"])))
+    names: List[str] = [name for name in (rows[0] if rows else {})
+                        if all(name in row and
+                               isinstance(row[name], (int, float))
+                               for row in rows)]
+    columns: Dict[str, np.ndarray] = {"path": np.array(paths, dtype=str)}
+    for name in names:
+        columns[name] = np.array([row[name] for row in rows])
+    return columns
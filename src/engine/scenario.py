@@ -0,0 +1,382 @@
+"""
+This module makes Scenario objects available for use when imported
+"""
+
+# Built-in modules
+import copy
+import json
+from typing import Any, Dict, List, Set, Tuple
+
+# Self-made modules
+from src.components.buffer_policy import create_policy
+from src.components.link import DROP_TAIL
+from src.components.marker import create_marker
+from src.components.network import Network
+from src.components.routing_table import Route
+from src.utils.graph import Graph
+
+
+def _selects(selector: str, item: Dict) -> bool:
+    """
+    Tells whether a selector of an override path matches an item of a
+    section of the Scenario
+
+    Parameters:
+    selector (str): The selector: *, a name, a node, a flow source, or \
+                    source>target
+    item     (Dict): The item of the section
+
+    Returns:
+    bool: Whether the item is selected
+    """
+    if ">" in selector:
+        source, target = selector.split(">", 1)
+        return "source" in item and \
+            source in ("*", item["source"]) and target in ("*", item["target"])
+    return selector in ("*", item.get("name"), item.get("node"),
+                        item.get("source"))
+
+
+class Scenario:
+    """
+    A plain, serializable description of a Network and the traffic running
+    on it\n
+    Headless engines build their own Network from a Scenario, which is what
+    makes it possible to ship the same setup to worker processes
+
+    Data members:
+    routers  (List[Dict]): {name, ip, send_rate, buffer_size} per Router, \
+                           with an optional policy: {type, parameters...}, \
+                           feedback_window (in seconds), and whether it \
+                           uses output_queues
+    hosts    (List[Dict]): {name, ip, send_rate, application} per Host, where \
+                           application is {name, amount, send_rate, \
+                           app_type}, with an optional marker: \
+                           {type, parameters...}
+    links    (List[Dict]): {node, interface, other_node, other_interface, \
+                           speed, metrics} per Link, with an optional \
+                           capacity: {packets or delay, overflow}
+    flows    (List[Dict]): {source, target} per sending Host
+    duration (float): How long the simulation should run (in seconds)
+    seed     (int): The master seed of the Network, or None for unseeded runs
+    """
+
+    def __init__(self,
+                 routers: List[Dict] = None,
+                 hosts: List[Dict] = None,
+                 links: List[Dict] = None,
+                 flows: List[Dict] = None,
+                 duration: float = 10.0,
+                 seed: int = None
+                 ) -> None:
+        self.routers:  List[Dict] = routers or []
+        self.hosts:    List[Dict] = hosts or []
+        self.links:    List[Dict] = links or []
+        self.flows:    List[Dict] = flows or []
+        self.duration: float = duration
+        self.seed:     int = seed
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Scenario":
+        """
+        Creates a Scenario from its dictionary representation
+
+        Parameters:
+        data (Dict): The dictionary to create the Scenario from
+
+        Returns:
+        Scenario: The created Scenario
+        """
+        data = copy.deepcopy(data)
+        return cls(data.get("routers"),
+                   data.get("hosts"),
+                   data.get("links"),
+                   data.get("flows"),
+                   data.get("duration", 10.0),
+                   data.get("seed"))
+
+    @classmethod
+    def from_network(cls,
+                     network: Network,
+                     flows: List[Dict] = None,
+                     duration: float = 10.0
+                     ) -> "Scenario":
+        """
+        Creates a Scenario describing an already built Network
+
+        Parameters:
+        network  (Network): The Network to describe
+        flows    (List[Dict]): {source, target} per sending Host
+        duration (float): How long the simulation should run (in seconds)
+
+        Returns:
+        Scenario: The created Scenario
+        """
+        routers: List[Dict] = [{"name": router.name, "ip": router.ip,
+                                "send_rate": router.send_rate,
+                                "buffer_size": router.buffer_size,
+                                "policy": router.policy.to_dict(),
+                                "feedback_window": router.feedback.window,
+                                "output_queues":
+                                    router.output_queues is not None}
+                               for router in network.routers]
+        hosts: List[Dict] = []
+        for host in network.hosts:
+            hosts.append({"name": host.name, "ip": host.ip,
+                          "send_rate": host.send_rate})
+            if host.application is not None:
+                hosts[-1]["application"] = \
+                    {"name": host.application.name,
+                     "amount": host.application.amount,
+                     "send_rate": host.application.send_rate,
+                     "app_type": host.application.app_type,
+                     "marker": host.marker.to_dict()}
+
+        # Every Link is in the connections of both of its Nodes
+        links: List[Dict] = []
+        seen: set = set()
+        for node in network.get_nodes():
+            for (interface, _), (other_interface, other_node) in node.connections:
+                ends: frozenset = frozenset(((node.ip, interface.name),
+                                             (other_node.ip, other_interface.name)))
+                if ends in seen:
+                    continue
+                seen.add(ends)
+                channel = interface.link.channels[0]
+                links.append({"node": node.name, "interface": interface.name,
+                              "other_node": other_node.name,
+                              "other_interface": other_interface.name,
+                              "speed": channel.speed,
+                              "metrics": channel.metrics})
+                if channel.capacity is not None:
+                    links[-1]["capacity"] = {"packets": channel.capacity,
+                                             "overflow": channel.overflow}
+
+        return cls(routers, hosts, links, flows, duration, network.seed)
+
+    def to_dict(self) -> Dict:
+        """
+        Gets the dictionary representation of the Scenario
+
+        Returns:
+        Dict: The Scenario as a (JSON serializable) dictionary
+        """
+        return copy.deepcopy({"routers": self.routers,
+                              "hosts": self.hosts,
+                              "links": self.links,
+                              "flows": self.flows,
+                              "duration": self.duration,
+                              "seed": self.seed})
+
+    @classmethod
+    def load(cls, path: str) -> "Scenario":
+        """
+        Loads a Scenario from a JSON file
+
+        Parameters:
+        path (str): The path of the JSON file
+
+        Returns:
+        Scenario: The loaded Scenario
+        """
+        with open(path, encoding="utf-8") as scenario_file:
+            return cls.from_dict(json.load(scenario_file))
+
+    def save(self, path: str) -> None:
+        """
+        Saves the Scenario to a JSON file
+
+        Parameters:
+        path (str): The path of the JSON file
+        """
+        with open(path, "w", encoding="utf-8") as scenario_file:
+            json.dump(self.to_dict(), scenario_file, indent=3)
+
+    def with_overrides(self, overrides: Dict[str, Any]) -> "Scenario":
+        """
+        Creates a copy of the Scenario with some of its values replaced\n
+        Every key is a dot separated path, where the first part is a section
+        (routers, hosts, links, flows) or a top-level value (duration), the
+        second selects an item of the section by its name (or node, for Links)
+        or every item with *, and the rest is the field to set, for example:
+        routers.*.buffer_size, hosts.h1.application.app_type\n
+        Flows are selected by their source, or by source>target, where either
+        side can be *: flows.h1.target, flows.*>h2.source
+
+        Parameters:
+        overrides (Dict[str, Any]): Path -> value to set
+
+        Returns:
+        Scenario: The modified copy
+
+        Raises:
+        KeyError: If a path does not match anything in the Scenario
+        """
+        data: Dict = self.to_dict()
+        for path, value in overrides.items():
+            parts: List[str] = path.split(".")
+            if len(parts) == 1:
+                if parts[0] not in data:
+                    raise KeyError(path)
+                data[parts[0]] = value
+                continue
+
+            section: str = parts[0]
+            selector: str = parts[1]
+            matched: bool = False
+            for item in data.get(section, []):
+                if not _selects(selector, item):
+                    continue
+                target: Dict = item
+                for part in parts[2:-1]:
+                    target = target[part]
+                target[parts[-1]] = copy.deepcopy(value)
+                matched = True
+            if not matched:
+                raise KeyError(path)
+
+        return Scenario.from_dict(data)
+
+    def build_graph(self) -> Graph:
+        """
+        Builds the Graph of the Network described, without building the
+        Network itself
+
+        Returns:
+        Graph: The Graph, the same as the Network would route by
+        """
+        ips: Dict[str, str] = {node["name"]: node["ip"]
+                               for node in self.hosts + self.routers}
+        graph: Graph = Graph()
+        graph.vertices = [node["ip"] for node in self.hosts + self.routers]
+        graph.edges = [(ips[link["node"]], link["interface"],
+                        ips[link["other_node"]], link["other_interface"],
+                        link["metrics"]) for link in self.links]
+        return graph
+
+    @staticmethod
+    def __add_router(network: Network, router: Dict) -> None:
+        """
+        Creates a Router of the Scenario in a Network, with its settings
+
+        Parameters:
+        network (Network): The Network being built
+        router  (Dict): The Router's description
+
+        Raises:
+        ValueError: If the Router can't be added to the Network
+        """
+        if not network.create_router(router["name"], router["ip"],
+                                     router["send_rate"],
+                                     router["buffer_size"]):
+            raise ValueError(f"Can't create Router {router['name']}")
+        if router.get("policy") is not None:
+            network.set_buffer_policy(router["name"],
+                                      create_policy(router["policy"]))
+        if router.get("feedback_window") and \
+           not network.set_feedback_window(router["name"],
+                                           router["feedback_window"]):
+            raise ValueError(f"Invalid feedback window "
+                             f"{router['feedback_window']} on Router "
+                             f"{router['name']}")
+        if router.get("output_queues"):
+            network.set_output_queues(router["name"], True)
+
+    @staticmethod
+    def __add_host(network: Network, host: Dict) -> None:
+        """
+        Creates a Host of the Scenario in a Network, with its Application
+
+        Parameters:
+        network (Network): The Network being built
+        host    (Dict): The Host's description
+
+        Raises:
+        ValueError: If the Host can't be added to the Network
+        """
+        if not network.create_host(host["name"], host["ip"],
+                                   host["send_rate"]):
+            raise ValueError(f"Can't create Host {host['name']}")
+        application: Dict = host.get("application")
+        if application is not None:
+            network.set_application(host["name"], application["name"],
+                                    application["amount"],
+                                    application["send_rate"],
+                                    application["app_type"])
+            if application.get("marker") is not None:
+                network.set_marker(host["name"],
+                                   create_marker(application["marker"]))
+
+    def build_network(self, names: Set[str] = None) -> Network:
+        """
+        Builds a Network out of the Scenario, using only the public API of
+        the Network, so the result is the same as if it was built by hand\n
+        If only some of the Nodes are built, they are routed as in the whole
+        Network
+
+        Parameters:
+        names (Set[str]): The names of the Nodes to build, with the Links \
+                          between them, or None to build every Node
+
+        Returns:
+        Network: The built Network
+
+        Raises:
+        ValueError: If any part of the Scenario can't be added to the Network
+        """
+        network: Network = Network()
+        network.set_seed(self.seed)
+
+        for router in self.routers:
+            if names is None or router["name"] in names:
+                self.__add_router(network, router)
+        for host in self.hosts:
+            if names is None or host["name"] in names:
+                self.__add_host(network, host)
+
+        for link in self.links:
+            if names is not None and \
+               not {link["node"], link["other_node"]} <= names:
+                continue
+            # Interfaces are implicit in a Scenario, they are created when a
+            # Link needs them
+            network.add_interface(link["node"], link["interface"])
+            network.add_interface(link["other_node"], link["other_interface"])
+            if not network.connect_node_interfaces(link["node"],
+                                                   link["other_node"],
+                                                   link["interface"],
+                                                   link["other_interface"],
+                                                   link["speed"],
+                                                   link["metrics"]):
+                raise ValueError(f"Can't connect {link['node']} to "
+                                 f"{link['other_node']}")
+            capacity: Dict = link.get("capacity")
+            if capacity is not None and \
+               not network.set_link_capacity(link["node"], link["interface"],
+                                             capacity.get("packets"),
+                                             capacity.get("delay"),
+                                             capacity.get("overflow",
+                                                          DROP_TAIL)):
+                raise ValueError(f"Invalid capacity on {link['node']} - "
+                                 f"{link['other_node']}")
+
+        if names is not None:
+            self.__route_as_whole(network)
+        return network
+
+    def __route_as_whole(self, network: Network) -> None:
+        """
+        Replaces the Routes of a Network built from some of the Nodes with
+        the ones they have in the whole Network
+
+        Parameters:
+        network (Network): The Network built from some of the Nodes
+        """
+        graph: Graph = self.build_graph()
+        for node in network.get_nodes():
+            node.reset_routes()
+            for destination in graph.vertices:
+                route: Tuple[str, str, str, int] = \
+                    graph.dijkstra(node.ip, destination)
+                if route is not None:
+                    node.add_route(Route(*route))
@@ -0,0 +1,444 @@
+"""
+This module makes Simulator objects available for use when imported\n
+The Simulator is a headless, discrete-event counterpart of the Threads
+started by the MainHandler: instead of sleeping, every send and receive
+is an event on a simulated clock
+"""
+
+# Built-in modules
+import heapq
+from math import inf
+from typing import Any, Dict, List, Tuple
+
+# Self-made modules
+from src.components.marker import DrawBlock
+from src.components.network import Network
+from src.components.node import Host, Node, Router
+from src.engine.scenario import Scenario
+
+# Event types
+HOST_SEND:   int = 0
+ROUTER_SEND: int = 1
+ARRIVE:      int = 2
+FEEDBACK:    int = 3
+FLUSH:       int = 4
+
+# The amount of PPVs and sizes a Host draws in one step
+DRAW_BLOCK: int = 256
+
+
+class Simulator:
+    """
+    A discrete-event simulation of a Network\n
+    Every event is keyed by (time, node, origin, origin_seq), where node is
+    the Node the event happens on, and origin / origin_seq tell which Node
+    scheduled it and how many events it scheduled before\n
+    Because the key does not depend on the order events are pushed in,
+    a partitioned run processes the events of each Node in the exact same
+    order
+
+    Data members:
+    network    (Network): The Network being simulated
+    flows      (List[Tuple[str, str]]): (source IP, target IP) pairs
+    nodes      (List[Node]): The Nodes of the Network, indexed by the events \
+                             - None for the ones not built here
+    node_index (Dict[str, int]): Node IP -> index in nodes
+    now        (float): The current simulated time
+    events     (List[Tuple]): The pending events, as a heap
+    processed  (int): The amount of events processed so far
+    """
+
+    def __init__(self,
+                 network: Network,
+                 flows: List[Tuple[str, str]],
+                 nodes: List[Node] = None
+                 ) -> None:
+        self.network:    Network = network
+        self.nodes:      List[Node] = \
+            nodes if nodes is not None else network.get_nodes()
+        self.node_index: Dict[str, int] = \
+            {node.ip: index for index, node in enumerate(self.nodes)
+             if node is not None}
+        self.flows:      List[Tuple[str, str]] = \
+            [(self._resolve(source), self._resolve(target))
+             for source, target in flows]
+        self.now:        float = 0.0
+        self.events:     List[Tuple] = []
+        self.processed:  int = 0
+        self.__origin_seq: List[int] = [0] * len(self.nodes)
+        self.__serving:    List[bool] = [False] * len(self.nodes)
+        self.__flushing:   List[bool] = [False] * len(self.nodes)
+        self.__serve_at:   List[float] = [None] * len(self.nodes)
+
+        # Packets are stamped with the simulated time they are sent at
+        network.set_clock(self.clock)
+
+        # Received Packets are only counted, not printed, and the Packets
+        # sent are drawn in blocks
+        for host in network.hosts:
+            host.draws = DrawBlock(DRAW_BLOCK)
+            if host.application is not None:
+                host.application.verbose = False
+
+        for source, target in self.flows:
+            index: int = self.node_index[source]
+            if self.owns(index):
+                self._schedule(0.0, index, index, HOST_SEND, target)
+
+    @classmethod
+    def from_scenario(cls, scenario: Scenario) -> "Simulator":
+        """
+        Creates a Simulator running the given Scenario
+
+        Parameters:
+        scenario (Scenario): The Scenario to run
+
+        Returns:
+        Simulator: The created Simulator
+        """
+        return cls(scenario.build_network(),
+                   [(flow["source"], flow["target"]) for flow in scenario.flows])
+
+    def _resolve(self, node_name_or_ip: str) -> str:
+        """
+        Gets the IP address of a Node given by its name or IP
+
+        Parameters:
+        node_name_or_ip (str): The name or IP of the Node
+
+        Returns:
+        str: The IP address of the Node
+
+        Raises:
+        ValueError: If there is no such Node in the Network
+        """
+        for node in self.nodes:
+            if node is not None and node_name_or_ip in (node.name, node.ip):
+                return node.ip
+        raise ValueError(f"No Node called {node_name_or_ip} in the Network")
+
+    def owns(self, index: int) -> bool:
+        """
+        Tells whether the events of the given Node are processed by this
+        Simulator - always the case for the Nodes it has
+
+        Parameters:
+        index (int): The index of the Node
+
+        Returns:
+        bool: Whether the Node's events are processed here
+        """
+        return self.nodes[index] is not None
+
+    def _next_key(self, origin: int) -> int:
+        """
+        Gets the next sequence number of the given origin Node
+
+        Parameters:
+        origin (int): The index of the Node scheduling an event
+
+        Returns:
+        int: The sequence number to put in the event's key
+        """
+        seq: int = self.__origin_seq[origin]
+        self.__origin_seq[origin] = seq + 1
+        return seq
+
+    def _schedule(self,
+                  time: float,
+                  node: int,
+                  origin: int,
+                  kind: int,
+                  data: Any
+                  ) -> None:
+        """
+        Schedules an event
+
+        Parameters:
+        time   (float): When the event happens
+        node   (int): The index of the Node the event happens on
+        origin (int): The index of the Node scheduling the event
+        kind   (int): The type of the event
+        data   (Any): Event specific data (target IP or Interface name)
+        """
+        heapq.heappush(self.events,
+                       (time, node, origin, self._next_key(origin), kind, data))
+
+    def _push(self, event: Tuple) -> None:
+        """
+        Pushes an already keyed event to the pending events
+
+        Parameters:
+        event (Tuple): The event to push
+        """
+        heapq.heappush(self.events, event)
+
+    def clock(self) -> float:
+        """
+        Gets the current simulated time - meant to be passed to probes
+
+        Returns:
+        float: The current simulated time
+        """
+        return self.now
+
+    def next_time(self) -> float:
+        """
+        Gets the time of the next pending event
+
+        Returns:
+        float: The time of the next event, or infinity if there is none
+        """
+        return self.events[0][0] if self.events else inf
+
+    def _link_delay(self, node_ip: str, interface_name: str) -> float:
+        """
+        Gets how long it takes for a Packet to cross the Link ending on the
+        given Interface
+
+        Parameters:
+        node_ip        (str): The IP of the receiving Node
+        interface_name (str): The receiving Interface's name
+
+        Returns:
+        float: The delay of the Link in seconds (1 / speed)
+        """
+        speed: int = self.network.get_link_speed(node_ip, interface_name)
+        return 1 / speed if speed > 0 else 0.0
+
+    def _forward(self,
+                 sender: int,
+                 next_hop: str,
+                 interface_name: str
+                 ) -> None:
+        """
+        Schedules the arrival of a Packet that was just put on a Link
+
+        Parameters:
+        sender         (int): The index of the sending Node
+        next_hop       (str): The IP of the receiving Node
+        interface_name (str): The receiving Interface's name
+        """
+        self._schedule(self.now + self._link_delay(next_hop, interface_name),
+                       self.node_index[next_hop], sender, ARRIVE,
+                       interface_name)
+
+    def _send_feedback(self,
+                       delay: float,
+                       receiver: int,
+                       sender: int,
+                       feedback: Tuple[str, int, int]
+                       ) -> None:
+        """
+        Schedules the delivery of the feedback a Router added up in a window
+
+        Parameters:
+        delay    (float): How long it takes the feedback to arrive
+        receiver (int): The index of the Node handling the feedback
+        sender   (int): The index of the Router sending it
+        feedback (Tuple[str, int, int]): (source IP, positive count, \
+                                         negative count)
+        """
+        self._schedule(self.now + delay, receiver, sender, FEEDBACK, feedback)
+
+    def __host_send(self, index: int, target: str) -> None:
+        """
+        Sends the next Packet of a flow, and schedules the one after it
+
+        Parameters:
+        index  (int): The index of the sending Host
+        target (str): The IP of the target Host
+        """
+        host: Host = self.nodes[index]
+        if not self.network.can_send(host.ip):
+            return
+
+        receiver_data: Tuple[str, str, str] = \
+            self.network.send_packet(host.ip, target)
+        if receiver_data is not None:
+            self._forward(index, receiver_data[0], receiver_data[1])
+
+        # The send rate might have changed due to feedback, so it is read
+        # only after sending
+        if self.network.can_send(host.ip) and host.send_rate > 0:
+            self._schedule(self.now + 1 / host.send_rate, index, index,
+                           HOST_SEND, target)
+
+    def __router_send(self, index: int) -> None:
+        """
+        Forwards a Packet from a Router's buffer, and keeps the Router busy
+        while there is anything left in the buffer
+
+        Parameters:
+        index (int): The index of the Router
+        """
+        router: Router = self.nodes[index]
+        # A send of a Router with output queues that was moved earlier is
+        # simply skipped
+        if router.output_queues is not None and \
+           self.__serve_at[index] != self.now:
+            return
+        self.__serve_at[index] = None
+        next_hop: Tuple[str, str, str] = \
+            self.network.send_packet(router.ip, now=self.now)
+        if next_hop is not None:
+            self._forward(index, next_hop[0], next_hop[1])
+        self.__serving[index] = False
+        self.__start_serving(index)
+
+    def __start_serving(self, index: int) -> None:
+        """
+        Schedules the next send of a Router, if it is idle and has Packets
+
+        Parameters:
+        index (int): The index of the Router
+        """
+        router: Router = self.nodes[index]
+        if router.output_queues is not None:
+            self.__start_serving_queues(index)
+            return
+        if self.__serving[index] or router.get_buffer_length() == 0 or \
+           router.send_rate <= 0:
+            return
+        self.__serving[index] = True
+        self._schedule(self.now + 1 / router.send_rate, index, index,
+                       ROUTER_SEND, None)
+
+    def __start_serving_queues(self, index: int) -> None:
+        """
+        Schedules the next send of a Router with output queues, once it is
+        done with the previous one, and the Link of a queue with Packets is
+        free - a queue becoming ready sooner moves the send earlier
+
+        Parameters:
+        index (int): The index of the Router
+        """
+        router: Router = self.nodes[index]
+        ready: float = router.output_queues.next_ready_time()
+        if ready is None or router.send_rate <= 0:
+            return
+        serve_at: float = max(self.now + 1 / router.send_rate, ready)
+        if self.__serve_at[index] is not None and \
+           self.__serve_at[index] <= serve_at:
+            return
+        self.__serve_at[index] = serve_at
+        self._schedule(serve_at, index, index, ROUTER_SEND, None)
+
+    def __arrive(self, index: int, interface_name: str) -> None:
+        """
+        Receives a Packet on a Node
+
+        Parameters:
+        index          (int): The index of the receiving Node
+        interface_name (str): The receiving Interface's name
+        """
+        node: Node = self.nodes[index]
+        if not isinstance(node, Router):
+            self.network.receive_packet(node.ip, interface_name)
+            return
+
+        # Packets arriving at the same time on the same Router are admitted
+        # together - their events are next to each other on the heap
+        interface_names: List[str] = [interface_name]
+        events: List[Tuple] = self.events
+        while events and events[0][0] == self.now and \
+              events[0][1] == index and events[0][4] == ARRIVE:
+            interface_names.append(heapq.heappop(events)[5])
+            self.processed += 1
+        if len(interface_names) == 1:
+            self.network.receive_packet(node.ip, interface_name)
+        else:
+            self.network.receive_batch(node.ip, interface_names)
+        self.__start_serving(index)
+        self.__start_flushing(index)
+
+    def __start_flushing(self, index: int) -> None:
+        """
+        Schedules the end of a Router's feedback window, if it adds up
+        feedback, and there is some waiting
+
+        Parameters:
+        index (int): The index of the Router
+        """
+        router: Router = self.nodes[index]
+        if self.__flushing[index] or router.feedback.window <= 0 or \
+           not router.feedback.has_pending():
+            return
+        self.__flushing[index] = True
+        self._schedule(self.now + router.feedback.window, index, index,
+                       FLUSH, None)
+
+    def __flush(self, index: int) -> None:
+        """
+        Sends the feedback a Router added up during its window, each part
+        arriving after the delay of its path
+
+        Parameters:
+        index (int): The index of the Router
+        """
+        router: Router = self.nodes[index]
+        for receiver, source, positive, negative, delay in \
+                router.feedback.flush():
+            self._send_feedback(delay, self.node_index[receiver.ip], index,
+                                (source, positive, negative))
+        self.__flushing[index] = False
+
+    def _receive_feedback(self, event: Tuple) -> None:
+        """
+        Gives added up feedback to a Node - positive first, as the Router
+        sends the negative ones only once its buffer is full
+
+        Parameters:
+        event (Tuple): The feedback event, its data being (source IP, \
+                       positive count, negative count)
+        """
+        source, positive, negative = event[5]
+        if positive > 0:
+            self.nodes[event[1]].receive_feedback(source, 1, positive)
+        if negative > 0:
+            self.nodes[event[1]].receive_feedback(source, -1, negative)
+
+    def step(self) -> None:
+        """
+        Processes the next pending event
+        """
+        event: Tuple = heapq.heappop(self.events)
+        self.now = event[0]
+        kind: int = event[4]
+        if kind == HOST_SEND:
+            self.__host_send(event[1], event[5])
+        elif kind == ROUTER_SEND:
+            self.__router_send(event[1])
+        elif kind == ARRIVE:
+            self.__arrive(event[1], event[5])
+        elif kind == FEEDBACK:
+            self._receive_feedback(event)
+        else:
+            self.__flush(event[1])
+        self.processed += 1
+
+    def run(self, until: float) -> None:
+        """
+        Processes every event happening before the given time
+
+        Parameters:
+        until (float): The time to stop at
+        """
+        events: List[Tuple] = self.events
+        while events and events[0][0] < until:
+            self.step()
+        self.now = max(self.now, until) if until != inf else self.now
+
+    def statistics(self) -> Dict[str, Any]:
+        """
+        Gets the statistics of the Network, as shown in the StatisticsFrame
+
+        Returns:
+        Dict[str, Any]: The statistics of the simulation
+        """
+        return {"total_pack": self.network.total_pack,
+                "dropped_pack": self.network.dropped_pack,
+                "received_pack": self.network.received_pack,
+                "avg_ppv_sent": self.network.avg_ppv_sent,
+                "avg_ppv_dropped": self.network.avg_ppv_dropped,
+                "avg_ppv_received": self.network.avg_ppv_received}
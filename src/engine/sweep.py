@@ -0,0 +1,253 @@
+"""
+This module makes parameter sweeps over a Scenario available for use when
+imported\n
+Every point of the parameter grid is simulated in its own process, and the
+results are appended to a single JSON lines file as soon as they finish, so
+an interrupted sweep can be resumed from that file
+"""
+
+# Built-in modules
+import hashlib
+import itertools
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Set, TextIO
+
+# Self-made modules
+from src.engine.fairness import FairnessMonitor
+from src.engine.flows import FlowTable
+from src.engine.latency import LatencyRecorder
+from src.engine.results import TimeSeriesRecorder, write_bundle
+from src.engine.scenario import Scenario
+from src.engine.simulator import Simulator
+
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Creates every combination of the values in a parameter grid
+
+    Parameters:
+    grid (Dict[str, List[Any]]): Scenario path -> values to try, see \
+                                 Scenario.with_overrides() for the paths
+
+    Returns:
+    List[Dict[str, Any]]: The overrides of every point of the grid
+    """
+    paths: List[str] = sorted(grid)
+    return [dict(zip(paths, values))
+            for values in itertools.product(*(grid[path] for path in paths))]
+
+
+def point_id(scenario: Dict, overrides: Dict[str, Any]) -> str:
+    """
+    Gets a stable identifier of a point of the grid, used for resuming\n
+    The base Scenario is part of it, so results of an other Scenario or
+    duration in the same results file are not taken for the point's
+
+    Parameters:
+    scenario  (Dict): The dictionary representation of the base Scenario
+    overrides (Dict[str, Any]): The overrides of the point
+
+    Returns:
+    str: The identifier of the point
+    """
+    encoded: bytes = json.dumps({"scenario": scenario, "overrides": overrides},
+                                sort_keys=True).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+def run_point(scenario: Dict,
+              overrides: Dict[str, Any],
+              bundle_dir: str = None
+              ) -> Dict[str, Any]:
+    """
+    Simulates a single point of the grid - this runs in a worker process
+
+    Parameters:
+    scenario   (Dict): The dictionary representation of the base Scenario
+    overrides  (Dict[str, Any]): The overrides of the point
+    bundle_dir (str): The directory to write the results bundle of the \
+                      point to, or None to only keep the statistics
+
+    Returns:
+    Dict[str, Any]: The result record of the point
+    """
+    started: float = time.perf_counter()
+    point: Scenario = Scenario.from_dict(scenario).with_overrides(overrides)
+    simulator: Simulator = Simulator.from_scenario(point)
+    if bundle_dir is not None:
+        probes: Dict[str, Any] = {
+            "flows": FlowTable(),
+            "series": TimeSeriesRecorder(simulator.network, simulator.clock),
+            "fairness": FairnessMonitor(simulator.clock),
+            "latency": LatencyRecorder(simulator.clock)}
+        for probe in probes.values():
+            simulator.network.attach_probe(probe)
+    simulator.run(point.duration)
+    record: Dict[str, Any] = {"id": point_id(scenario, overrides),
+                              "status": "ok",
+                              "overrides": overrides,
+                              "statistics": simulator.statistics(),
+                              "events": simulator.processed,
+                              "elapsed": time.perf_counter() - started}
+    if bundle_dir is not None:
+        record["bundle"] = os.path.join(bundle_dir, f"{record['id']}.npz")
+        write_bundle(record["bundle"],
+                     {"id": record["id"], "overrides": overrides,
+                      "scenario": point.to_dict(), "until": point.duration,
+                      "events": simulator.processed},
+                     record["statistics"], **probes)
+    return record
+
+
+def print_progress(done: int, total: int, elapsed: float) -> None:
+    """
+    Prints the progress of a sweep and its estimated remaining time
+
+    Parameters:
+    done    (int): The amount of points finished in this session
+    total   (int): The amount of points to run in this session
+    elapsed (float): Seconds since the session started
+    """
+    eta: float = elapsed / done * (total - done) if done > 0 else 0.0
+    percent: float = 100 * done / total if total > 0 else 100.0
+    sys.stderr.write(f"\r[{done}/{total}] {percent:5.1f}% "
+                     f"elapsed {time.strftime('%H:%M:%S', time.gmtime(elapsed))} "
+                     f"ETA {time.strftime('%H:%M:%S', time.gmtime(eta))}")
+    if done == total:
+        sys.stderr.write("\n")
+    sys.stderr.flush()
+
+
+class SweepRunner:
+    """
+    Runs a Scenario for every point of a parameter grid on a process pool
+
+    Data members:
+    scenario     (Scenario): The base Scenario
+    grid         (Dict[str, List[Any]]): Scenario path -> values to try
+    results_path (str): The JSON lines file the results are streamed to
+    workers      (int): The amount of worker processes
+    progress     (Callable[[int, int, float], None]): Called after every \
+                 finished point with (done, total, elapsed seconds)
+    bundle_dir   (str): The directory results bundles are written to, or \
+                 None to only keep the statistics
+    """
+
+    def __init__(self,
+                 scenario: Scenario,
+                 grid: Dict[str, List[Any]],
+                 results_path: str,
+                 workers: int = None,
+                 progress: Callable[[int, int, float], None] = print_progress,
+                 bundle_dir: str = None
+                 ) -> None:
+        self.scenario:     Scenario = scenario
+        self.grid:         Dict[str, List[Any]] = grid
+        self.results_path: str = results_path
+        self.workers:      int = workers or os.cpu_count()
+        self.progress:     Callable[[int, int, float], None] = progress
+        self.bundle_dir:   str = bundle_dir
+
+    def completed(self) -> Set[str]:
+        """
+        Gets the identifiers of the points already finished successfully\n
+        Failed points and a half-written last line (from a killed run) are
+        not counted, so they are run again
+
+        Returns:
+        Set[str]: The identifiers of the finished points
+        """
+        done: Set[str] = set()
+        if not os.path.exists(self.results_path):
+            return done
+        with open(self.results_path, encoding="utf-8") as results_file:
+            for line in results_file:
+                try:
+                    record: Dict[str, Any] = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("status") == "ok":
+                    done.add(record["id"])
+        return done
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """
+        Gets the overrides of the points that still need to be run
+
+        Returns:
+        List[Dict[str, Any]]: The overrides of the unfinished points
+        """
+        done: Set[str] = self.completed()
+        scenario: Dict = self.scenario.to_dict()
+        return [overrides for overrides in expand_grid(self.grid)
+                if point_id(scenario, overrides) not in done]
+
+    def run(self) -> int:
+        """
+        Runs every unfinished point of the grid
+
+        Returns:
+        int: The amount of points that failed
+        """
+        points: List[Dict[str, Any]] = self.pending()
+        failed: int = 0
+        started: float = time.perf_counter()
+        scenario: Dict = self.scenario.to_dict()
+        self.__terminate_last_line()
+        if self.bundle_dir is not None:
+            os.makedirs(self.bundle_dir, exist_ok=True)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor, \
+             open(self.results_path, "a", encoding="utf-8") as results_file:
+            futures: Dict[Future, Dict[str, Any]] = \
+                {executor.submit(run_point, scenario, overrides,
+                                 self.bundle_dir): overrides
+                 for overrides in points}
+            for done, future in enumerate(as_completed(futures), start=1):
+                try:
+                    record: Dict[str, Any] = future.result()
+                except Exception:  # pylint: disable=broad-except
+                    # Failures are recorded too, but they are run again
+                    # when the sweep is resumed
+                    overrides: Dict[str, Any] = futures[future]
+                    record = {"id": point_id(scenario, overrides),
+                              "status": "failed",
+                              "overrides": overrides,
+                              "error": traceback.format_exc()}
+                    failed += 1
+                self.__write(results_file, record)
+                if self.progress is not None:
+                    self.progress(done, len(points),
+                                  time.perf_counter() - started)
+
+        return failed
+
+    def __terminate_last_line(self) -> None:
+        """
+        Makes sure the results file ends with a new line, so the first record
+        appended is not glued to a half-written line of a killed run
+        """
+        if not os.path.exists(self.results_path) or \
+           os.path.getsize(self.results_path) == 0:
+            return
+        with open(self.results_path, "rb+") as results_file:
+            results_file.seek(-1, os.SEEK_END)
+            if results_file.read(1) != b"\n":
+                results_file.write(b"\n")
+
+    @staticmethod
+    def __write(results_file: TextIO, record: Dict[str, Any]) -> None:
+        """
+        Appends a record to the results file, making sure it reaches the disk
+
+        Parameters:
+        results_file (TextIO): The opened results file
+        record       (Dict[str, Any]): The record to write
+        """
+        results_file.write(json.dumps(record) + "\n")
+        results_file.flush()
@@ -0,0 +1,289 @@
+"""
+This module makes the synthetic topology generators available for use when
+imported\n
+Every generator describes a Network of Routers connected in a well-known
+shape as a Scenario, with Hosts attached to some of the Routers and a flow
+between every pair of them, so the same shapes can be built, simulated and
+measured at any size
+"""
+
+# Built-in modules
+import math
+import random
+from typing import Callable, Dict, List, Set, Tuple
+
+# Self-made modules
+from src.engine.scenario import Scenario
+
+# The speed and metrics of every generated Link
+LINK_SPEED:   int = 1000
+LINK_METRICS: int = 1
+
+
+def router_ip(index: int) -> str:
+    """
+    Gets the IP of a generated Router
+
+    Parameters:
+    index (int): The index of the Router
+
+    Returns:
+    str: The IP, 10.0.0.1 and on
+    """
+    index += 1
+    return f"10.{index // 65536}.{index // 256 % 256}.{index % 256}"
+
+
+def host_ip(index: int) -> str:
+    """
+    Gets the IP of a generated Host
+
+    Parameters:
+    index (int): The index of the Host
+
+    Returns:
+    str: The IP, 172.16.0.1 and on
+    """
+    index += 1
+    return f"172.{16 + index // 65536}.{index // 256 % 256}.{index % 256}"
+
+
+def assemble(routers: int,
+             edges: List[Tuple[int, int]],
+             hosts: int = 2,
+             packets: int = 100,
+             send_rate: int = 100,
+             seed: int = 0,
+             host_routers: List[int] = None
+             ) -> Scenario:
+    """
+    Creates a Scenario out of Routers connected by edges, attaching Hosts to
+    Routers spread evenly by index, every Host sending to the one half the
+    Hosts away
+
+    Parameters:
+    routers      (int): The amount of Routers
+    edges        (List[Tuple[int, int]]): The Router index pairs to connect
+    hosts        (int): The amount of Hosts to attach
+    packets      (int): The amount of Packets every Host sends
+    send_rate    (int): The send rate of every Node (Packets / second)
+    seed         (int): The master seed of the Scenario
+    host_routers (List[int]): The Routers Hosts can be attached to, or None \
+                              for every Router
+
+    Returns:
+    Scenario: The created Scenario
+    """
+    interfaces: List[int] = [0] * routers
+
+    def next_interface(router: int) -> str:
+        interfaces[router] += 1
+        return f"e{interfaces[router] - 1}"
+
+    scenario: Scenario = Scenario(duration=10.0, seed=seed)
+    scenario.routers = [{"name": f"r{index}", "ip": router_ip(index),
+                         "send_rate": send_rate, "buffer_size": 64}
+                        for index in range(routers)]
+    for first, second in edges:
+        scenario.links.append({"node": f"r{first}",
+                               "interface": next_interface(first),
+                               "other_node": f"r{second}",
+                               "other_interface": next_interface(second),
+                               "speed": LINK_SPEED, "metrics": LINK_METRICS})
+    candidates: List[int] = host_routers or list(range(routers))
+    for index in range(hosts):
+        router: int = candidates[index * len(candidates) // hosts]
+        scenario.hosts.append({"name": f"h{index}", "ip": host_ip(index),
+                               "send_rate": send_rate,
+                               "application": {"name": f"a{index}",
+                                               "amount": packets,
+                                               "send_rate": send_rate,
+                                               "app_type": "CONST"}})
+        scenario.links.append({"node": f"h{index}", "interface": "e0",
+                               "other_node": f"r{router}",
+                               "other_interface": next_interface(router),
+                               "speed": LINK_SPEED, "metrics": LINK_METRICS})
+    if hosts > 1:
+        scenario.flows = [{"source": f"h{index}",
+                           "target": f"h{(index + hosts // 2) % hosts}"}
+                          for index in range(hosts)]
+    return scenario
+
+
+def line(routers: int, **options) -> Scenario:
+    """
+    Creates Routers connected one after the other
+
+    Parameters:
+    routers (int): The amount of Routers
+    options: Passed on to assemble()
+
+    Returns:
+    Scenario: The created Scenario
+    """
+    return assemble(routers, [(index, index + 1)
+                              for index in range(routers - 1)], **options)
+
+
+def ring(routers: int, **options) -> Scenario:
+    """
+    Creates Routers connected in a circle
+
+    Parameters:
+    routers (int): The amount of Routers (at least 3)
+    options: Passed on to assemble()
+
+    Returns:
+    Scenario: The created Scenario
+    """
+    routers = max(routers, 3)
+    return assemble(routers, [(index, (index + 1) % routers)
+                              for index in range(routers)], **options)
+
+
+def star(routers: int, **options) -> Scenario:
+    """
+    Creates Routers connected to the first one
+
+    Parameters:
+    routers (int): The amount of Routers, the center included
+    options: Passed on to assemble()
+
+    Returns:
+    Scenario: The created Scenario
+    """
+    return assemble(routers, [(0, index) for index in range(1, routers)],
+                    **options)
+
+
+def grid(routers: int, **options) -> Scenario:
+    """
+    Creates Routers connected to their neighbours in the largest square grid
+    of at most the given size
+
+    Parameters:
+    routers (int): The amount of Routers to fit the grid into
+    options: Passed on to assemble()
+
+    Returns:
+    Scenario: The created Scenario
+    """
+    side: int = max(1, math.isqrt(routers))
+    edges: List[Tuple[int, int]] = []
+    for row in range(side):
+        for column in range(side):
+            index: int = row * side + column
+            if column + 1 < side:
+                edges.append((index, index + 1))
+            if row + 1 < side:
+                edges.append((index, index + side))
+    return assemble(side * side, edges, **options)
+
+
+def fat_tree(routers: int, **options) -> Scenario:
+    """
+    Creates the largest k-ary fat-tree of at most the given size: k pods of
+    k / 2 edge and k / 2 aggregation Routers, connected through (k / 2)^2
+    core Routers, 5k^2 / 4 Routers in total
+
+    Parameters:
+    routers (int): The amount of Routers to fit the tree into
+    options: Passed on to assemble()
+
+    Returns:
+    Scenario: The created Scenario
+    """
+    k: int = 2
+    while 5 * (k + 2) ** 2 // 4 <= routers:
+        k += 2
+    half: int = k // 2
+    cores: int = half * half
+    edges: List[Tuple[int, int]] = []
+    for pod in range(k):
+        aggregations: int = cores + pod * k
+        edge_routers: int = aggregations + half
+        for aggregation in range(half):
+            for edge in range(half):
+                edges.append((aggregations + aggregation, edge_routers + edge))
+            for core in range(half):
+                edges.append((aggregation * half + core,
+                              aggregations + aggregation))
+    # The Hosts are attached to the edge Routers
+    return assemble(cores + k * k, edges,
+                    host_routers=[cores + pod * k + half + edge
+                                  for pod in range(k) for edge in range(half)],
+                    **options)
+
+
+def erdos_renyi(routers: int,
+                probability: float = None,
+                seed: int = 0,
+                **options
+                ) -> Scenario:
+    """
+    Creates Routers connected by random edges, each present with the same
+    probability - on top of a random spanning tree, so the Network is
+    always connected
+
+    Parameters:
+    routers     (int): The amount of Routers
+    probability (float): The probability of every edge, or None for an \
+                         average degree of about 4
+    seed        (int): The seed of the edges, and of the Scenario
+    options: Passed on to assemble()
+
+    Returns:
+    Scenario: The created Scenario
+    """
+    rng: random.Random = random.Random(seed)
+    if probability is None:
+        probability = min(1.0, 2.0 / max(routers - 1, 1))
+    edges: Set[Tuple[int, int]] = {(rng.randrange(index), index)
+                                   for index in range(1, routers)}
+    for first in range(routers):
+        for second in range(first + 1, routers):
+            if rng.random() < probability:
+                edges.add((first, second))
+    return assemble(routers, sorted(edges), seed=seed, **options)
+
+
+def scale_free(routers: int,
+               attachments: int = 2,
+               seed: int = 0,
+               **options
+               ) -> Scenario:
+    """
+    Creates Routers connected by preferential attachment (Barabási-Albert):
+    every new Router connects to existing ones with a probability
+    proportional to their degree
+
+    Parameters:
+    routers     (int): The amount of Routers
+    attachments (int): The amount of Routers every new one connects to
+    seed        (int): The seed of the edges, and of the Scenario
+    options: Passed on to assemble()
+
+    Returns:
+    Scenario: The created Scenario
+    """
+    rng: random.Random = random.Random(seed)
+    attachments = max(1, min(attachments, routers - 1))
+    edges: List[Tuple[int, int]] = [(index, attachments)
+                                    for index in range(attachments)]
+    # Every Router appears once per edge it has
+    ends: List[int] = [end for edge in edges for end in edge]
+    for index in range(attachments + 1, routers):
+        targets: Set[int] = set()
+        while len(targets) < attachments:
+            targets.add(rng.choice(ends))
+        for target in sorted(targets):
+            edges.append((target, index))
+            ends.extend((target, index))
+    return assemble(routers, edges, seed=seed, **options)
+
+
+# Topology name -> generator, taking the amount of Routers and the options of
+# assemble()
+GENERATORS: Dict[str, Callable[..., Scenario]] = {
+    "line": line, "ring": ring, "star": star, "grid": grid,
+    "fat_tree": fat_tree, "erdos_renyi": erdos_renyi, "scale_free": scale_free}
@@ -0,0 +1,207 @@
+"""
+This module makes binary Packet event traces available for use when imported\n
+A trace is a small header followed by fixed-width records of
+(time, event, node, packet, ppv, size), so it can be written with a single
+struct call per event, and read back without parsing, as a NumPy array
+mapped straight from the file
+"""
+
+# Built-in modules
+import mmap
+import struct
+from typing import Callable, Dict, Iterator, Tuple
+
+# Third-party modules
+import numpy as np
+
+# Self-made modules
+from src.components.network import Network
+from src.components.node import Node
+from src.components.packet import Packet
+
+MAGIC:   bytes = b"PPVTRACE"
+VERSION: int = 1
+HEADER:  struct.Struct = struct.Struct("<8sHH")
+
+# time (s), event type, node id, packet id, PPV, size
+RECORD:  struct.Struct = struct.Struct("<dBIQiI")
+RECORD_DTYPE: np.dtype = np.dtype([("time", "<f8"),
+                                   ("event", "u1"),
+                                   ("node", "<u4"),
+                                   ("packet", "<u8"),
+                                   ("ppv", "<i4"),
+                                   ("size", "<u4")])
+
+
+def packet_uid(source_id: int, packet_id: int) -> int:
+    """
+    Gets the trace-wide identifier of a Packet: the id of the Node that
+    created it, and the Packet's sequence number in its Application
+
+    Parameters:
+    source_id (int): The trace id of the source Node
+    packet_id (int): The Packet's packet_id
+
+    Returns:
+    int: The identifier written to the trace
+    """
+    return (source_id << 32) | packet_id
+
+
+class TraceWriter:
+    """
+    A probe writing every Packet event of a Network into a binary trace\n
+    Records are packed into a preallocated buffer, and written to the file
+    only when the buffer is full
+
+    Data members:
+    path     (str): The path of the trace file
+    clock    (Callable[[], float]): Gives the current simulated time
+    node_ids (Dict[str, int]): Node IP -> id written to the trace
+    written  (int): The amount of records written so far
+    """
+
+    def __init__(self,
+                 path: str,
+                 network: Network,
+                 clock: Callable[[], float],
+                 buffered_records: int = 65536
+                 ) -> None:
+        self.path:     str = path
+        self.clock:    Callable[[], float] = clock
+        self.node_ids: Dict[str, int] = \
+            {node.ip: index for index, node in enumerate(network.get_nodes())}
+        self.written:  int = 0
+        self.__buffer: bytearray = bytearray(RECORD.size * buffered_records)
+        self.__offset: int = 0
+        self.__file = open(path, "wb")  # pylint: disable=consider-using-with
+        self.__file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+
+    def __node_id(self, ip: str) -> int:
+        """
+        Gets the trace id of a Node, giving a new one to Nodes created after
+        the trace was started
+
+        Parameters:
+        ip (str): The IP of the Node
+
+        Returns:
+        int: The id of the Node
+        """
+        node_id: int = self.node_ids.get(ip)
+        if node_id is None:
+            node_id = len(self.node_ids)
+            self.node_ids[ip] = node_id
+        return node_id
+
+    def __call__(self, event: int, node: Node, packet: Packet, value: int = 0) -> None:
+        node_id: int = self.__node_id(node.ip)
+        if packet is None:
+            # Feedback has no Packet, the PPV column holds the feedback
+            uid, ppv, size = 0, value, 0
+        else:
+            uid = packet_uid(self.__node_id(packet.source_ip), packet.packet_id)
+            ppv, size = packet.ppv, packet.size
+
+        RECORD.pack_into(self.__buffer, self.__offset, self.clock(), event,
+                         node_id, uid, ppv, size)
+        self.__offset += RECORD.size
+        self.written += 1
+        if self.__offset == len(self.__buffer):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the buffered records to the file
+        """
+        self.__file.write(memoryview(self.__buffer)[:self.__offset])
+        self.__offset = 0
+        self.__file.flush()
+
+    def close(self) -> None:
+        """
+        Writes the remaining records, and closes the file
+        """
+        if not self.__file.closed:
+            self.flush()
+            self.__file.close()
+
+
+class TraceReader:
+    """
+    Reads a binary trace by memory-mapping it, without copying or parsing
+
+    Data members:
+    path (str): The path of the trace file
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        with open(path, "rb") as trace_file:
+            header: bytes = trace_file.read(HEADER.size)
+            if len(header) != HEADER.size:
+                raise ValueError(f"{path} is not a trace file")
+            magic, version, record_size = HEADER.unpack(header)
+            if magic != MAGIC or record_size != RECORD.size:
+                raise ValueError(f"{path} is not a trace file")
+            if version != VERSION:
+                raise ValueError(f"Trace version {version} is not supported, "
+                                 f"expected version {VERSION}")
+            size: int = trace_file.seek(0, 2)
+            self.__map = mmap.mmap(trace_file.fileno(), 0,
+                                   access=mmap.ACCESS_READ) \
+                if size > HEADER.size else None
+
+    def __len__(self) -> int:
+        if self.__map is None:
+            return 0
+        return (len(self.__map) - HEADER.size) // RECORD.size
+
+    def to_numpy(self) -> np.ndarray:
+        """
+        Gets every record as a NumPy structured array, backed by the file
+
+        Returns:
+        np.ndarray: The records, with the fields of RECORD_DTYPE
+        """
+        if self.__map is None:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.frombuffer(self.__map, dtype=RECORD_DTYPE, count=len(self),
+                             offset=HEADER.size)
+
+    def chunks(self, records: int = 1 << 20) -> Iterator[np.ndarray]:
+        """
+        Streams the records in NumPy chunks of the given size, so traces
+        bigger than the memory can be replayed
+
+        Parameters:
+        records (int): The amount of records in a chunk
+
+        Returns:
+        Iterator[np.ndarray]: The chunks, in the order they were written
+        """
+        every: np.ndarray = self.to_numpy()
+        for start in range(0, len(every), records):
+            yield every[start:start + records]
+
+    def records(self) -> Iterator[Tuple[float, int, int, int, int, int]]:
+        """
+        Iterates over the records as plain tuples, without NumPy
+
+        Returns:
+        Iterator[Tuple[float, int, int, int, int, int]]: (time, event, node, \
+                                                         packet, ppv, size)
+        """
+        if self.__map is None:
+            return iter(())
+        return RECORD.iter_unpack(
+            memoryview(self.__map)[HEADER.size:HEADER.size + len(self) * RECORD.size])
+
+    def close(self) -> None:
+        """
+        Unmaps the file - this fails while arrays returned by to_numpy() or
+        chunks() are still referenced
+        """
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
@@ -555,6 +555,8 @@ class MainHandler:
         # By default, the Router is always present, because the Thread starts
         # right after it's creation
         is_present: bool = True
+        # Feedback added up by the Router is sent once per window
+        next_flush: float = time.monotonic()
 
         # Check whether the Router is still up and running
         while is_present:
@@ -576,6 +578,11 @@ class MainHandler:
                                         interface_name=next_hop[1]: \
                                             self.__packet_handling(next_hop,
                                                                 interface_name))
+            # Send the added up feedback, if the window is over
+            if router.feedback.window > 0 and time.monotonic() >= next_flush:
+                self.__flush_feedback(router)
+                next_flush = time.monotonic() + router.feedback.window
+
             # Sleep for a bit
             sleep_time: int = 1 / router.send_rate
             time.sleep(sleep_time)
@@ -587,6 +594,21 @@ class MainHandler:
             # need to make sure the statistics is up to date
             self.__update_statistics()
 
+    def __flush_feedback(self, router: Router) -> None:
+        """
+        Gives the feedback a Router added up during its window to the Nodes
+        handling it - right away, just like the feedback of Routers without
+        a window
+
+        Parameters:
+        router (Router): The Router to send the feedback of
+        """
+        for receiver, source, positive, negative, _ in router.feedback.flush():
+            if positive > 0:
+                receiver.receive_feedback(source, 1, positive)
+            if negative > 0:
+                receiver.receive_feedback(source, -1, negative)
+
     def __handle_send_submit(self) -> None:
         """
         Handles the start sending Frame's submit Button event
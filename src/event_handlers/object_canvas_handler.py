@@ -8,6 +8,7 @@ from typing import Callable, List, Tuple
 
 # Self-made modules
 from src.graphic_handlers.object_canvas import ObjectCanvas
+from src.utils.instrumentation import timed
 from src.utils.regex_checker import regex_matches
 
 
@@ -220,6 +221,7 @@ class ObjectCanvasHandler:
         """
         return self.placing
 
+    @timed()
     def redraw(self) -> None:
         """
         Redraws every component present on the Canvas
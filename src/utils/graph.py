@@ -8,6 +8,7 @@ from typing import Dict, List, Tuple
 
 # Self-written modules
 from src.components.node import Node
+from src.utils.instrumentation import timed
 
 
 class Graph:
@@ -46,6 +47,7 @@ class Graph:
                                    connection[1][1].ip, connection[1][0].name,
                                    connection[0][0].link.channels[0].metrics))
 
+    @timed()
     def dijkstra(self,
                  source_ip: str,
                  destination_ip: str
@@ -0,0 +1,127 @@
+"""
+This module makes the instrumentation counters and timers available for use
+when imported\n
+Instrumentation is enabled by setting the PPV_INSTRUMENT environment
+variable to 1 before the program starts. When it is not, timed() returns the
+decorated function itself and count() does nothing, so the hot paths run
+exactly as they would without it\n
+When it is, every timed function counts its calls and the nanoseconds spent
+in them (including the functions it calls), and report() gives the
+breakdown at the end of a run
+"""
+
+# Built-in modules
+import functools
+import os
+import time
+from typing import Any, Callable, Dict, List
+
+# Whether the instrumentation is enabled, decided once, when imported
+ENABLED: bool = os.environ.get("PPV_INSTRUMENT", "0") not in ("", "0")
+
+# Function name -> [calls, nanoseconds spent]
+_timers: Dict[str, List[int]] = {}
+
+# Counter name -> value
+_counters: Dict[str, int] = {}
+
+
+def instrument(function: Callable, name: str = None) -> Callable:
+    """
+    Wraps a function, counting its calls and the time spent in it -
+    regardless of whether the instrumentation is enabled
+
+    Parameters:
+    function (Callable): The function to wrap
+    name     (str): The name to report it under, or None for its \
+                    qualified name
+
+    Returns:
+    Callable: The wrapped function
+    """
+    timer: List[int] = _timers.setdefault(name or function.__qualname__, [0, 0])
+    clock: Callable[[], int] = time.perf_counter_ns
+
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start: int = clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timer[0] += 1
+            timer[1] += clock() - start
+
+    return wrapper
+
+
+def timed(name: str = None) -> Callable[[Callable], Callable]:
+    """
+    A decorator timing a function when the instrumentation is enabled, and
+    leaving it untouched when it is not
+
+    Parameters:
+    name (str): The name to report the function under, or None for its \
+                qualified name
+
+    Returns:
+    Callable[[Callable], Callable]: The decorator
+    """
+    if not ENABLED:
+        return lambda function: function
+    return lambda function: instrument(function, name)
+
+
+def count(name: str, amount: int = 1) -> None:
+    """
+    Adds to a named counter, when the instrumentation is enabled
+
+    Parameters:
+    name   (str): The name of the counter
+    amount (int): The amount to add
+    """
+    if ENABLED:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def reset() -> None:
+    """
+    Sets every timer and counter back to zero
+    """
+    for timer in _timers.values():
+        timer[0] = 0
+        timer[1] = 0
+    _counters.clear()
+
+
+def report() -> Dict[str, Any]:
+    """
+    Gets the call count and time breakdown of the timed functions that were
+    called, the most expensive first, and the counters
+
+    Returns:
+    Dict[str, Any]: {timers: [{name, calls, seconds, mean}], counters}
+    """
+    return {"timers": [{"name": name, "calls": calls, "seconds": spent / 1e9,
+                        "mean": spent / calls / 1e9}
+                       for name, (calls, spent) in
+                       sorted(_timers.items(), key=lambda item: -item[1][1])
+                       if calls > 0],
+            "counters": dict(sorted(_counters.items()))}
+
+
+def format_report() -> str:
+    """
+    Gets the breakdown as a table
+
+    Returns:
+    str: The table, a line per timed function and counter
+    """
+    lines: List[str] = [f"{'function':<40} {'calls':>10} "
+                        f"{'seconds':>12} {'mean (us)':>12}"]
+    breakdown: Dict[str, Any] = report()
+    for timer in breakdown["timers"]:
+        lines.append(f"{timer['name']:<40} {timer['calls']:>10} "
+                     f"{timer['seconds']:>12.6f} {timer['mean'] * 1e6:>12.3f}")
+    for name, value in breakdown["counters"].items():
+        lines.append(f"{name:<40} {value:>10}")
+    return "\n".join(lines)
@@ -8,6 +8,8 @@ from pathlib import Path
 from threading import Lock
 from typing import Dict, TextIO
 
+from src.utils.instrumentation import timed
+
 
 class Logger:
     """
@@ -31,6 +33,7 @@ class Logger:
         self.log_file: str = path + f"{datetime.now()}_" + name
         self.lock:     Lock = Lock()
 
+    @timed()
     def write(self, component: str, message: str, severity: str) -> None:
         """
         Opens and writes to the log file based on the message and severity
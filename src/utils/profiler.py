@@ -0,0 +1,197 @@
+"""
+This module makes SamplingProfiler objects available for use when imported\n
+The SamplingProfiler samples the stacks of every thread of the process from
+a daemon thread of its own, at a fixed frequency - so the daemon threads of
+the GUI are sampled just like the main thread - and writes the samples in
+the collapsed-stack format flame graph tools read: a line per distinct
+stack, the frames root first, separated by semicolons, and the amount of
+samples\n
+Frames of the program's own classes are annotated with the component they
+belong to (Network, Router, Graph, Logger, ...), and frames of tkinter with
+Tk, so the flame graph shows where the time goes by component
+"""
+
+# Built-in modules
+import os
+import sys
+import threading
+import time
+from types import FrameType
+from typing import Any, Dict, List, Tuple
+
+# The root directory of the program's sources
+SOURCE_ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def method_class(frame: FrameType) -> type:
+    """
+    Gets the class defining the method a frame runs, looked up through the
+    classes of its first argument (self or cls)
+
+    Parameters:
+    frame (FrameType): The frame of the method
+
+    Returns:
+    type: The class, or None if the frame does not run a method
+    """
+    code = frame.f_code
+    if code.co_argcount == 0:
+        return None
+    first: Any = frame.f_locals.get(code.co_varnames[0])
+    classes: Tuple[type, ...] = first.__mro__ if isinstance(first, type) \
+        else type(first).__mro__
+    for kind in classes:
+        for attribute in vars(kind).values():
+            # Unwrap class and static methods, properties and @timed()
+            function: Any = getattr(attribute, "__func__",
+                                    getattr(attribute, "fget", attribute))
+            function = getattr(function, "__wrapped__", function)
+            if getattr(function, "__code__", None) is code:
+                return kind
+    return None
+
+
+def qualified_name(frame: FrameType) -> str:
+    """
+    Gets the qualified name of the function a frame runs\n
+    Code objects only know it from Python 3.11 on, before that the class of
+    a method is looked up with method_class()
+
+    Parameters:
+    frame (FrameType): The frame to name
+
+    Returns:
+    str: "<class>.<function>" for methods, the function's name otherwise
+    """
+    code = frame.f_code
+    name: str = getattr(code, "co_qualname", None)
+    if name is not None:
+        return name
+    kind: type = method_class(frame)
+    return f"{kind.__qualname__}.{code.co_name}" if kind is not None \
+        else code.co_name
+
+
+def frame_label(frame: FrameType) -> str:
+    """
+    Gets the label of a frame in a collapsed stack
+
+    Parameters:
+    frame (FrameType): The frame to label
+
+    Returns:
+    str: "<qualified name> [<component>]" for the frames of the program's \
+         classes and of tkinter, "<qualified name> (<file>)" otherwise
+    """
+    code = frame.f_code
+    name: str = qualified_name(frame)
+    filename: str = code.co_filename
+    if filename.startswith(SOURCE_ROOT) and "." in name:
+        return f"{name} [{name.split('.', 1)[0]}]"
+    if f"{os.sep}tkinter{os.sep}" in filename:
+        return f"{name} [Tk]"
+    return f"{name} ({os.path.basename(filename)})"
+
+
+class SamplingProfiler:
+    """
+    A statistical profiler taking a sample of every thread's stack once per
+    interval, without tracing any call
+
+    Data members:
+    interval (float): The time between samples (in seconds)
+    samples  (Dict[Tuple[str, ...], int]): Collapsed stack (thread name \
+                                           first) -> amount of samples
+    taken    (int): The amount of sampling rounds taken
+    """
+
+    def __init__(self, frequency: float = 100.0) -> None:
+        if frequency <= 0:
+            raise ValueError(f"Invalid sampling frequency {frequency}")
+        self.interval: float = 1.0 / frequency
+        self.samples:  Dict[Tuple[str, ...], int] = {}
+        self.taken:    int = 0
+        self.__thread: threading.Thread = None
+        self.__stop:   threading.Event = threading.Event()
+        # Frame code -> label, as the same frames are labelled many times
+        self.__labels: Dict[object, str] = {}
+
+    def start(self) -> None:
+        """
+        Starts sampling on a daemon thread
+        """
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run, daemon=True,
+                                         name="SamplingProfiler")
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops sampling, and waits for the sampling thread to finish
+        """
+        if self.__thread is not None:
+            self.__stop.set()
+            self.__thread.join()
+            self.__thread = None
+
+    def __run(self) -> None:
+        """
+        The body of the sampling thread
+        """
+        next_sample: float = time.perf_counter()
+        while not self.__stop.is_set():
+            self.sample()
+            next_sample += self.interval
+            delay: float = next_sample - time.perf_counter()
+            if delay > 0:
+                self.__stop.wait(delay)
+            else:
+                # Fell behind (the sampled threads held the interpreter)
+                next_sample = time.perf_counter()
+
+    def sample(self) -> None:
+        """
+        Takes a sample of every thread's stack, except the sampling thread's
+        """
+        names: Dict[int, str] = {thread.ident: thread.name
+                                 for thread in threading.enumerate()}
+        own: int = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack: List[str] = []
+            while frame is not None:
+                label: str = self.__labels.get(frame.f_code)
+                if label is None:
+                    label = frame_label(frame)
+                    self.__labels[frame.f_code] = label
+                stack.append(label)
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            key: Tuple[str, ...] = tuple(reversed(stack))
+            self.samples[key] = self.samples.get(key, 0) + 1
+        self.taken += 1
+
+    def collapsed(self) -> List[str]:
+        """
+        Gets the samples in the collapsed-stack format, the most sampled
+        stack first
+
+        Returns:
+        List[str]: A line per distinct stack
+        """
+        return [";".join(frame.replace(";", ":") for frame in stack) +
+                f" {count}"
+                for stack, count in sorted(self.samples.items(),
+                                           key=lambda item: -item[1])]
+
+    def write(self, path: str) -> None:
+        """
+        Writes the samples in the collapsed-stack format
+
+        Parameters:
+        path (str): The path of the file to write
+        """
+        with open(path, "w", encoding="utf-8") as profile_file:
+            for line in self.collapsed():
+                profile_file.write(line + "\n")
@@ -0,0 +1,66 @@
+"""
+This module makes seeded random number streams available for use when
+imported\n
+Every stochastic component owns its own stream, derived from a master seed
+and the component's name, so streams don't depend on each other or on the
+order the components draw from them
+"""
+# Built-in modules
+import hashlib
+import random
+
+# Third-party modules
+import numpy as np
+
+
+def derive_seed(master_seed: int, stream_name: str) -> int:
+    """
+    Derives the seed of a named stream from the master seed
+
+    Parameters:
+    master_seed (int): The seed of the whole Scenario
+    stream_name (str): The unique name of the stream (e.g. a Host's IP)
+
+    Returns:
+    int: A 64 bit seed for the stream
+    """
+    digest: bytes = hashlib.sha256(
+        f"{master_seed}:{stream_name}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def create_rng(master_seed: int, stream_name: str) -> random.Random:
+    """
+    Creates an independent random number generator for a named stream
+
+    Parameters:
+    master_seed (int): The seed of the whole Scenario, or None for an \
+                       unseeded generator
+    stream_name (str): The unique name of the stream (e.g. a Host's IP)
+
+    Returns:
+    random.Random: The generator of the stream
+    """
+    if master_seed is None:
+        return random.Random()
+    return random.Random(derive_seed(master_seed, stream_name))
+
+
+def create_generator(master_seed: int, stream_name: str) -> np.random.Generator:
+    """
+    Creates an independent NumPy generator for a named stream, used where
+    values are drawn in bulk\n
+    Its seed is derived from a different name than the one of create_rng(),
+    so the two streams of a component are independent as well
+
+    Parameters:
+    master_seed (int): The seed of the whole Scenario, or None for an \
+                       unseeded generator
+    stream_name (str): The unique name of the stream (e.g. a Host's IP)
+
+    Returns:
+    np.random.Generator: The generator of the stream
+    """
+    if master_seed is None:
+        return np.random.default_rng()
+    return np.random.default_rng(derive_seed(master_seed, stream_name + "/bulk"))
@@ -1,3 +1,5 @@
+import numpy as np
+
 from src.components.application import Application
 from src.components.packet import Packet
 
@@ -77,6 +79,27 @@ def test_application_can_send():
         "Application.can_send() failure"
 
 
+def test_application_send_batch():
+    """
+    Test the send_batch() method of the Application
+    """
+    # Setup the Application object
+    app = Application("test_app", "127.0.0.1", 10, 10, "CONST")
+
+    # Send a batch, then one Packet, then a batch that can't fit
+    first = app.send_batch(np.array([1, 2, 3]), np.array([4, 5, 6]))
+    packet = app.send("127.0.0.1", 1, 10)
+    second = app.send_batch(np.full(10, 7), np.full(10, 8))
+
+    assert first["packet_id"].tolist() == [1, 2, 3] and \
+        first["ppv"].tolist() == [1, 2, 3] and \
+        first["size"].tolist() == [4, 5, 6] and \
+        packet.packet_id == 4 and \
+        second["packet_id"].tolist() == [5, 6, 7, 8, 9, 10] and \
+        app.curr_sent == app.amount, \
+        "Application.send_batch() failure"
+
+
 def test_application_receive(capsys):
     """
     Test the receive() method of the Application
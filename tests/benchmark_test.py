@@ -0,0 +1,24 @@
+from benchmarks.benchmark import MEASUREMENTS, measure, scaling
+
+
+def test_measure():
+    """
+    Test running every benchmark on a small topology
+    """
+    row = measure("line", 4, packets=10, repeats=1)
+    assert row["nodes"] == 6 and row["packets"] == 20 and \
+        all(row[name] > 0 for name in MEASUREMENTS), \
+        "measure failure"
+
+
+def test_scaling():
+    """
+    Test fitting the complexity exponent of measurements
+    """
+    rows = [{"topology": "line", "nodes": nodes,
+             **{name: nodes ** 2 for name in MEASUREMENTS}}
+            for nodes in (4, 8, 16)]
+    slopes = scaling(rows + [dict(rows[0], topology="star")])
+    assert abs(slopes["line"]["build_seconds"] - 2) < 1e-9 and \
+        "star" not in slopes, \
+        "scaling failure"
@@ -0,0 +1,129 @@
+from src.components.buffer_policy import CTVPolicy, FullBufferPolicy, \
+    create_policy
+from src.components.node import Router
+from src.components.packet import Packet
+from src.engine.scenario import Scenario
+from src.engine.simulator import Simulator
+
+
+def congested_scenario(policy=None):
+    """
+    Creates a Scenario of a single, overloaded Router between two Hosts
+    """
+    return Scenario(
+        [{"name": "r1", "ip": "10.0.0.1", "send_rate": 20, "buffer_size": 20,
+          "policy": policy}],
+        [{"name": "h1", "ip": "10.1.0.1", "send_rate": 40,
+          "application": {"name": "a1", "amount": 400, "send_rate": 40,
+                          "app_type": "CONST"}},
+         {"name": "h2", "ip": "10.1.0.2", "send_rate": 10,
+          "application": {"name": "a2", "amount": 0, "send_rate": 10,
+                          "app_type": "CONST"}}],
+        [{"node": "h1", "interface": "e0", "other_node": "r1",
+          "other_interface": "e0", "speed": 100, "metrics": 1},
+         {"node": "h2", "interface": "e0", "other_node": "r1",
+          "other_interface": "e1", "speed": 100, "metrics": 1}],
+        [{"source": "h1", "target": "h2"}], 10, seed=7)
+
+
+def test_full_buffer_policy_admit():
+    """
+    Test the admit() method of the FullBufferPolicy
+    """
+    # Setup a Router with a buffer of 2
+    router = Router("router", "192.168.1.1", 10, 2)
+    policy = FullBufferPolicy()
+    packet_1 = Packet("192.167.1.1", "192.168.1.2", 5, 10)
+    drop_1 = policy.admit(router, packet_1)
+    router.buffer.extend([Packet("192.167.1.1", "192.168.1.2", 3, 10),
+                          packet_1])
+
+    # The buffer is full, the lowest PPV Packet is replaced, if it is lower
+    packet_2 = Packet("192.167.1.1", "192.168.1.2", 3, 10)
+    drop_2 = policy.admit(router, packet_2)
+    packet_3 = Packet("192.167.1.1", "192.168.1.2", 4, 10)
+    drop_3 = policy.admit(router, packet_3)
+
+    assert drop_1 is None and \
+        drop_2 is packet_2 and \
+        drop_3 is router.buffer[0], \
+        "FullBufferPolicy.admit() failure"
+
+
+def test_ctv_policy_admit():
+    """
+    Test that the CTVPolicy drops Packets below the computed CTV
+    """
+    # Setup a Router with a buffer over its target occupancy
+    router = Router("router", "192.168.1.1", 10, 10)
+    router.buffer.extend([Packet("192.167.1.1", "192.168.1.2", 5, 10)] * 9)
+    policy = create_policy({"type": "ctv", "interval": 10, "gain": 1.0})
+
+    # The first interval admits everything (but the Packet arriving when
+    # the buffer is full)
+    drops_1 = [policy.admit(router, Packet("192.167.1.1", "192.168.1.2",
+                                           ppv, 10)) is not None
+               for ppv in range(1, 11)]
+    ctv = policy.ctv
+
+    # The next interval drops the low PPVs
+    router.buffer = router.buffer[:5]
+    drops_2 = [policy.admit(router, Packet("192.167.1.1", "192.168.1.2",
+                                           ppv, 10)) is not None
+               for ppv in (1, 5, 6, 10)]
+
+    assert isinstance(policy, CTVPolicy) and \
+        not any(drops_1) and \
+        abs(policy.admitted_share - 0.6) < 1e-9 and \
+        ctv == 5 and \
+        drops_2 == [True, False, False, False] and \
+        policy.to_dict()["type"] == "CTV", \
+        "CTVPolicy.admit() failure"
+
+
+def test_ctv_policy_admits_top_ppv():
+    """
+    Test that the CTVPolicy admits the highest PPV that arrived, even when
+    the admitted share runs out
+    """
+    # Setup a Router with a full buffer, so the admitted share drops to 0
+    router = Router("router", "192.168.1.1", 10, 10)
+    router.buffer.extend([Packet("192.167.1.1", "192.168.1.2", 5, 10)] * 10)
+    policy = CTVPolicy(interval=4, gain=2.0)
+    for ppv in (2, 3, 7, 7):
+        policy.admit(router, Packet("192.167.1.1", "192.168.1.2", ppv, 10))
+
+    # Once there is room again, only the top PPV gets in
+    router.buffer = router.buffer[:5]
+    drops = [policy.admit(router, Packet("192.167.1.1", "192.168.1.2",
+                                         ppv, 10)) is not None
+             for ppv in (3, 7)]
+
+    assert policy.admitted_share == 0.0 and \
+        policy.ctv == 7 and \
+        drops == [True, False], \
+        "CTVPolicy.admit() failure - top PPV dropped"
+
+
+def test_ctv_policy_simulation():
+    """
+    Test that the CTVPolicy keeps the buffer shorter than the original
+    policy, while dropping lower PPVs than what gets through
+    """
+    # Run the same overloaded Scenario with both policies
+    occupancy = []
+    statistics = []
+    for policy in (None, {"type": "CTV", "interval": 16}):
+        simulator = Simulator.from_scenario(congested_scenario(policy))
+        lengths = []
+        for step in range(1, 101):
+            simulator.run(step / 10)
+            lengths.append(simulator.network.get_router("r1")
+                           .get_buffer_length())
+        occupancy.append(sum(lengths) / len(lengths))
+        statistics.append(simulator.statistics())
+
+    assert occupancy[1] < 0.8 * occupancy[0] and \
+        statistics[1]["dropped_pack"] > 0 and \
+        statistics[1]["avg_ppv_dropped"] < statistics[1]["avg_ppv_received"], \
+        "CTVPolicy failure in the Simulator"
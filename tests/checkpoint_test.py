@@ -0,0 +1,130 @@
+import inspect
+import sys
+
+import pytest
+
+from src.engine.checkpoint import load_checkpoint, save_checkpoint
+from src.engine.latency import LatencyRecorder
+from src.engine.metrics import MetricsPublisher, MetricsServer
+from src.engine.scenario import Scenario
+from src.engine.simulator import Simulator
+from src.engine.topologies import line
+from src.engine.trace import TraceWriter
+
+
+def aimd_scenario():
+    """
+    Creates a Scenario of two AIMD Hosts sharing a Router with a small buffer
+    """
+    return Scenario(
+        [{"name": "r1", "ip": "10.0.0.1", "send_rate": 15, "buffer_size": 3}],
+        [{"name": "h1", "ip": "10.1.0.1", "send_rate": 20,
+          "application": {"name": "a1", "amount": 200, "send_rate": 20,
+                          "app_type": "AIMD"}},
+         {"name": "h2", "ip": "10.1.0.2", "send_rate": 20,
+          "application": {"name": "a2", "amount": 200, "send_rate": 20,
+                          "app_type": "AIMD"}}],
+        [{"node": "h1", "interface": "e0", "other_node": "r1",
+          "other_interface": "e0", "speed": 10, "metrics": 1},
+         {"node": "h2", "interface": "e0", "other_node": "r1",
+          "other_interface": "e1", "speed": 10, "metrics": 1}],
+        [{"source": "h1", "target": "h2"}, {"source": "h2", "target": "h1"}],
+        30, seed=99)
+
+
+def test_checkpoint_restore_continues_exactly(tmp_path):
+    """
+    Test that a restored run continues exactly like the uninterrupted one
+    """
+    path = str(tmp_path / "run.ckpt")
+
+    # Run without interruption
+    reference = Simulator.from_scenario(aimd_scenario())
+    reference.run(30)
+
+    # Run half of it, save, and continue from the saved state
+    simulator = Simulator.from_scenario(aimd_scenario())
+    simulator.run(5)
+    in_flight = sum(len(interface.send_channel.payload)
+                    for node in simulator.network.get_nodes()
+                    for interface in node.interfaces)
+    save_checkpoint(simulator, path)
+    restored = load_checkpoint(path)
+    restored.run(30)
+
+    assert in_flight > 0 and \
+        restored.statistics() == reference.statistics() and \
+        restored.processed == reference.processed and \
+        restored.network.get_host("h1").send_rate == \
+        reference.network.get_host("h1").send_rate, \
+        "load_checkpoint() failure - restored run differs"
+
+
+def test_checkpoint_with_probes(tmp_path):
+    """
+    Test that a run with probes attached can be saved, keeping only the
+    persistent probes, which go on measuring the whole run
+    """
+    path = str(tmp_path / "run.ckpt")
+
+    # Measure the latency of an uninterrupted run
+    reference = Simulator.from_scenario(aimd_scenario())
+    reference_latency = LatencyRecorder(reference.clock)
+    reference.network.attach_probe(reference_latency)
+    reference.run(30)
+
+    # Attach probes holding a file, a server and nothing picklable at all
+    simulator = Simulator.from_scenario(aimd_scenario())
+    latency = LatencyRecorder(simulator.clock)
+    trace = TraceWriter(str(tmp_path / "run.trace"), simulator.network,
+                        simulator.clock)
+    server = MetricsServer(port=0)
+    for probe in (latency, trace, MetricsPublisher(simulator, server),
+                  lambda event, node, packet, value: None):
+        simulator.network.attach_probe(probe)
+    simulator.run(5)
+    save_checkpoint(simulator, path)
+    trace.close()
+    restored = load_checkpoint(path)
+    restored.run(30)
+    probes = restored.network.probes.probes
+
+    assert len(probes) == 1 and isinstance(probes[0], LatencyRecorder) and \
+        probes[0].total().count == reference_latency.total().count == \
+        restored.network.received_pack, \
+        "save_checkpoint() failure - probes"
+
+
+def test_checkpoint_shallow_pickling(tmp_path):
+    """
+    Test that saving and restoring does not go deeper into the stack as the
+    Network grows
+    """
+    path = str(tmp_path / "run.ckpt")
+    simulator = Simulator.from_scenario(line(30))
+    simulator.run(2)
+
+    # A chain of 30 Routers is far deeper than this when pickled recursively
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(len(inspect.stack()) + 100)
+    try:
+        save_checkpoint(simulator, path)
+        restored = load_checkpoint(path)
+    finally:
+        sys.setrecursionlimit(limit)
+    restored.run(10)
+    simulator.run(10)
+
+    assert restored.statistics() == simulator.statistics(), \
+        "save_checkpoint() failure - deep Network"
+
+
+def test_load_checkpoint_invalid_file(tmp_path):
+    """
+    Test that anything but a checkpoint is refused
+    """
+    path = tmp_path / "not_a_checkpoint"
+    path.write_bytes(b"definitely not a checkpoint")
+
+    with pytest.raises(ValueError):
+        load_checkpoint(str(path))
@@ -0,0 +1,93 @@
+import numpy as np
+
+from src.components.packet import Packet
+from src.components.probe import DELIVER, DROP, SEND
+from src.engine.fairness import FairnessMonitor, jain_index
+from src.engine.flows import FlowTable
+from src.engine.scenario import Scenario
+from src.engine.simulator import Simulator
+
+
+def shared_scenario():
+    """
+    Creates a Scenario of two Hosts with different send rates sending
+    through the same Router with a small buffer
+    """
+    return Scenario(
+        [{"name": "r1", "ip": "10.0.0.1", "send_rate": 20, "buffer_size": 3}],
+        [{"name": "h1", "ip": "10.1.0.1", "send_rate": 30,
+          "application": {"name": "a1", "amount": 300, "send_rate": 30,
+                          "app_type": "CONST"}},
+         {"name": "h2", "ip": "10.1.0.2", "send_rate": 10,
+          "application": {"name": "a2", "amount": 100, "send_rate": 10,
+                          "app_type": "CONST"}},
+         {"name": "h3", "ip": "10.1.0.3", "send_rate": 1,
+          "application": {"name": "a3", "amount": 0, "send_rate": 1,
+                          "app_type": "CONST"}}],
+        [{"node": name, "interface": "e0", "other_node": "r1",
+          "other_interface": name, "speed": 100, "metrics": 1}
+         for name in ("h1", "h2", "h3")],
+        [{"source": "h1", "target": "h3"}, {"source": "h2", "target": "h3"}],
+        10, seed=11)
+
+
+def test_jain_index():
+    """
+    Test Jain's fairness index on equal and unequal shares
+    """
+    assert jain_index(30, 3 * 10 ** 2, 3) == 1.0 and \
+        jain_index(10, 10 ** 2, 4) == 0.25 and \
+        jain_index(0, 0, 2) == 1.0, \
+        "jain_index() failure"
+
+
+def test_fairness_monitor():
+    """
+    Test that the incremental metrics match the ones computed from the
+    counters after the run
+    """
+    simulator = Simulator.from_scenario(shared_scenario())
+    monitor = FairnessMonitor(simulator.clock, 0.5)
+    flows = FlowTable()
+    simulator.network.attach_probe(monitor)
+    simulator.network.attach_probe(flows)
+    simulator.run(10)
+    monitor.sample(10)
+
+    network = simulator.network
+    delivered = np.array([record.delivered for record in flows.records.values()])
+    ppv_sent = sum(host.ppv_sent for host in network.hosts)
+    ppv_dropped = sum(router.ppv_dropped for router in network.routers)
+    series = monitor.series()
+
+    assert abs(monitor.jain() - delivered.sum() ** 2 /
+               (len(delivered) * (delivered ** 2).sum())) < 1e-12 and \
+        monitor.jain() < 1 and \
+        monitor.ppv_sent == ppv_sent and \
+        abs(monitor.drop_ratio() - ppv_dropped / ppv_sent) < 1e-12 and \
+        list(series["time"]) == [0.5 * step for step in range(1, 21)] and \
+        abs((series["interval_goodput"] * 0.5).sum() - monitor.ppv_received) < 1e-6 and \
+        series["cumulative_goodput"][-1] == monitor.ppv_received / 10 and \
+        ((series["jain"] > 0) & (series["jain"] <= 1)).all(), \
+        "FairnessMonitor failure"
+
+
+def test_fairness_monitor_starved_flow():
+    """
+    Test that a flow with every Packet dropped counts in Jain's index
+    """
+    now = [0.0]
+    monitor = FairnessMonitor(lambda: now[0], 1.0)
+
+    # Two flows sending the same, only the first one getting anything through
+    for index in range(10):
+        now[0] = index / 20
+        for source in ("10.1.0.1", "10.1.0.2"):
+            packet = Packet(source, "10.1.0.3", 5, 1)
+            monitor(SEND, None, packet)
+            monitor(DELIVER if source == "10.1.0.1" else DROP, None, packet)
+    row = monitor.sample(1.0)
+
+    assert monitor.jain() == 0.5 and row[1] == 0.5 and \
+        monitor.drop_ratio() == 0.5, \
+        "FairnessMonitor failure - starved flow"
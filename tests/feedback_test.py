@@ -0,0 +1,34 @@
+from src.components.node import Host, Router
+from src.components.routing_table import Route
+
+
+def test_feedback_relay_flush():
+    """
+    Test that the FeedbackRelay of a Router with a window adds up the
+    feedback per source, and hands it over with the delay of the path
+    """
+    # Setup a Host behind two Routers, the far one adding up feedback
+    host = Host("host", "192.167.1.1", 10)
+    host.set_application("host_app", 100, 10, "AIMD")
+    host.add_interface("eth0")
+    router_1 = Router("router_1", "192.168.1.1", 10, 10)
+    router_1.add_interface("eth0")
+    router_1.add_interface("eth1")
+    router_2 = Router("router_2", "192.168.1.2", 10, 10)
+    router_2.add_interface("eth0")
+    host.connect_to_interface(router_1, "eth0", "eth0", 10, 10)
+    router_1.connect_to_interface(router_2, "eth1", "eth0", 4, 10)
+    router_1.add_route(Route(host.ip, host.ip, "eth0", 1))
+    router_2.add_route(Route(host.ip, router_1.ip, "eth0", 2))
+    router_2.feedback.window = 0.5
+
+    for feedback in (1, 1, -1, 1):
+        router_2.receive_feedback(host.ip, feedback)
+    pending = router_2.feedback.has_pending()
+    flushed = router_2.feedback.flush()
+
+    assert pending and \
+        not router_2.feedback.has_pending() and \
+        flushed == [(host, host.ip, 3, 1, 0.25 + 0.1)] and \
+        host.send_rate == 10, \
+        "FeedbackRelay.flush() failure"
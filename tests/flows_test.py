@@ -0,0 +1,82 @@
+import numpy as np
+
+from src.engine.flows import DELIVERED, FlowTable
+from src.engine.scenario import Scenario
+from src.engine.simulator import Simulator
+
+
+def two_flow_scenario():
+    """
+    Creates a Scenario of two Hosts sending to each other through a Router
+    with a small buffer
+    """
+    return Scenario(
+        [{"name": "r1", "ip": "10.0.0.1", "send_rate": 15, "buffer_size": 3}],
+        [{"name": "h1", "ip": "10.1.0.1", "send_rate": 20,
+          "application": {"name": "a1", "amount": 100, "send_rate": 20,
+                          "app_type": "CONST"}},
+         {"name": "h2", "ip": "10.1.0.2", "send_rate": 10,
+          "application": {"name": "a2", "amount": 50, "send_rate": 10,
+                          "app_type": "CONST"}}],
+        [{"node": "h1", "interface": "e0", "other_node": "r1",
+          "other_interface": "e0", "speed": 10, "metrics": 1},
+         {"node": "h2", "interface": "e0", "other_node": "r1",
+          "other_interface": "e1", "speed": 10, "metrics": 1}],
+        [{"source": "h1", "target": "h2"}, {"source": "h2", "target": "h1"}],
+        30, seed=3)
+
+
+def run_with_table():
+    """
+    Runs the two flow Scenario with a FlowTable attached
+    """
+    simulator = Simulator.from_scenario(two_flow_scenario())
+    table = FlowTable()
+    simulator.network.attach_probe(table)
+    simulator.run(30)
+    return simulator, table
+
+
+def test_flow_table_counts():
+    """
+    Test that the flows add up to the totals of the Network
+    """
+    simulator, table = run_with_table()
+    network = simulator.network
+    forward = table.get("10.1.0.1", "10.1.0.2")
+    backward = table.get("10.1.0.2", "10.1.0.1")
+
+    assert len(table) == 2 and \
+        forward.sent == 100 and backward.sent == 50 and \
+        forward.delivered + backward.delivered == network.received_pack and \
+        forward.dropped + backward.dropped == network.dropped_pack and \
+        forward.dropped > 0 and \
+        sum(forward.histograms[DELIVERED]) == forward.delivered and \
+        forward.bytes_sent == forward.bytes_delivered + forward.bytes_dropped, \
+        "FlowTable failure - counts"
+
+
+def test_flow_table_export(tmp_path):
+    """
+    Test exporting the flows into NumPy columns, and merging tables
+    """
+    _, table = run_with_table()
+    path = str(tmp_path / "flows.npz")
+    table.save(path)
+    with np.load(path) as archive:
+        arrays = {name: archive[name] for name in archive.files}
+
+    merged = FlowTable()
+    merged.merge(table)
+    merged.merge(table)
+    forward = table.get("10.1.0.1", "10.1.0.2")
+    merged_forward = merged.get("10.1.0.1", "10.1.0.2")
+
+    assert list(arrays["source"]) == ["10.1.0.1", "10.1.0.2"] and \
+        list(arrays["sent"]) == [100, 50] and \
+        arrays["ppv_sent"].shape[0] == 2 and \
+        (arrays["ppv_sent"].sum(axis=1) == arrays["sent"]).all() and \
+        merged_forward.sent == 2 * forward.sent and \
+        merged_forward.histograms == [[2 * packets for packets in histogram]
+                                      for histogram in forward.histograms], \
+        "FlowTable failure - export"
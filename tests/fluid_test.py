@@ -0,0 +1,141 @@
+import pytest
+
+from src.engine.fluid import FluidSimulator
+from src.engine.scenario import Scenario
+from src.engine.simulator import Simulator
+
+
+def line_scenario(routers, buffer_size=1000, router_rate=50, app_type="CONST"):
+    """
+    Creates a Scenario of Routers connected in a line, with a Host on both
+    ends sending to each other
+    """
+    return Scenario(
+        [{"name": f"r{i}", "ip": f"10.0.0.{i + 1}", "send_rate": router_rate,
+          "buffer_size": buffer_size} for i in range(routers)],
+        [{"name": "h1", "ip": "10.1.0.1", "send_rate": 20,
+          "application": {"name": "a1", "amount": 300, "send_rate": 20,
+                          "app_type": app_type}},
+         {"name": "h2", "ip": "10.1.0.2", "send_rate": 30,
+          "application": {"name": "a2", "amount": 300, "send_rate": 30,
+                          "app_type": app_type}}],
+        [{"node": f"r{i}", "interface": "e1", "other_node": f"r{i + 1}",
+          "other_interface": "e0", "speed": 100, "metrics": 1}
+         for i in range(routers - 1)] +
+        [{"node": "h1", "interface": "e0", "other_node": "r0",
+          "other_interface": "h", "speed": 100, "metrics": 1},
+         {"node": "h2", "interface": "e0", "other_node": f"r{routers - 1}",
+          "other_interface": "h", "speed": 100, "metrics": 1}],
+        [{"source": "h1", "target": "h2"}, {"source": "h2", "target": "h1"}],
+        20, seed=1234)
+
+
+def test_fluid_simulator_init():
+    """
+    Test the paths found by the FluidSimulator
+    """
+    # Setup the FluidSimulator
+    fluid = FluidSimulator(line_scenario(3))
+
+    assert fluid.path_length.tolist() == [3, 3] and \
+        fluid.paths.tolist() == [[0, 1, 2], [2, 1, 0]] and \
+        fluid.next_hop.shape == (5, 2), \
+        "FluidSimulator.__init__() failure"
+
+
+def test_fluid_simulator_matches_simulator():
+    """
+    Test that the FluidSimulator agrees with the Simulator, without drops
+    """
+    # Run both engines on the same Scenario
+    scenario = line_scenario(4)
+    simulator = Simulator.from_scenario(scenario)
+    simulator.run(20)
+    expected = simulator.statistics()
+    fluid = FluidSimulator(scenario, 0.001)
+    fluid.run(20)
+    statistics = fluid.statistics()
+
+    assert abs(statistics["total_pack"] - expected["total_pack"]) < 1 and \
+        abs(statistics["received_pack"] - expected["received_pack"]) < 1 and \
+        statistics["dropped_pack"] < 1 and \
+        abs(statistics["avg_ppv_sent"] - expected["avg_ppv_sent"]) < 0.5 and \
+        sum(fluid.link_in_flight().values()) < 1, \
+        "FluidSimulator.run() failure - mismatch with Simulator"
+
+
+def test_fluid_simulator_matches_simulator_with_drops():
+    """
+    Test that the FluidSimulator agrees with the Simulator on average, when
+    the buffers overflow and the Hosts react to the feedback
+    """
+    # Run both engines on the same Scenario, with small buffers
+    scenario = line_scenario(4, buffer_size=5, router_rate=15, app_type="AIMD")
+    simulator = Simulator.from_scenario(scenario)
+    simulator.run(20)
+    expected = simulator.statistics()
+    fluid = FluidSimulator(scenario, 0.001)
+    fluid.run(20)
+    statistics = fluid.statistics()
+
+    assert all(abs(statistics[key] - expected[key]) <= 0.2 * expected[key]
+               for key in ("total_pack", "dropped_pack", "received_pack")) and \
+        statistics["avg_ppv_dropped"] < statistics["avg_ppv_received"], \
+        "FluidSimulator.run() failure - mismatch with Simulator"
+
+
+def test_fluid_simulator_from_network():
+    """
+    Test creating a FluidSimulator from a built Network, with a flow that
+    has no Route
+    """
+    # Setup a Network with a Host not connected to anything
+    scenario = line_scenario(2)
+    network = scenario.build_network()
+    network.create_host("h3", "10.1.0.3", 10)
+    fluid = FluidSimulator.from_network(network, [("h1", "h2"), ("h2", "h3")])
+    fluid.run(1)
+    statistics = fluid.statistics()
+
+    assert fluid.path_length.tolist() == [2, -1] and \
+        abs(statistics["total_pack"] - 50) < 1e-6 and \
+        abs(statistics["dropped_pack"] - 30) < 1e-6, \
+        "FluidSimulator.from_network() failure"
+
+
+def test_fluid_simulator_refuses_unmodelled_settings():
+    """
+    Test that Scenarios using what the FluidSimulator does not model are
+    refused, and the defaults written by Scenario.from_network() are not
+    """
+    scenario = line_scenario(2)
+    scenario.routers[0]["policy"] = {"type": "CTV", "interval": 32}
+    scenario.hosts[1]["application"]["marker"] = {"type": "TVF",
+                                                  "curve": "gold"}
+    scenario.links[0]["capacity"] = {"packets": 5, "overflow": "DROP_TAIL"}
+
+    assert FluidSimulator.unsupported(scenario) == \
+        ["the buffer policy of r0", "the marker of h2",
+         "the capacity of r0 - r1"] and \
+        FluidSimulator.unsupported(
+            Scenario.from_network(line_scenario(2).build_network())) == [], \
+        "FluidSimulator.unsupported() failure"
+
+    with pytest.raises(ValueError):
+        FluidSimulator(scenario)
+
+
+def test_fluid_simulator_application_rate():
+    """
+    Test that the Hosts send at the rate of their Application, like in the
+    Simulator, when it differs from the rate of the Host
+    """
+    scenario = line_scenario(2)
+    scenario.hosts[0]["send_rate"] = 5
+    scenario.hosts[1]["send_rate"] = 1
+    fluid = FluidSimulator(scenario)
+
+    assert fluid.host_rate.tolist() == [20, 30] and \
+        Simulator.from_scenario(scenario).network.get_host("h1").send_rate \
+        == 20, \
+        "FluidSimulator.__init__() failure - send rates"
@@ -0,0 +1,90 @@
+import json
+import os
+import subprocess
+import sys
+
+from src.utils import instrumentation
+from src.utils.instrumentation import format_report, instrument, report, timed
+
+
+def test_instrument():
+    """
+    Test counting the calls of a function and the time spent in it
+    """
+    def square(value):
+        return value * value
+
+    wrapped = instrument(square, "test.square")
+    results = [wrapped(value) for value in range(5)]
+    timer = [timer for timer in report()["timers"]
+             if timer["name"] == "test.square"][0]
+
+    assert results == [0, 1, 4, 9, 16] and wrapped.__name__ == "square", \
+        "instrument failure"
+    assert timer["calls"] == 5 and timer["seconds"] > 0 and \
+        "test.square" in format_report(), \
+        "report failure"
+
+    instrumentation.reset()
+    assert all(timer["name"] != "test.square"
+               for timer in report()["timers"]), \
+        "reset failure"
+
+
+def test_timed_disabled():
+    """
+    Test that timed() leaves functions untouched when disabled
+    """
+    def square(value):
+        return value * value
+
+    if not instrumentation.ENABLED:
+        assert timed()(square) is square, \
+            "timed failure"
+
+
+def test_instrumented_run(tmp_path):
+    """
+    Test the breakdown of the hot paths after a headless run
+    """
+    scenario = {
+        "routers": [{"name": "r1", "ip": "10.0.0.1", "send_rate": 15,
+                     "buffer_size": 5, "feedback_window": 0.5}],
+        "hosts": [{"name": "h1", "ip": "10.1.0.1", "send_rate": 20,
+                   "application": {"name": "a1", "amount": 20,
+                                   "send_rate": 20, "app_type": "CONST"}},
+                  {"name": "h2", "ip": "10.1.0.2", "send_rate": 20,
+                   "application": {"name": "a2", "amount": 1,
+                                   "send_rate": 20, "app_type": "CONST"}}],
+        "links": [{"node": "h1", "interface": "e0", "other_node": "r1",
+                   "other_interface": "e0", "speed": 100, "metrics": 1},
+                  {"node": "h2", "interface": "e0", "other_node": "r1",
+                   "other_interface": "e1", "speed": 100, "metrics": 1}],
+        "flows": [{"source": "h1", "target": "h2"},
+                  {"source": "h2", "target": "h1"}],
+        "duration": 3, "seed": 1}
+    path = tmp_path / "scenario.json"
+    path.write_text(json.dumps(scenario), encoding="utf-8")
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, os.path.join(root, "simulate.py"), str(path)],
+        capture_output=True, text=True, cwd=root, check=True,
+        env={**os.environ, "PPV_INSTRUMENT": "1", "PYTHONPATH": root})
+    lines = {line.split()[0]: line.split()[1:]
+             for line in result.stderr.splitlines()[1:]}
+
+    assert json.loads(result.stdout)["total_pack"] == 21, \
+        "Instrumented run failure"
+    # The first Packets of h1 and h2 arrive at r1 together
+    assert int(lines["Router.receive_packet"][0]) == 19 and \
+        int(lines["Router.send_packet"][0]) == 19 and \
+        "Graph.dijkstra" in lines and \
+        "Network.__update_routing_tables" in lines, \
+        "Instrumentation report failure"
+    assert int(lines["Router.receive_batch"][0]) == 1 and \
+        int(lines["Router.batched_packets"][0]) == 2 and \
+        int(lines["Router.feedback_lookups"][0]) == 2 and \
+        int(lines["Router.feedback_summaries"][0]) > 0 and \
+        int(lines["Network.routes_computed"][0]) > 0, \
+        "Instrumentation report failure - counters"
@@ -170,3 +170,27 @@ def test_interface_put_to_link():
         packet_2 is not None and \
         last_packet == packet_2, \
         "Interface.put_to_link() failure"
+
+
+def test_interface_is_blocked():
+    """
+    Test that a full Channel with backpressure blocks the Interface
+    """
+    # Setup an Interface on a Link holding two Packets per direction
+    interface = Interface("eth1")
+    link = Link(10, 10)
+    link.set_capacity(2, overflow="backpressure")
+    interface.connect_link(link, link.channels[0], link.channels[1])
+
+    # Fill up the sending Channel, then let a Packet arrive on the other side
+    blocked = []
+    for _ in range(2):
+        blocked.append(interface.is_blocked())
+        interface.put_to_link(Packet("192.168.1.1", "192.168.0.1", 10, 10))
+    blocked.append(interface.is_blocked())
+    link.channels[0].pop_payload()
+    blocked.append(interface.is_blocked())
+
+    assert blocked == [False, False, True, False] and \
+        not Interface("eth2").is_blocked(), \
+        "Interface.is_blocked() failure"
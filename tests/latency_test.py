@@ -0,0 +1,92 @@
+import numpy as np
+
+from src.engine.latency import LatencyRecorder, LatencySketch
+from src.engine.scenario import Scenario
+from src.engine.simulator import Simulator
+
+
+def line_scenario(routers):
+    """
+    Creates a Scenario of Routers connected in a line, with a Host on both
+    ends sending to each other
+    """
+    return Scenario(
+        [{"name": f"r{i}", "ip": f"10.0.0.{i + 1}", "send_rate": 25,
+          "buffer_size": 1000} for i in range(routers)],
+        [{"name": "h1", "ip": "10.1.0.1", "send_rate": 20,
+          "application": {"name": "a1", "amount": 100, "send_rate": 20,
+                          "app_type": "CONST"}},
+         {"name": "h2", "ip": "10.1.0.2", "send_rate": 10,
+          "application": {"name": "a2", "amount": 50, "send_rate": 10,
+                          "app_type": "CONST"}}],
+        [{"node": f"r{i}", "interface": "e1", "other_node": f"r{i + 1}",
+          "other_interface": "e0", "speed": 100, "metrics": 1}
+         for i in range(routers - 1)] +
+        [{"node": "h1", "interface": "e0", "other_node": "r0",
+          "other_interface": "h", "speed": 100, "metrics": 1},
+         {"node": "h2", "interface": "e0", "other_node": f"r{routers - 1}",
+          "other_interface": "h", "speed": 100, "metrics": 1}],
+        [{"source": "h1", "target": "h2"}, {"source": "h2", "target": "h1"}],
+        20, seed=7)
+
+
+def test_latency_sketch_quantiles():
+    """
+    Test that the quantiles of the sketch are within its relative accuracy
+    """
+    values = np.random.default_rng(1).lognormal(-3, 1, 20000)
+    sketch = LatencySketch(0.01)
+    for value in values:
+        sketch.add(float(value))
+
+    errors = [abs(sketch.quantile(quantile) -
+                  np.quantile(values, quantile, method="lower")) /
+              np.quantile(values, quantile, method="lower")
+              for quantile in (0.5, 0.9, 0.99, 0.999)]
+
+    assert sketch.count == 20000 and \
+        len(sketch.buckets) < 1000 and \
+        max(errors) <= 0.011 and \
+        sketch.quantile(0) == sketch.minimum and \
+        sketch.quantile(1) == sketch.maximum, \
+        "LatencySketch.quantile() failure"
+
+
+def test_latency_sketch_merge():
+    """
+    Test that merged sketches are the same as one sketch of every value,
+    and survive the dictionary round trip
+    """
+    values = np.random.default_rng(2).exponential(0.1, 3000)
+    whole, first, second = LatencySketch(), LatencySketch(), LatencySketch()
+    for index, value in enumerate(values):
+        whole.add(float(value))
+        (first if index % 2 == 0 else second).add(float(value))
+    first.merge(LatencySketch.from_dict(second.to_dict()))
+
+    assert first.buckets == whole.buckets and \
+        first.count == whole.count and \
+        first.minimum == whole.minimum and \
+        first.maximum == whole.maximum and \
+        first.summary()["p99"] == whole.summary()["p99"], \
+        "LatencySketch.merge() failure"
+
+
+def test_latency_recorder():
+    """
+    Test measuring the latency and hops of every delivered Packet
+    """
+    simulator = Simulator.from_scenario(line_scenario(3))
+    recorder = LatencyRecorder(simulator.clock)
+    simulator.network.attach_probe(recorder)
+    simulator.run(20)
+    summary = recorder.summary()
+
+    # The four Links take 4 / 100 seconds
+    assert summary["total"]["count"] == 150 and \
+        summary["flows"]["10.1.0.1 -> 10.1.0.2"]["count"] == 100 and \
+        summary["total"]["min"] >= 4 / 100 - 1e-9 and \
+        summary["total"]["p50"] <= summary["total"]["p99"] and \
+        recorder.hops[("10.1.0.1", "10.1.0.2")] == [0, 0, 0, 100] and \
+        sum(sketch.count for sketch in recorder.classes.values()) == 150, \
+        "LatencyRecorder failure"
@@ -1,4 +1,4 @@
-from src.components.link import Channel, Link
+from src.components.link import BACKPRESSURE, DROP_LOWEST, Channel, Link
 from src.components.packet import Packet
 
 #------------------------------------------------#
@@ -82,6 +82,55 @@ def test_channel_pop_payload():
         "Channel.pop_payload() failure"
 
 
+def test_channel_capacity():
+    """
+    Test that a full Channel drops the incoming Packet, or the lowest PPV one
+    in flight, keeping its place until it would have arrived
+    """
+    # Setup a Channel holding half a second of Packets at its speed
+    channel = Channel(4, 5)
+    channel.set_capacity(delay=0.5)
+    for ppv in (3, 1):
+        channel.fill_payload(Packet("127.0.0.1", "127.1.1.1", ppv, 10))
+
+    # A full Channel drops at the tail by default
+    tail = Packet("127.0.0.1", "127.1.1.1", 9, 10)
+    tail_dropped = channel.fill_payload(tail)
+
+    # Dropping the lowest PPV Packet leaves a hole in its place
+    channel.set_capacity(2, overflow=DROP_LOWEST)
+    high = Packet("127.0.0.1", "127.1.1.1", 8, 10)
+    lowest_dropped = channel.fill_payload(high)
+    popped = [channel.pop_payload() for _ in range(3)]
+
+    assert channel.capacity == 2 and \
+        tail_dropped is tail and \
+        lowest_dropped.ppv == 1 and \
+        [packet.ppv if packet else None for packet in popped] == [3, None, 8] and \
+        channel.in_flight == 0 and \
+        channel.dropped == 2, \
+        "Channel.set_capacity() failure"
+
+
+def test_channel_capacity_invalid():
+    """
+    Test that unknown overflow behaviours and empty capacities are refused
+    """
+    # Setup a Channel object
+    channel = Channel(10, 5)
+
+    errors = 0
+    for capacity, overflow in ((2, "DROP_SOME"), (0, BACKPRESSURE)):
+        try:
+            channel.set_capacity(capacity, overflow=overflow)
+        except ValueError:
+            errors += 1
+
+    assert errors == 2 and \
+        channel.capacity is None, \
+        "Channel.set_capacity() failure - invalid parameters accepted"
+
+
 #------------------------------------------------#
 # LINK TESTS
 #------------------------------------------------#
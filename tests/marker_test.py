@@ -0,0 +1,133 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.components.marker import TenColorGoldMarker, TVFMarker, create_marker
+from src.components.node import Host
+from src.engine.scenario import Scenario
+
+
+def test_tvf_marker_init():
+    """
+    Test compiling TVFs into lookup tables
+    """
+    # Setup a TVF by points, and by a function
+    marker_1 = TVFMarker(points=[(0, 10), (100, 0)], resolution=10)
+    marker_2 = TVFMarker(lambda throughput: 20 - throughput, max_throughput=10,
+                         resolution=5)
+
+    assert marker_1.table.tolist() == [10, 8, 8, 6, 6, 4, 4, 2, 2, 1] and \
+        marker_2.table.tolist() == [19, 17, 15, 13, 11] and \
+        marker_1.to_dict()["points"] == [[0, 10], [100, 0]], \
+        "TVFMarker.__init__() failure"
+
+
+def test_tvf_marker_mark():
+    """
+    Test marking Packets one by one, and in batches
+    """
+    # Setup two Hosts with the same seed, sending at different rates
+    marker = create_marker({"type": "TVF", "curve": "gold"})
+    slow_host = Host("host_1", "192.167.1.1", 5, random.Random(1),
+                     np.random.default_rng(1))
+    fast_host = Host("host_2", "192.167.1.2", 90, random.Random(1),
+                     np.random.default_rng(1))
+    slow_host.marker = marker
+    fast_host.marker = marker
+
+    slow_ppvs = [slow_host.calculate_ppv() for _ in range(200)]
+    fast_ppvs = [fast_host.calculate_ppv() for _ in range(200)]
+    batch_ppvs = fast_host.calculate_ppv_batch(2000)
+
+    assert isinstance(marker, TVFMarker) and \
+        set(slow_ppvs) <= {10, 9} and \
+        min(fast_ppvs) < 5 and \
+        batch_ppvs.min() >= 1 and batch_ppvs.max() <= 10 and \
+        abs(batch_ppvs.mean() - np.mean(fast_ppvs)) < 0.5, \
+        "TVFMarker.mark() failure"
+
+
+def test_tvf_marker_curves():
+    """
+    Test that the built-in traffic classes are ordered by their value
+    """
+    # Mark Packets of the same Host with every class
+    means = []
+    for curve in ("gold", "silver", "background"):
+        host = Host("host", "192.167.1.1", 40, random.Random(3),
+                    np.random.default_rng(3))
+        host.marker = create_marker({"type": "TVF", "curve": curve})
+        means.append(host.calculate_ppv_batch(1000).mean())
+
+    assert means[0] > means[1] > means[2] >= 1, \
+        "TVFMarker curves failure"
+
+
+def test_scenario_marker():
+    """
+    Test setting markers in a Scenario
+    """
+    # Setup a Scenario with a marked and an unmarked Host
+    scenario = Scenario(
+        [], [{"name": "h1", "ip": "10.1.0.1", "send_rate": 10,
+              "application": {"name": "a1", "amount": 10, "send_rate": 10,
+                              "app_type": "CONST",
+                              "marker": {"type": "TVF", "curve": "silver"}}},
+             {"name": "h2", "ip": "10.1.0.2", "send_rate": 10,
+              "application": {"name": "a2", "amount": 10, "send_rate": 10,
+                              "app_type": "CONST"}}])
+    network = scenario.build_network()
+
+    assert network.get_host("h1").marker.name == "SILVER" and \
+        isinstance(network.get_host("h2").marker, TenColorGoldMarker) and \
+        Scenario.from_network(network).hosts[0]["application"]["marker"] == \
+        {"type": "TVF", "max_throughput": 100.0, "resolution": 1024,
+         "curve": "SILVER"}, \
+        "Scenario marker failure"
+
+
+def test_tvf_marker_to_dict():
+    """
+    Test describing every kind of TVF marker, and creating it back
+    """
+    markers = [TVFMarker(points=[(0, 10), (50, 2)], max_throughput=50),
+               create_marker({"type": "TVF", "curve": "background"}),
+               TVFMarker(lambda throughput: 9 - throughput // 10,
+                         name="stairs", resolution=64)]
+
+    for marker in markers:
+        created = create_marker(marker.to_dict())
+        assert created.table.tolist() == marker.table.tolist() and \
+            created.to_dict() == marker.to_dict() and \
+            created.max_throughput == marker.max_throughput, \
+            "TVFMarker.to_dict() failure"
+
+    # Sending faster than max_throughput is marked at max_throughput
+    host = Host("host", "192.167.1.1", 500, random.Random(3),
+                np.random.default_rng(3))
+    host.marker = markers[2]
+    assert set(host.calculate_ppv_batch(1000).tolist()) == \
+        set(markers[2].table.tolist()), \
+        "TVFMarker failure - sending faster than max_throughput"
+
+    for description in ({"type": "TVF", "curve": "gold", "max_throughput": 0},
+                        {"type": "TVF", "table": []}):
+        with pytest.raises(ValueError):
+            create_marker(description)
+
+
+def test_marker_mark_draw():
+    """
+    Test turning earlier uniform draws into PPVs at the current send rate
+    """
+    host = Host("host", "192.167.1.1", 5)
+    draws = [index / 100 for index in range(100)]
+    for marker in (TenColorGoldMarker(),
+                   create_marker({"type": "TVF", "curve": "gold"})):
+        host.send_rate = 1
+        slow = {marker.mark_draw(host, draw) for draw in draws}
+        host.send_rate = 90
+        fast = {marker.mark_draw(host, draw) for draw in draws}
+        assert slow <= {9, 10} and min(fast) < 5 and max(fast) == 10, \
+            "mark_draw() failure"
@@ -0,0 +1,75 @@
+from src.engine.maxmin import MaxMinSolver
+from src.engine.scenario import Scenario
+
+
+def line_network(router_rate, first_rate=20, second_rate=30, host_speed=100):
+    """
+    Creates a Network of 3 Routers connected in a line, with a Host on both
+    ends sending to each other
+    """
+    return Scenario(
+        [{"name": f"r{i}", "ip": f"10.0.0.{i + 1}", "send_rate": router_rate,
+          "buffer_size": 10} for i in range(3)],
+        [{"name": "h1", "ip": "10.1.0.1", "send_rate": first_rate,
+          "application": {"name": "a1", "amount": 100,
+                          "send_rate": first_rate, "app_type": "CONST"}},
+         {"name": "h2", "ip": "10.1.0.2", "send_rate": second_rate,
+          "application": {"name": "a2", "amount": 100,
+                          "send_rate": second_rate, "app_type": "CONST"}},
+         {"name": "h3", "ip": "10.1.0.3", "send_rate": 10}],
+        [{"node": f"r{i}", "interface": "e1", "other_node": f"r{i + 1}",
+          "other_interface": "e0", "speed": 100, "metrics": 1}
+         for i in range(2)] +
+        [{"node": "h1", "interface": "e0", "other_node": "r0",
+          "other_interface": "h", "speed": 100, "metrics": 1},
+         {"node": "h2", "interface": "e0", "other_node": "r2",
+          "other_interface": "h", "speed": host_speed,
+          "metrics": 1}]).build_network()
+
+
+def test_max_min_solver_init():
+    """
+    Test the routes and resources found by the MaxMinSolver
+    """
+    # Setup the MaxMinSolver with a flow that can't reach its target
+    solver = MaxMinSolver(line_network(50), [("h1", "h2"), ("h2", "h3")])
+
+    assert solver.routes == [["10.1.0.1", "10.0.0.1", "10.0.0.2", "10.0.0.3",
+                              "10.1.0.2"], None] and \
+        len(solver.resources) == 7 and \
+        solver.demands.tolist() == [20, 30], \
+        "MaxMinSolver.__init__() failure"
+
+
+def test_max_min_solver_solve():
+    """
+    Test the max-min fair rates of the MaxMinSolver
+    """
+    # Both demands fit
+    rates_1 = MaxMinSolver(line_network(50),
+                           [("h1", "h2"), ("h2", "h1")]).solve()
+    # The Routers are the bottleneck, shared equally
+    rates_2 = MaxMinSolver(line_network(15),
+                           [("h1", "h2"), ("h2", "h1")]).solve()
+    # The smaller demand is met, the rest goes to the other flow
+    rates_3 = MaxMinSolver(line_network(15, first_rate=5),
+                           [("h1", "h2"), ("h2", "h1")]).solve()
+    # The slow Link limits both flows, the Routers are not saturated
+    solver = MaxMinSolver(line_network(60, first_rate=40, second_rate=40,
+                                       host_speed=25),
+                          [("h1", "h2"), ("h2", "h1")])
+    rates_4 = solver.solve()
+    utilisation = solver.utilisation()
+
+    assert rates_1 == {("10.1.0.1", "10.1.0.2"): 20,
+                       ("10.1.0.2", "10.1.0.1"): 30} and \
+        rates_2 == {("10.1.0.1", "10.1.0.2"): 7.5,
+                    ("10.1.0.2", "10.1.0.1"): 7.5} and \
+        rates_3 == {("10.1.0.1", "10.1.0.2"): 5,
+                    ("10.1.0.2", "10.1.0.1"): 10} and \
+        rates_4 == {("10.1.0.1", "10.1.0.2"): 25,
+                    ("10.1.0.2", "10.1.0.1"): 25} and \
+        abs(utilisation[("10.0.0.2",)] - 50 / 60) < 1e-9 and \
+        utilisation[("10.1.0.2", "10.0.0.3")] == 1 and \
+        utilisation[("10.0.0.1", "10.1.0.1")] == 0.25, \
+        "MaxMinSolver.solve() failure"
@@ -0,0 +1,71 @@
+import sys
+
+from src.components.packet import Packet
+from src.engine.memory import (MemoryGrowthRecorder, component_sizes,
+                               deep_size, memory_report)
+from src.engine.simulator import Simulator
+from src.engine.topologies import line
+
+
+def test_deep_size():
+    """
+    Test measuring objects without the components they only reference
+    """
+    packet = Packet("10.1.0.1", "10.1.0.2", 3, 1)
+    holder = [packet, "text" * 10]
+    assert deep_size([holder], (Packet,)) == \
+        sys.getsizeof(holder) + sys.getsizeof("text" * 10), \
+        "deep_size stop failure"
+    seen = set()
+    assert deep_size([packet], (), seen) > sys.getsizeof(packet) and \
+        deep_size([packet], (), seen) == 0, \
+        "deep_size seen failure"
+
+
+def test_component_sizes():
+    """
+    Test counting the components of a built Network
+    """
+    network = line(4).build_network()
+    sizes = component_sizes(network)
+    # 6 Nodes with a Route to every other Node, 5 Links with 2 Interfaces
+    # each
+    assert sizes["routes"]["count"] == 30 and \
+        sizes["interfaces"]["count"] == 10 and \
+        sizes["connections"]["count"] == 10 and \
+        sizes["links"]["count"] == 5 and sizes["packets"]["count"] == 0 and \
+        all(sizes[name]["bytes_each"] > 0
+            for name in ("routes", "interfaces", "connections", "links")), \
+        "component_sizes failure"
+
+
+def test_memory_growth_recorder():
+    """
+    Test following the Packets held by a Network during a run
+    """
+    simulator = Simulator.from_scenario(line(4, packets=100))
+    growth = MemoryGrowthRecorder(simulator.network, simulator.clock, 0.5)
+    simulator.network.attach_probe(growth)
+    simulator.run(10)
+    series = growth.series()
+
+    assert list(series["time"][:3]) == [0.5, 1.0, 1.5] and \
+        series["buffered"].max() > 0 and \
+        all(series["payload_slots"] >= series["in_flight"]) and \
+        growth.peak_packets >= series["buffered"].max() and \
+        growth.peak_bytes > 0, \
+        "MemoryGrowthRecorder failure"
+
+
+def test_memory_report():
+    """
+    Test reporting the footprint of a Scenario, and its growth
+    """
+    report = memory_report(line(4, packets=50), until=5, interval=1)
+    assert report["nodes"] == 6 and report["build_bytes"] > 0 and \
+        report["bytes_per_node"] == report["build_bytes"] / 6 and \
+        report["types"][0]["bytes"] >= report["types"][-1]["bytes"] and \
+        len(report["allocation_sites"]) > 0 and \
+        report["growth"]["time"][-1] == 5 and \
+        report["components"]["packets"]["bytes_each"] > 0, \
+        "memory_report failure"
@@ -0,0 +1,79 @@
+import urllib.error
+import urllib.request
+
+from src.engine.metrics import MetricsPublisher, MetricsServer, render
+from src.engine.scenario import Scenario
+from src.engine.simulator import Simulator
+
+
+def one_way_scenario():
+    """
+    Creates a Scenario of a Host sending to an other through a single Router
+    """
+    return Scenario(
+        [{"name": "r1", "ip": "10.0.0.1", "send_rate": 30, "buffer_size": 10}],
+        [{"name": "h1", "ip": "10.1.0.1", "send_rate": 20,
+          "application": {"name": "a1", "amount": 40, "send_rate": 20,
+                          "app_type": "CONST"}},
+         {"name": "h2", "ip": "10.1.0.2", "send_rate": 20,
+          "application": {"name": "a2", "amount": 0, "send_rate": 20,
+                          "app_type": "CONST"}}],
+        [{"node": "h1", "interface": "e0", "other_node": "r1",
+          "other_interface": "e0", "speed": 100, "metrics": 1},
+         {"node": "h2", "interface": "e0", "other_node": "r1",
+          "other_interface": "e1", "speed": 100, "metrics": 1}],
+        [{"source": "h1", "target": "h2"}],
+        5)
+
+
+def test_render():
+    """
+    Test rendering metrics in the Prometheus text format
+    """
+    text = render((("a_total", "counter", "A counter", (((), 3),)),
+                   ("b", "gauge", "A gauge",
+                    (((("node", "r1"),), 1.5), ((("node", "r2"),), 0)))))
+    assert text == ("# HELP a_total A counter\n# TYPE a_total counter\n"
+                    "a_total 3\n# HELP b A gauge\n# TYPE b gauge\n"
+                    'b{node="r1"} 1.5\nb{node="r2"} 0\n'), \
+        "render failure"
+
+
+def test_metrics_server():
+    """
+    Test serving the published snapshot of a run over HTTP
+    """
+    simulator = Simulator.from_scenario(one_way_scenario())
+    server = MetricsServer(port=0)
+    server.start()
+    try:
+        # Publish on every Packet event, regardless of the wall clock
+        publisher = MetricsPublisher(simulator, server, period=0.0,
+                                     check_every=1)
+        simulator.network.attach_probe(publisher)
+        simulator.run(5)
+        publisher.publish()
+
+        url = f"http://127.0.0.1:{server.port}"
+        with urllib.request.urlopen(f"{url}/metrics", timeout=5) as response:
+            status = response.status
+            text = response.read().decode("utf-8")
+        try:
+            urllib.request.urlopen(f"{url}/other", timeout=5)
+            missing = 200
+        except urllib.error.HTTPError as error:
+            missing = error.code
+    finally:
+        server.stop()
+
+    statistics = simulator.statistics()
+    assert status == 200 and missing == 404, \
+        "MetricsServer failure"
+    assert f"ppv_packets_sent_total {statistics['total_pack']}\n" in text and \
+        f"ppv_packets_received_total {statistics['received_pack']}\n" in text and \
+        'ppv_router_buffer_packets{router="r1"}' in text and \
+        'ppv_host_send_rate{host="h1"}' in text and \
+        f"ppv_events_total {simulator.processed}\n" in text and \
+        "ppv_events_per_second" in text and \
+        "ppv_event_loop_lag_seconds" in text, \
+        "MetricsPublisher failure"
@@ -630,3 +630,30 @@ def test_network_receive_packet():
         receive_success and \
         len(network.get_router("router_1").buffer) == 1, \
         "Network.receive_packet() failure"
+
+
+def test_network_set_seed():
+    """
+    Test that the same seed reproduces the same Packets
+    """
+    def run(seed):
+        # Setup the Network object
+        network = Network()
+        network.set_seed(seed)
+        network.create_host("host_1", "192.168.1.1", 10)
+        network.create_router("router_1", "192.169.1.1", 10, 100)
+        network.set_application("host_1", "app_1", 100, 10, "CONST")
+        network.add_interface("host_1", "eth1_1")
+        network.add_interface("router_1", "eth1_2")
+        network.connect_node_interfaces(
+            "host_1", "router_1", "eth1_1", "eth1_2", 10, 10)
+
+        # Send every Packet, and collect their PPV and size
+        for _ in range(100):
+            network.send_packet("host_1", "router_1")
+            network.receive_packet("router_1", "eth1_2")
+        return [(packet.ppv, packet.size)
+                for packet in network.get_router("router_1").buffer]
+
+    assert run(7) == run(7) and run(7) != run(8), \
+        "Network.set_seed() failure"
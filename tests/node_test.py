@@ -1,5 +1,8 @@
+import random
+
 from src.components.node import Host, Node, Router
 from src.components.packet import Packet
+from src.components.probe import DROP
 from src.components.routing_table import Route
 
 #------------------------------------------------#
@@ -462,6 +465,64 @@ def test_host_calculate_ppv():
         "Host.calculate.ppv() failed"
 
 
+def test_host_seeded_rng():
+    """
+    Test that Hosts with equally seeded streams draw the same PPVs
+    """
+    # Setup two Hosts with the same seed, and one with a different one
+    host_1 = Host("host_1", "192.166.1.1", 20, random.Random(42))
+    host_2 = Host("host_2", "192.166.1.2", 20, random.Random(42))
+    host_3 = Host("host_3", "192.166.1.3", 20, random.Random(43))
+
+    # Draw from the global stream in between, which must not matter
+    ppvs_1 = [host_1.calculate_ppv() for _ in range(50)]
+    random.random()
+    ppvs_2 = [host_2.calculate_ppv() for _ in range(50)]
+    ppvs_3 = [host_3.calculate_ppv() for _ in range(50)]
+
+    assert ppvs_1 == ppvs_2 and ppvs_1 != ppvs_3, \
+        "Host.rng failure - seeded streams differ"
+
+
+def test_host_calculate_ppv_batch():
+    """
+    Test calculating PPVs in bulk, following the send_rate like one by one
+    """
+    # Setup a slow and a fast Host
+    slow_host = Host("host_1", "192.166.1.1", 1)
+    fast_host = Host("host_2", "192.166.1.2", 50)
+
+    slow_ppvs = slow_host.calculate_ppv_batch(1000)
+    fast_ppvs = fast_host.calculate_ppv_batch(1000)
+
+    assert len(slow_ppvs) == 1000 and \
+        set(slow_ppvs.tolist()) == {9, 10} and \
+        set(fast_ppvs.tolist()) == set(range(1, 11)), \
+        "Host.calculate_ppv_batch() failure"
+
+
+def test_host_generate_batch():
+    """
+    Test creating the next Packets of a Host in one step
+    """
+    # Setup the Host with an Application that can send 25 Packets
+    host = Host("host_1", "192.166.1.1", 10)
+    host.set_application("app_1", 25, 10, "CONST")
+
+    first = host.generate_batch(20)
+    second = host.generate_batch(20)
+    third = host.generate_batch(20)
+
+    assert len(first["ppv"]) == 20 and len(second["ppv"]) == 5 and \
+        len(third["ppv"]) == 0 and \
+        first["packet_id"].tolist() == list(range(1, 21)) and \
+        second["packet_id"].tolist() == list(range(21, 26)) and \
+        set(first["size"].tolist()) <= set(range(1, 11)) and \
+        host.application.curr_sent == 25 and \
+        not host.application.can_send(), \
+        "Host.generate_batch() failure"
+
+
 #------------------------------------------------#
 # ROUTER TESTS
 #------------------------------------------------#
@@ -709,3 +770,202 @@ def test_router_receive_packet():
         len(router_2.interfaces) != 0 and \
         len(router_2.buffer) != 0, \
         "Router.receive_packet() failure"
+
+
+def batch_router(buffer_size):
+    """
+    Creates a Router with two AIMD Hosts connected to it, and a few Packets
+    already in its buffer
+    """
+    router = Router("router", "192.168.1.1", 10, buffer_size)
+    hosts = []
+    for index in range(2):
+        host = Host(f"host_{index}", f"192.167.1.{index + 1}", 40)
+        host.set_application(f"app_{index}", 100, 40, "AIMD")
+        host.add_interface("eth0")
+        router.add_interface(f"eth{index}")
+        host.connect_to_interface(router, "eth0", f"eth{index}", 10, 10)
+        router.add_route(Route(host.ip, host.ip, f"eth{index}", 1))
+        hosts.append(host)
+    for ppv in (5, 2, 7):
+        router.buffer.append(Packet(hosts[0].ip, hosts[1].ip, ppv, 10))
+    return router, hosts
+
+
+def test_router_receive_batch():
+    """
+    Test that the receive_batch() method of the Router has the same outcome
+    as receiving the Packets one by one
+    """
+    # The same arrivals on two identical Routers with a nearly full buffer
+    arrivals = [(0, 6), (1, 2), (0, 1), (1, 9), (1, 2), (0, 8)]
+    router_1, hosts_1 = batch_router(4)
+    router_2, hosts_2 = batch_router(4)
+
+    # Receive them one by one on the first Router
+    for index, ppv in arrivals:
+        router_1.get_interface(f"eth{index}").receive_channel.fill_payload(
+            Packet(hosts_1[index].ip, hosts_1[1 - index].ip, ppv, 10))
+        router_1.receive_packet(f"eth{index}")
+
+    # And at once on the other
+    received, dropped = router_2.receive_batch(
+        [Packet(hosts_2[index].ip, hosts_2[1 - index].ip, ppv, 10)
+         for index, ppv in arrivals])
+
+    assert received == 6 and dropped == 5 and \
+        [packet.ppv for packet in router_2.buffer] == \
+        [packet.ppv for packet in router_1.buffer] == [7, 6, 9, 8] and \
+        router_2.ppv_dropped == router_1.ppv_dropped and \
+        [host.send_rate for host in hosts_2] == \
+        [host.send_rate for host in hosts_1] and \
+        [host.application.send_rate for host in hosts_2] == \
+        [host.application.send_rate for host in hosts_1], \
+        "Router.receive_batch() failure"
+
+
+
+def test_router_receive_batch_over_full():
+    """
+    Test that a Router with a buffer over its size drops every Packet it
+    receives, in batches the same as one by one
+    """
+    # Shrink the buffers of two identical Routers below their three Packets
+    arrivals = [(0, 6), (1, 2)]
+    router_1, hosts_1 = batch_router(4)
+    router_2, hosts_2 = batch_router(4)
+    events = []
+    for router in (router_1, router_2):
+        router.buffer_size = 2
+        router.probe = lambda event, node, packet, value: \
+            events.append((node.name, event, packet.ppv))
+
+    for index, ppv in arrivals:
+        router_1.get_interface(f"eth{index}").receive_channel.fill_payload(
+            Packet(hosts_1[index].ip, hosts_1[1 - index].ip, ppv, 10))
+        results = router_1.receive_packet(f"eth{index}")
+    received, dropped = router_2.receive_batch(
+        [Packet(hosts_2[index].ip, hosts_2[1 - index].ip, ppv, 10)
+         for index, ppv in arrivals])
+
+    assert results == (False, True) and \
+        (received, dropped) == (0, 2) and \
+        router_1.ppv_dropped == router_2.ppv_dropped == 8 and \
+        events == [("router", DROP, 6), ("router", DROP, 2)] * 2 and \
+        len(router_2.buffer) == 3 and \
+        [host.send_rate for host in hosts_2] == \
+        [host.send_rate for host in hosts_1] != [40, 40], \
+        "Router.receive_batch() failure - over-full buffer"
+
+def test_host_receive_feedback_count():
+    """
+    Test that aggregated feedback adjusts the sending rate the same way as
+    receiving it one by one
+    """
+    # Setup two identical AIMD Hosts
+    host_1 = Host("host_1", "192.167.1.1", 97)
+    host_1.set_application("app_1", 100, 97, "AIMD")
+    host_2 = Host("host_2", "192.167.1.1", 97)
+    host_2.set_application("app_2", 100, 97, "AIMD")
+
+    rates = []
+    for feedback, count in ((1, 5), (-1, 3), (1, 2), (-1, 9)):
+        for _ in range(count):
+            host_1.receive_feedback(host_1.ip, feedback)
+        host_2.receive_feedback(host_2.ip, feedback, count)
+        rates.append((host_1.send_rate, host_2.send_rate,
+                      host_1.application.send_rate,
+                      host_2.application.send_rate))
+
+    assert rates == [(99, 99, 99, 99), (12, 12, 12, 12), (14, 14, 14, 14),
+                     (1, 1, 1, 1)], \
+        "Host.receive_feedback() failure"
+
+
+def test_router_feedback_dispatch():
+    """
+    Test that feedback goes straight to the source Host, through the cached
+    reverse path, until the topology changes
+    """
+    # Setup a Host behind two Routers
+    host = Host("host", "192.167.1.1", 10)
+    host.set_application("host_app", 100, 10, "AIMD")
+    host.add_interface("eth0")
+    router_1 = Router("router_1", "192.168.1.1", 10, 10)
+    router_1.add_interface("eth0")
+    router_1.add_interface("eth1")
+    router_2 = Router("router_2", "192.168.1.2", 10, 10)
+    router_2.add_interface("eth0")
+    host.connect_to_interface(router_1, "eth0", "eth0", 10, 10)
+    router_1.connect_to_interface(router_2, "eth1", "eth0", 10, 10)
+    router_1.add_route(Route(host.ip, host.ip, "eth0", 1))
+    router_2.add_route(Route(host.ip, router_1.ip, "eth0", 2))
+
+    # Count the hop by hop forwarding on the middle Router
+    forwarded = []
+    router_1.receive_feedback = \
+        lambda source, feedback, count=1: forwarded.append(feedback)
+
+    router_2.receive_feedback(host.ip, 1, 3)
+    rate_1 = host.send_rate
+
+    # Once the path is gone, the feedback is not delivered anymore
+    router_1.disconnect_interface("eth0")
+    router_2.receive_feedback(host.ip, 1)
+    rate_2 = host.send_rate
+
+    assert rate_1 == 13 and \
+        rate_2 == 13 and \
+        forwarded == [], \
+        "Router.receive_feedback() failure"
+
+
+def test_router_output_queues():
+    """
+    Test that a Router with output queues keeps the Packets per Interface,
+    serves the queues in turns, and waits for the Links to be free
+    """
+    # Setup a Router with Packets towards both of its Hosts, then switch to
+    # output queues
+    router, hosts = batch_router(10)
+    router.buffer.append(Packet(hosts[1].ip, hosts[0].ip, 4, 10))
+    router.set_output_queues(True)
+    lengths = {name: len(queue.buffer)
+               for name, queue in router.output_queues.queues.items()}
+    description = str(router)
+
+    # Both Links are free at first, then busy for 1 / 10 seconds
+    next_hops = [router.send_packet(0.0) for _ in range(3)]
+    ready = router.output_queues.next_ready_time()
+    next_hop = router.send_packet(0.1)
+
+    router.set_output_queues(False)
+
+    assert lengths == {"eth0": 1, "eth1": 3} and \
+        [hop[0] for hop in next_hops[:2]] == [hosts[1].ip, hosts[0].ip] and \
+        next_hops[2] is None and \
+        ready == 0.1 and \
+        next_hop[0] == hosts[1].ip and \
+        router.output_queues is None and \
+        router.get_buffer_length() == 1 and \
+        "Buffer: 4 / 10" in description, \
+        "Router.set_output_queues() failure"
+
+
+def test_router_output_queues_share_buffer():
+    """
+    Test that the output queues of a Router split its buffer between them,
+    instead of each of them taking all of it
+    """
+    # The three buffered Packets go towards the second Host
+    router, hosts = batch_router(7)
+    router.set_output_queues(True)
+    queues = [router.output_queues.queue_of(Packet(source.ip, target.ip, 1, 10))
+              for source, target in ((hosts[1], hosts[0]),
+                                     (hosts[0], hosts[1]))]
+    incoming = Packet(hosts[0].ip, hosts[1].ip, 1, 10)
+
+    assert [queue.buffer_size for queue in queues] == [4, 3] and \
+        queues[1].policy.admit(queues[1], incoming) is incoming and \
+        queues[0].policy.admit(queues[0], incoming) is None, \
+        "OutputQueue.buffer_size failure"
@@ -0,0 +1,223 @@
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from src.engine.latency import LatencyRecorder
+from src.engine.parallel import ParallelSimulator, PartitionSimulator, \
+    lookahead, partition_scenario
+from src.engine.scenario import Scenario
+from src.engine.simulator import FEEDBACK, Simulator
+
+
+def line_scenario(routers, buffer_size=1000):
+    """
+    Creates a Scenario of Routers connected in a line, with a Host on both
+    ends sending to each other
+    """
+    return Scenario(
+        [{"name": f"r{i}", "ip": f"10.0.0.{i + 1}", "send_rate": 50,
+          "buffer_size": buffer_size} for i in range(routers)],
+        [{"name": "h1", "ip": "10.1.0.1", "send_rate": 20,
+          "application": {"name": "a1", "amount": 100, "send_rate": 20,
+                          "app_type": "CONST"}},
+         {"name": "h2", "ip": "10.1.0.2", "send_rate": 30,
+          "application": {"name": "a2", "amount": 100, "send_rate": 30,
+                          "app_type": "CONST"}}],
+        [{"node": f"r{i}", "interface": "e1", "other_node": f"r{i + 1}",
+          "other_interface": "e0", "speed": 100 + i, "metrics": 1}
+         for i in range(routers - 1)] +
+        [{"node": "h1", "interface": "e0", "other_node": "r0",
+          "other_interface": "h", "speed": 100, "metrics": 1},
+         {"node": "h2", "interface": "e0", "other_node": f"r{routers - 1}",
+          "other_interface": "h", "speed": 100, "metrics": 1}],
+        [{"source": "h1", "target": "h2"}, {"source": "h2", "target": "h1"}],
+        20, seed=1234)
+
+
+def test_partition_scenario():
+    """
+    Test splitting a Scenario into partitions
+    """
+    # Setup the Scenario with a faster Link in the middle, and split it into
+    # 2 partitions
+    scenario = line_scenario(4)
+    scenario.links[1]["speed"] = 101
+    assignment = partition_scenario(scenario, 2)
+
+    assert assignment["10.0.0.1"] == assignment["10.0.0.2"] == \
+        assignment["10.1.0.1"] == 0 and \
+        assignment["10.0.0.3"] == assignment["10.0.0.4"] == \
+        assignment["10.1.0.2"] == 1 and \
+        lookahead(scenario, assignment) == 1 / 101, \
+        "partition_scenario() failure"
+
+
+def test_partition_simulator_builds_partition():
+    """
+    Test that a partition only builds its own Nodes, and the stubs at the
+    other end of its cut Links
+    """
+    scenario = line_scenario(6)
+    assignment = partition_scenario(scenario, 3)
+    simulator = PartitionSimulator(scenario, assignment, 1)
+
+    assert sorted(node.ip for node in simulator.network.get_nodes()) == \
+        ["10.0.0.2", "10.0.0.3", "10.0.0.4", "10.0.0.5"] and \
+        [simulator.owns(simulator.node_index[ip])
+         for ip in ("10.0.0.2", "10.0.0.3", "10.0.0.4", "10.0.0.5")] == \
+        [False, True, True, False], \
+        "PartitionSimulator() failure"
+
+
+def test_parallel_simulator_matches_simulator():
+    """
+    Test that the seeded partitioned run gives the same statistics as the
+    single-process one
+    """
+    # Setup both Simulators on the same Scenario
+    scenario = line_scenario(6)
+    simulator = Simulator.from_scenario(scenario)
+    simulator.run(20)
+    expected = simulator.statistics()
+    parallel = ParallelSimulator(scenario, 3)
+    statistics = parallel.run(20)
+
+    assert parallel.parts == 3 and statistics == expected, \
+        "ParallelSimulator.run() failure - mismatch with Simulator"
+
+
+def test_parallel_simulator_matches_simulator_with_drops():
+    """
+    Test that drops are the same in the partitioned and single-process runs
+    """
+    # Setup both Simulators on the same Scenario, with small buffers
+    scenario = line_scenario(4, buffer_size=2)
+    for router in scenario.routers:
+        router["send_rate"] = 15
+    simulator = Simulator.from_scenario(scenario)
+    simulator.run(20)
+    expected = simulator.statistics()
+    statistics = ParallelSimulator(scenario, 2).run(20)
+
+    assert expected["dropped_pack"] > 0 and statistics == expected, \
+        "ParallelSimulator.run() failure - mismatch with Simulator"
+
+
+def test_parallel_simulator_matches_simulator_with_feedback_window():
+    """
+    Test that AIMD Hosts behave the same in the partitioned and
+    single-process runs, when the feedback is sent with the path delay
+    """
+    # Setup both Simulators on the same AIMD Scenario, with small buffers
+    scenario = line_scenario(4, buffer_size=3)
+    for router in scenario.routers:
+        router["send_rate"] = 15
+        router["feedback_window"] = 0.25
+    for host in scenario.hosts:
+        host["application"]["app_type"] = "AIMD"
+    simulator = Simulator.from_scenario(scenario)
+    simulator.run(20)
+    expected = simulator.statistics()
+    statistics = ParallelSimulator(scenario, 2).run(20)
+
+    assert expected["dropped_pack"] > 0 and statistics == expected, \
+        "ParallelSimulator.run() failure - mismatch with Simulator"
+
+
+def test_parallel_simulator_matches_simulator_with_relayed_feedback():
+    """
+    Test that feedback walking through a whole partition, on its way back to
+    an AIMD Host, arrives as in the single-process run
+    """
+    # Setup both Simulators on a longer AIMD Scenario, so the feedback of the
+    # last Routers crosses the middle partition
+    scenario = line_scenario(6, buffer_size=3)
+    for router in scenario.routers:
+        router["send_rate"] = 15
+        router["feedback_window"] = 0.25
+    for host in scenario.hosts:
+        host["application"]["app_type"] = "AIMD"
+    simulator = Simulator.from_scenario(scenario)
+    simulator.run(20)
+    expected = simulator.statistics()
+    statistics = ParallelSimulator(scenario, 3).run(20)
+
+    assert expected["dropped_pack"] > 0 and statistics == expected, \
+        "ParallelSimulator.run() failure - mismatch with Simulator"
+
+
+def test_partition_simulator_keeps_unused_feedback():
+    """
+    Test that feedback for Hosts ignoring it doesn't cross partitions
+    """
+    # Setup a partition of a Scenario with small buffers and feedback
+    # windows, but constant rate Hosts
+    scenario = line_scenario(4, buffer_size=2)
+    for router in scenario.routers:
+        router["send_rate"] = 15
+        router["feedback_window"] = 0.25
+    assignment = partition_scenario(scenario, 2)
+    simulator = PartitionSimulator(scenario, assignment, 1)
+    simulator.run(20)
+
+    assert simulator.network.dropped_pack > 0 and \
+        all(message[0] == "packet" or message[1][4] != FEEDBACK
+            for message in simulator.outbox), \
+        "PartitionSimulator.run() failure - feedback shipped"
+
+
+def test_parallel_simulator_latency():
+    """
+    Test that the latencies measured by the partitions merge into the same
+    sketches as the single-process run
+    """
+    # Setup both Simulators on the same Scenario, measuring latencies
+    scenario = line_scenario(4)
+    simulator = Simulator.from_scenario(scenario)
+    recorder = LatencyRecorder(simulator.clock)
+    simulator.network.attach_probe(recorder)
+    simulator.run(20)
+    parallel = ParallelSimulator(scenario, 2, measure_latency=True)
+    parallel.run(20)
+
+    # The sums are added up in a different order, only the buckets are exact
+    assert {ppv: sketch.buckets
+            for ppv, sketch in parallel.latency.classes.items()} == \
+        {ppv: sketch.buckets for ppv, sketch in recorder.classes.items()} and \
+        parallel.latency.hops == recorder.hops and \
+        abs(parallel.latency.total().total - recorder.total().total) < 1e-6, \
+        "ParallelSimulator.run() failure - latency mismatch"
+
+
+def test_parallel_simulator_refuses_crossing_feedback():
+    """
+    Test that immediate feedback crossing partitions to AIMD Hosts is
+    refused, as it could only take effect a window late
+    """
+    scenario = line_scenario(4, buffer_size=3)
+    for host in scenario.hosts:
+        host["application"]["app_type"] = "AIMD"
+
+    with pytest.raises(ValueError):
+        ParallelSimulator(scenario, 2)
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                    reason="The patched worker needs forked processes")
+def test_parallel_simulator_dead_worker(monkeypatch):
+    """
+    Test that a worker exiting mid-run raises an error instead of blocking
+    """
+    def exit_run(self, until):
+        os._exit(1)
+
+    monkeypatch.setattr(PartitionSimulator, "run", exit_run)
+    parallel = ParallelSimulator(line_scenario(4), 2)
+    started = time.perf_counter()
+
+    with pytest.raises(RuntimeError):
+        parallel.run(20)
+    assert time.perf_counter() - started < 5, \
+        "ParallelSimulator.run() failure - waited for the other workers"
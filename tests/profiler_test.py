@@ -0,0 +1,82 @@
+import sys
+import threading
+
+from src.components.network import Network
+from src.components.node import Host, Node
+from src.utils.profiler import SamplingProfiler, frame_label, method_class
+
+
+def wait_in_network(network, started, finished):
+    """
+    Keeps a Thread inside a Network method until finished is set
+    """
+    original = network.get_host
+
+    def blocking_get_host(name):
+        started.set()
+        finished.wait()
+        return original(name)
+
+    network.get_host = blocking_get_host
+    network.can_send("h1")
+
+
+def test_frame_label():
+    """
+    Test annotating frames with their components
+    """
+    frame = sys._getframe()
+    assert frame_label(frame) == "test_frame_label (profiler_test.py)", \
+        "frame_label failure"
+
+
+def test_method_class():
+    """
+    Test finding the class defining a method from its frame, as Python
+    before 3.11 needs
+    """
+    frames = []
+    host = Host("h1", "10.1.0.1", 10)
+
+    def record_caller(name):
+        frames.append(sys._getframe(1))
+
+    # Host.receive_packet overrides Node's, Node.is_blocked is inherited
+    host.get_interface = record_caller
+    host.get_best_route = record_caller
+    host.receive_packet("e0")
+    host.is_blocked("10.1.0.2")
+    frames.append(sys._getframe())
+
+    assert [method_class(frame) for frame in frames] == [Host, Node, None], \
+        "method_class failure"
+
+
+def test_sampling_profiler(tmp_path):
+    """
+    Test sampling the stack of an other Thread into collapsed stacks
+    """
+    started = threading.Event()
+    finished = threading.Event()
+    thread = threading.Thread(target=wait_in_network,
+                              args=(Network(), started, finished),
+                              name="HostThread")
+    thread.start()
+    started.wait()
+
+    profiler = SamplingProfiler(1000)
+    profiler.sample()
+    profiler.sample()
+    finished.set()
+    thread.join()
+
+    lines = profiler.collapsed()
+    host_line = [line for line in lines if line.startswith("HostThread;")][0]
+    assert profiler.taken == 2 and host_line.endswith(" 2") and \
+        "Network.can_send [Network]" in host_line, \
+        "SamplingProfiler failure"
+
+    path = tmp_path / "profile.txt"
+    profiler.write(str(path))
+    assert path.read_text(encoding="utf-8").splitlines() == lines, \
+        "SamplingProfiler.write failure"
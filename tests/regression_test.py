@@ -0,0 +1,66 @@
+from benchmarks.regression import (compare, gate, statistics_refresh,
+                                   summarize, t_critical)
+
+
+def test_summarize():
+    """
+    Test the mean and 95% confidence interval of samples
+    """
+    summary = summarize([1.0, 2.0, 3.0, 4.0, 5.0])
+    half = t_critical(4) * (2.5 ** 0.5) / (5 ** 0.5)
+    assert summary["mean"] == 3.0 and \
+        abs(summary["stdev"] - 2.5 ** 0.5) < 1e-12 and \
+        abs(summary["ci_low"] - (3.0 - half)) < 1e-12 and \
+        abs(summary["ci_high"] - (3.0 + half)) < 1e-12, \
+        "summarize failure"
+    assert t_critical(1) == 12.706 and t_critical(30) == 2.042 and \
+        1.96 < t_critical(1000) < 2.042, \
+        "t_critical failure"
+
+
+def test_compare():
+    """
+    Test telling regressions from noise
+    """
+    baseline = summarize([1.00, 1.02, 0.98, 1.01, 0.99])
+    slower = summarize([1.30, 1.32, 1.28, 1.31, 1.29])
+    noisy = summarize([0.6, 1.8, 1.0, 1.9, 0.7])
+    faster = summarize([0.70, 0.72, 0.68, 0.71, 0.69])
+
+    assert compare(baseline, slower, 0.1)["verdict"] == "regression", \
+        "Regression failure"
+    assert compare(baseline, slower, 0.5)["verdict"] == "same", \
+        "Threshold failure"
+    # Slower on average, but within the noise
+    assert compare(baseline, noisy, 0.1)["verdict"] == "same", \
+        "Noise failure"
+    assert compare(baseline, faster, 0.1)["verdict"] == "improvement", \
+        "Improvement failure"
+
+
+def test_gate():
+    """
+    Test comparing a run with a baseline, with per-benchmark thresholds
+    """
+    baseline = {"thresholds": {"a": 0.5},
+                "benchmarks": {"a": summarize([1.0, 1.01, 0.99]),
+                               "b": summarize([1.0, 1.01, 0.99])}}
+    current = {"a": summarize([1.3, 1.31, 1.29]),
+               "b": summarize([1.3, 1.31, 1.29]),
+               "c": summarize([1.0, 1.0, 1.0])}
+
+    results = gate(baseline, current)
+    assert results["a"]["verdict"] == "same" and \
+        results["b"]["verdict"] == "regression" and "c" not in results, \
+        "gate failure"
+    results = gate(baseline, current, thresholds={"a": 0.1})
+    assert results["a"]["verdict"] == "regression", \
+        "gate threshold failure"
+
+
+def test_statistics_refresh():
+    """
+    Test taking a sample of a benchmark
+    """
+    assert statistics_refresh() > 0, \
+        "Benchmark failure"
@@ -0,0 +1,84 @@
+import numpy as np
+
+from src.engine.fairness import FairnessMonitor
+from src.engine.flows import FlowTable
+from src.engine.latency import LatencyRecorder
+from src.engine.results import (TimeSeriesRecorder, collect_statistics,
+                                read_bundle, write_bundle)
+from src.engine.scenario import Scenario
+from src.engine.simulator import Simulator
+from src.engine.sweep import SweepRunner
+
+
+def small_scenario():
+    """
+    Creates a Scenario of two Hosts connected through a single Router
+    """
+    return Scenario(
+        [{"name": "r1", "ip": "10.0.0.1", "send_rate": 15, "buffer_size": 5}],
+        [{"name": "h1", "ip": "10.1.0.1", "send_rate": 20,
+          "application": {"name": "a1", "amount": 60, "send_rate": 20,
+                          "app_type": "CONST"}},
+         {"name": "h2", "ip": "10.1.0.2", "send_rate": 20,
+          "application": {"name": "a2", "amount": 20, "send_rate": 20,
+                          "app_type": "CONST"}}],
+        [{"node": "h1", "interface": "e0", "other_node": "r1",
+          "other_interface": "e0", "speed": 100, "metrics": 1},
+         {"node": "h2", "interface": "e0", "other_node": "r1",
+          "other_interface": "e1", "speed": 100, "metrics": 1}],
+        [{"source": "h1", "target": "h2"}, {"source": "h2", "target": "h1"}],
+        5, seed=2)
+
+
+def test_results_bundle_round_trip(tmp_path):
+    """
+    Test writing every result of a run into a bundle, and reading it back
+    """
+    path = str(tmp_path / "run.npz")
+
+    # Run the Scenario with every measurement attached
+    simulator = Simulator.from_scenario(small_scenario())
+    flows = FlowTable()
+    series = TimeSeriesRecorder(simulator.network, simulator.clock, 0.5)
+    fairness = FairnessMonitor(simulator.clock, 0.5)
+    latency = LatencyRecorder(simulator.clock)
+    for probe in (flows, series, fairness, latency):
+        simulator.network.attach_probe(probe)
+    simulator.run(5)
+    write_bundle(path, {"name": "small"}, simulator.statistics(),
+                 flows, series, fairness, latency)
+    bundle = read_bundle(path)
+
+    assert bundle["metadata"] == {"name": "small"} and \
+        bundle["statistics"] == simulator.statistics() and \
+        list(bundle["flows"]["sent"]) == [60, 20] and \
+        bundle["series"]["node"].shape == (len(series.times), 3) and \
+        list(bundle["series"]["node_ip"]) == \
+        ["10.1.0.1", "10.1.0.2", "10.0.0.1"] and \
+        bundle["series"]["link"].shape[1] == 4 and \
+        bundle["series"]["node"][:, 2].max() > 0 and \
+        np.array_equal(bundle["fairness"]["jain"], fairness.series()["jain"]) and \
+        bundle["latency"].summary() == latency.summary(), \
+        "write_bundle() / read_bundle() failure"
+
+
+def test_sweep_bundles(tmp_path):
+    """
+    Test that a sweep writes a bundle per point, and that their statistics
+    are collected into columns
+    """
+    runner = SweepRunner(small_scenario(), {"routers.*.buffer_size": [1, 10]},
+                         str(tmp_path / "results.jsonl"), workers=2,
+                         progress=None, bundle_dir=str(tmp_path / "bundles"))
+    failed = runner.run()
+    paths = sorted(str(path) for path in (tmp_path / "bundles").iterdir())
+    columns = collect_statistics(paths)
+    buffer_sizes = sorted(read_bundle(path)["metadata"]["overrides"]
+                          ["routers.*.buffer_size"] for path in paths)
+
+    assert failed == 0 and \
+        len(paths) == 2 and \
+        buffer_sizes == [1, 10] and \
+        list(columns["total_pack"]) == [80, 80] and \
+        "avg_ppv_sent" in columns, \
+        "SweepRunner failure - results bundles"
@@ -0,0 +1,298 @@
+import pytest
+
+from src.components.probe import DELIVER, FEEDBACK, SEND
+from src.engine.scenario import Scenario
+from src.engine.simulator import DRAW_BLOCK, Simulator
+
+
+def line_scenario(routers, buffer_size=1000, app_type="CONST"):
+    """
+    Creates a Scenario of Routers connected in a line, with a Host on both
+    ends sending to each other
+    """
+    return Scenario(
+        [{"name": f"r{i}", "ip": f"10.0.0.{i + 1}", "send_rate": 50,
+          "buffer_size": buffer_size} for i in range(routers)],
+        [{"name": "h1", "ip": "10.1.0.1", "send_rate": 20,
+          "application": {"name": "a1", "amount": 100, "send_rate": 20,
+                          "app_type": app_type}},
+         {"name": "h2", "ip": "10.1.0.2", "send_rate": 30,
+          "application": {"name": "a2", "amount": 100, "send_rate": 30,
+                          "app_type": app_type}}],
+        [{"node": f"r{i}", "interface": "e1", "other_node": f"r{i + 1}",
+          "other_interface": "e0", "speed": 100, "metrics": 1}
+         for i in range(routers - 1)] +
+        [{"node": "h1", "interface": "e0", "other_node": "r0",
+          "other_interface": "h", "speed": 100, "metrics": 1},
+         {"node": "h2", "interface": "e0", "other_node": f"r{routers - 1}",
+          "other_interface": "h", "speed": 100, "metrics": 1}],
+        [{"source": "h1", "target": "h2"}, {"source": "h2", "target": "h1"}],
+        20)
+
+#------------------------------------------------#
+# SCENARIO TESTS
+#------------------------------------------------#
+
+
+def test_scenario_build_network():
+    """
+    Test building a Network out of a Scenario
+    """
+    # Setup the Scenario and build it
+    network = line_scenario(3).build_network()
+
+    assert len(network.routers) == 3 and \
+        len(network.hosts) == 2 and \
+        network.get_host("h1").application.app_type == "CONST" and \
+        network.get_host("h1").get_best_route("10.1.0.2").metrics == 4, \
+        "Scenario.build_network() failure"
+
+
+def test_scenario_dict_round_trip():
+    """
+    Test converting a Scenario to a dictionary and back
+    """
+    # Setup the Scenario, and convert it back and forth
+    scenario = line_scenario(2)
+    converted = Scenario.from_dict(scenario.to_dict())
+
+    assert converted.to_dict() == scenario.to_dict(), \
+        "Scenario.from_dict() / to_dict() failure"
+
+#------------------------------------------------#
+# SIMULATOR TESTS
+#------------------------------------------------#
+
+
+def test_simulator_run():
+    """
+    Test running a Scenario until every Packet arrives
+    """
+    # Setup the Simulator with buffers big enough to never drop
+    simulator = Simulator.from_scenario(line_scenario(3))
+    simulator.run(20)
+    statistics = simulator.statistics()
+
+    assert statistics["total_pack"] == 200 and \
+        statistics["received_pack"] == 200 and \
+        statistics["dropped_pack"] == 0 and \
+        simulator.now == 20, \
+        "Simulator.run() failure"
+
+
+def test_simulator_run_partially():
+    """
+    Test that the simulated time is respected
+    """
+    # Setup the Simulator, and run it until about half of the Packets are sent
+    # from the first Host (20 Packets / s)
+    simulator = Simulator.from_scenario(line_scenario(3))
+    simulator.run(2.525)
+
+    assert simulator.network.get_host("h1").application.curr_sent == 51 and \
+        simulator.next_time() >= 2.525, \
+        "Simulator.run() failure - simulated time not respected"
+
+
+def test_simulator_drops():
+    """
+    Test that small buffers drop Packets
+    """
+    # Setup the Simulator with tiny buffers
+    scenario = line_scenario(2, buffer_size=1)
+    scenario.routers[0]["send_rate"] = 5
+    simulator = Simulator.from_scenario(scenario)
+    simulator.run(20)
+    statistics = simulator.statistics()
+
+    assert statistics["dropped_pack"] > 0 and \
+        statistics["received_pack"] + statistics["dropped_pack"] <= \
+        statistics["total_pack"], \
+        "Simulator failure - no drops with full buffers"
+
+
+def test_simulator_feedback_window():
+    """
+    Test that Routers with a feedback window send far fewer, delayed
+    feedback calls, which still steer the AIMD Hosts
+    """
+    # Run the same AIMD Scenario with immediate and windowed feedback
+    calls = []
+    for window in (0, 0.5):
+        scenario = line_scenario(3, buffer_size=3, app_type="AIMD")
+        for router in scenario.routers:
+            router["send_rate"] = 15
+            router["feedback_window"] = window
+        simulator = Simulator.from_scenario(scenario)
+        feedback = []
+        simulator.network.attach_probe(
+            lambda event, node, packet, value, feedback=feedback:
+            feedback.append((simulator.now, value))
+            if event == FEEDBACK else None)
+        simulator.run(20)
+        calls.append(feedback)
+
+    # Windowed feedback arrives after the path delay, never at a window's end
+    delayed = all(round(time / 0.5, 6) != round(time / 0.5)
+                  for time, _ in calls[1])
+
+    assert 0 < len(calls[1]) < len(calls[0]) / 3 and \
+        any(value < 0 for _, value in calls[1]) and \
+        delayed, \
+        "Simulator failure - windowed feedback"
+
+
+
+def test_scenario_invalid_feedback_window():
+    """
+    Test that building a Network with a negative feedback window fails
+    """
+    scenario = line_scenario(1)
+    scenario.routers[0]["feedback_window"] = -0.5
+
+    with pytest.raises(ValueError):
+        scenario.build_network()
+
+def star_scenario(output_queues):
+    """
+    Creates a Scenario of a Router with four Hosts: a fast sender to one
+    Host, and a slow sender to the other
+    """
+    return Scenario(
+        [{"name": "r", "ip": "10.0.0.1", "send_rate": 40, "buffer_size": 5,
+          "output_queues": output_queues}],
+        [{"name": name, "ip": f"10.1.0.{index + 1}", "send_rate": rate,
+          "application": {"name": f"a{index}", "amount": amount,
+                          "send_rate": rate, "app_type": "CONST"}}
+         for index, (name, rate, amount) in
+         enumerate([("fast", 80, 800), ("slow", 10, 100),
+                    ("fast_sink", 1, 0), ("slow_sink", 1, 0)])],
+        [{"node": name, "interface": "e0", "other_node": "r",
+          "other_interface": name, "speed": 100, "metrics": 1}
+         for name in ("fast", "slow", "fast_sink", "slow_sink")],
+        [{"source": "fast", "target": "fast_sink"},
+         {"source": "slow", "target": "slow_sink"}],
+        10)
+
+
+def test_simulator_output_queues():
+    """
+    Test that with output queues, a burst towards one Host doesn't crowd out
+    the Packets towards an other one
+    """
+    # Count the Packets the slow sender gets through, with and without queues
+    delivered = []
+    for output_queues in (False, True):
+        simulator = Simulator.from_scenario(star_scenario(output_queues))
+        slow_sink = simulator.network.get_host("slow_sink")
+        received = []
+        simulator.network.attach_probe(
+            lambda event, node, packet, value, received=received:
+            received.append(packet)
+            if event == DELIVER and node is slow_sink else None)
+        simulator.run(10)
+        delivered.append(len(received))
+    assert delivered[0] < 100 and \
+        delivered[1] == 100, \
+        "Simulator failure - output queues"
+
+
+def test_simulator_link_capacity():
+    """
+    Test that bounded Links never hold more Packets than their capacity,
+    whatever they do when full
+    """
+    # Run a Scenario with a slow Router, pushing back on or dropping from the
+    # Links around it
+    outcomes = []
+    for overflow in ("BACKPRESSURE", "DROP_TAIL", "DROP_LOWEST"):
+        scenario = line_scenario(2, buffer_size=4)
+        scenario.routers[0]["send_rate"] = 10
+        for link in scenario.links:
+            link["speed"] = 5
+            link["capacity"] = {"delay": 0.4, "overflow": overflow}
+        simulator = Simulator.from_scenario(scenario)
+        channels = [channel for node in simulator.nodes
+                    for interface in node.interfaces
+                    for channel in interface.link.channels]
+        most = 0
+        while simulator.next_time() <= 20:
+            simulator.step()
+            most = max([most] + [channel.in_flight for channel in channels])
+        outcomes.append((most, simulator.statistics(),
+                         sum(channel.dropped for channel in channels)))
+
+    assert all(most <= 2 for most, _, _ in outcomes) and \
+        outcomes[0][2] == 0 and \
+        outcomes[1][2] > 0 and \
+        outcomes[2][2] > 0 and \
+        all(statistics["received_pack"] + statistics["dropped_pack"] <=
+            statistics["total_pack"] for _, statistics, _ in outcomes), \
+        "Simulator failure - Link capacity"
+
+
+def test_simulator_link_capacity_into_host():
+    """
+    Test that the slots emptied by DROP_LOWEST on a Link into a Host are not
+    counted as received Packets
+    """
+    # Run a Scenario with a slow, bounded Link into h2
+    scenario = line_scenario(2)
+    for router in scenario.routers:
+        router["send_rate"] = 100
+    for link in scenario.links:
+        if link["node"] == "h2":
+            link["speed"] = 10
+            link["capacity"] = {"packets": 2, "overflow": "DROP_LOWEST"}
+    simulator = Simulator.from_scenario(scenario)
+    delivered = []
+    simulator.network.attach_probe(
+        lambda event, node, packet, value:
+        delivered.append(packet) if event == DELIVER else None)
+    simulator.run(40)
+    statistics = simulator.statistics()
+
+    assert statistics["dropped_pack"] > 0 and \
+        statistics["received_pack"] == len(delivered) and \
+        statistics["received_pack"] + statistics["dropped_pack"] == \
+        statistics["total_pack"], \
+        "Simulator failure - Link capacity into a Host"
+
+
+def test_simulator_draws_in_blocks():
+    """
+    Test that the Hosts of a Simulator draw the PPVs and sizes of their
+    Packets in blocks, following the send rate
+    """
+    # The first block the Host h1 of the Scenario draws
+    scenario = line_scenario(2)
+    scenario.seed = 5
+    host = scenario.build_network().get_host("h1")
+    ppvs = [host.marker.mark_draw(host, draw)
+            for draw in host.batch_rng.random(DRAW_BLOCK)]
+    sizes = host.batch_rng.integers(1, 11, size=DRAW_BLOCK).tolist()
+
+    simulator = Simulator.from_scenario(scenario)
+    sent = []
+    simulator.network.attach_probe(
+        lambda event, node, packet, value:
+        sent.append((node.name, packet.ppv, packet.size))
+        if event == SEND else None)
+    simulator.run(40)
+    first = [(ppv, size) for name, ppv, size in sent if name == "h1"]
+
+    assert len(first) == 100 and first == list(zip(ppvs, sizes))[:100], \
+        "Simulator failure - drawing in blocks"
+
+    # A new send rate is followed from the next Packet on, without drawing
+    # a new block
+    host = simulator.network.get_host("h2")
+    host.send_rate = 1
+    host.application.amount += 50
+    state = host.batch_rng.bit_generator.state
+    sent.clear()
+    for _ in range(50):
+        simulator.network.send_packet("h2", "h1")
+    assert len(sent) == 50 and {ppv for _, ppv, _ in sent} <= {9, 10} and \
+        host.batch_rng.bit_generator.state == state, \
+        "Simulator failure - drawing in blocks after a new send rate"
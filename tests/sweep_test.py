@@ -0,0 +1,142 @@
+import json
+
+import pytest
+
+from src.engine.scenario import Scenario
+from src.engine.sweep import SweepRunner, expand_grid, point_id
+
+
+def small_scenario():
+    """
+    Creates a Scenario of two Hosts connected through a single Router
+    """
+    return Scenario(
+        [{"name": "r1", "ip": "10.0.0.1", "send_rate": 50, "buffer_size": 10}],
+        [{"name": "h1", "ip": "10.1.0.1", "send_rate": 20,
+          "application": {"name": "a1", "amount": 20, "send_rate": 20,
+                          "app_type": "CONST"}},
+         {"name": "h2", "ip": "10.1.0.2", "send_rate": 20,
+          "application": {"name": "a2", "amount": 20, "send_rate": 20,
+                          "app_type": "CONST"}}],
+        [{"node": "h1", "interface": "e0", "other_node": "r1",
+          "other_interface": "e0", "speed": 100, "metrics": 1},
+         {"node": "h2", "interface": "e0", "other_node": "r1",
+          "other_interface": "e1", "speed": 100, "metrics": 1}],
+        [{"source": "h1", "target": "h2"}],
+        5)
+
+
+def test_expand_grid():
+    """
+    Test creating every combination of a parameter grid
+    """
+    points = expand_grid({"routers.*.buffer_size": [1, 10],
+                          "hosts.h1.application.app_type": ["AIMD", "CONST"],
+                          "duration": [5]})
+
+    assert len(points) == 4 and \
+        {"routers.*.buffer_size": 1,
+         "hosts.h1.application.app_type": "CONST",
+         "duration": 5} in points and \
+        point_id({}, points[0]) == \
+        point_id({}, dict(reversed(points[0].items()))), \
+        "expand_grid() failure"
+
+
+def test_scenario_with_overrides():
+    """
+    Test overriding values of a Scenario
+    """
+    scenario = small_scenario()
+    overridden = scenario.with_overrides({"routers.*.buffer_size": 3,
+                                          "links.h2.speed": 7,
+                                          "hosts.h1.application.send_rate": 9})
+
+    assert overridden.routers[0]["buffer_size"] == 3 and \
+        overridden.links[0]["speed"] == 100 and \
+        overridden.links[1]["speed"] == 7 and \
+        overridden.hosts[0]["application"]["send_rate"] == 9 and \
+        scenario.routers[0]["buffer_size"] == 10, \
+        "Scenario.with_overrides() failure"
+
+
+def test_scenario_with_flow_overrides():
+    """
+    Test overriding the flows of a Scenario, selected by source and target
+    """
+    # Setup the Scenario with a third Host, and a flow to h1 from both others
+    scenario = small_scenario()
+    scenario.hosts.append(
+        {"name": "h3", "ip": "10.1.0.3", "send_rate": 20,
+         "application": {"name": "a3", "amount": 20, "send_rate": 20,
+                         "app_type": "CONST"}})
+    scenario.links.append({"node": "h3", "interface": "e0",
+                           "other_node": "r1", "other_interface": "e2",
+                           "speed": 100, "metrics": 1})
+    scenario.flows += [{"source": "h2", "target": "h1"},
+                       {"source": "h3", "target": "h1"}]
+    overridden = scenario.with_overrides({"flows.h1.target": "h3",
+                                          "flows.h2>h1.source": "h3"})
+    retargeted = scenario.with_overrides({"flows.*>h1.target": "h2"})
+
+    assert [(flow["source"], flow["target"])
+            for flow in overridden.flows] == \
+        [("h1", "h3"), ("h3", "h1"), ("h3", "h1")] and \
+        [flow["target"] for flow in retargeted.flows] == ["h2", "h2", "h2"], \
+        "Scenario.with_overrides() failure - flows"
+
+    with pytest.raises(KeyError):
+        scenario.with_overrides({"flows.h1>h1.target": "h2"})
+
+
+def test_sweep_runner_run_and_resume(tmp_path):
+    """
+    Test running a sweep, and resuming it after an interrupted write
+    """
+    results = tmp_path / "results.jsonl"
+    runner = SweepRunner(small_scenario(),
+                         {"routers.*.buffer_size": [1, 10],
+                          "hosts.*.application.send_rate": [10, 40]},
+                         str(results), workers=2, progress=None)
+
+    # Run the whole sweep
+    first_failed = runner.run()
+    records = [json.loads(line) for line in results.read_text().splitlines()]
+
+    # Simulate a killed run by dropping a record and leaving a half line
+    lines = results.read_text().splitlines()
+    results.write_text("\n".join(lines[:-1]) + "\n" + lines[-1][:10])
+    pending = runner.pending()
+    second_failed = runner.run()
+
+    assert first_failed == 0 and second_failed == 0 and \
+        len(records) == 4 and \
+        all(record["statistics"]["total_pack"] == 20 for record in records) and \
+        len(pending) == 1 and \
+        len(runner.completed()) == 4 and \
+        runner.pending() == [], \
+        "SweepRunner.run() failure"
+
+
+def test_sweep_runner_other_scenario(tmp_path):
+    """
+    Test that the results of an other base Scenario or duration are not
+    taken for the points of a sweep
+    """
+    results = tmp_path / "results.jsonl"
+    grid = {"routers.*.buffer_size": [1, 10]}
+    SweepRunner(small_scenario(), grid, str(results), workers=2,
+                progress=None).run()
+
+    longer = small_scenario()
+    longer.duration = 10
+    other = small_scenario()
+    other.flows.append({"source": "h2", "target": "h1"})
+
+    assert len(SweepRunner(small_scenario(), grid, str(results),
+                           progress=None).pending()) == 0 and \
+        len(SweepRunner(longer, grid, str(results), progress=None)
+            .pending()) == 2 and \
+        len(SweepRunner(other, grid, str(results), progress=None)
+            .pending()) == 2, \
+        "SweepRunner.pending() failure - other base Scenario"
@@ -0,0 +1,65 @@
+from src.engine.simulator import Simulator
+from src.engine.topologies import (GENERATORS, erdos_renyi, fat_tree, grid,
+                                   line, ring, scale_free, star)
+
+
+def router_links(scenario):
+    """
+    Gets the Links between two Routers of a Scenario
+    """
+    return [link for link in scenario.links
+            if link["node"].startswith("r") and
+            link["other_node"].startswith("r")]
+
+
+def test_regular_topologies():
+    """
+    Test the shapes of the regular topologies
+    """
+    assert len(line(5).routers) == 5 and len(router_links(line(5))) == 4, \
+        "line failure"
+    assert len(ring(5).routers) == 5 and len(router_links(ring(5))) == 5, \
+        "ring failure"
+    assert len(router_links(star(5))) == 4 and \
+        all(link["node"] == "r0" for link in router_links(star(5))), \
+        "star failure"
+    assert len(grid(10).routers) == 9 and len(router_links(grid(10))) == 12, \
+        "grid failure"
+
+    # A 4-ary fat-tree: 4 core, 8 aggregation and 8 edge Routers
+    tree = fat_tree(20, hosts=8)
+    edge_routers = {link["other_node"] for link in tree.links
+                    if link["node"].startswith("h")}
+    assert len(tree.routers) == 20 and len(router_links(tree)) == 32 and \
+        len(edge_routers) == 8, \
+        "fat_tree failure"
+
+
+def test_random_topologies():
+    """
+    Test that the random topologies are seeded and connected
+    """
+    assert erdos_renyi(20, seed=3).links == erdos_renyi(20, seed=3).links and \
+        erdos_renyi(20, seed=3).links != erdos_renyi(20, seed=4).links, \
+        "erdos_renyi seeding failure"
+    assert len(router_links(scale_free(20, attachments=2))) == 2 + 17 * 2, \
+        "scale_free failure"
+
+    for scenario in (erdos_renyi(12, seed=1), scale_free(12, seed=1)):
+        network = scenario.build_network()
+        assert all(node.get_best_route(other.ip) is not None
+                   for node in network.get_nodes()
+                   for other in network.get_nodes() if other is not node), \
+            "Random topology connectivity failure"
+
+
+def test_generated_workload():
+    """
+    Test that every generated topology delivers its Packets
+    """
+    for name, generator in GENERATORS.items():
+        simulator = Simulator.from_scenario(generator(6, hosts=2, packets=20))
+        simulator.run(10)
+        assert simulator.network.total_pack == 40 and \
+            simulator.network.received_pack == 40, \
+            f"{name} workload failure"
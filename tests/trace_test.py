@@ -0,0 +1,78 @@
+import numpy as np
+
+from src.components.probe import DELIVER, DROP, FEEDBACK, SEND
+from src.engine.scenario import Scenario
+from src.engine.simulator import Simulator
+from src.engine.trace import TraceReader, TraceWriter
+
+
+def congested_scenario():
+    """
+    Creates a Scenario of two AIMD Hosts sharing a Router with a small buffer
+    """
+    return Scenario(
+        [{"name": "r1", "ip": "10.0.0.1", "send_rate": 15, "buffer_size": 3}],
+        [{"name": "h1", "ip": "10.1.0.1", "send_rate": 20,
+          "application": {"name": "a1", "amount": 100, "send_rate": 20,
+                          "app_type": "AIMD"}},
+         {"name": "h2", "ip": "10.1.0.2", "send_rate": 20,
+          "application": {"name": "a2", "amount": 100, "send_rate": 20,
+                          "app_type": "AIMD"}}],
+        [{"node": "h1", "interface": "e0", "other_node": "r1",
+          "other_interface": "e0", "speed": 10, "metrics": 1},
+         {"node": "h2", "interface": "e0", "other_node": "r1",
+          "other_interface": "e1", "speed": 10, "metrics": 1}],
+        [{"source": "h1", "target": "h2"}, {"source": "h2", "target": "h1"}],
+        30, seed=5)
+
+
+def test_trace_round_trip(tmp_path):
+    """
+    Test that the trace holds every Packet event of the run
+    """
+    path = str(tmp_path / "run.trace")
+
+    # Run the Scenario with a trace attached, with a tiny buffer to flush often
+    simulator = Simulator.from_scenario(congested_scenario())
+    writer = TraceWriter(path, simulator.network, simulator.clock,
+                         buffered_records=7)
+    simulator.network.attach_probe(writer)
+    simulator.run(30)
+    writer.close()
+
+    reader = TraceReader(path)
+    records = reader.to_numpy()
+    events = records["event"]
+    first_record = next(iter(reader.records()))
+
+    assert len(reader) == writer.written and \
+        np.count_nonzero(events == SEND) == simulator.network.total_pack and \
+        np.count_nonzero(events == DROP) == simulator.network.dropped_pack and \
+        np.count_nonzero(events == DELIVER) == \
+        simulator.network.received_pack and \
+        np.count_nonzero(events == FEEDBACK) > 0 and \
+        np.all(np.diff(records["time"]) >= 0) and \
+        first_record == tuple(records[0].tolist()) and \
+        sum(len(chunk) for chunk in reader.chunks(10)) == len(records), \
+        "TraceWriter / TraceReader failure"
+
+
+def test_trace_packet_ids(tmp_path):
+    """
+    Test that a delivered Packet can be followed back to its sending
+    """
+    path = str(tmp_path / "run.trace")
+
+    simulator = Simulator.from_scenario(congested_scenario())
+    writer = TraceWriter(path, simulator.network, simulator.clock)
+    simulator.network.attach_probe(writer)
+    simulator.run(30)
+    writer.close()
+
+    records = TraceReader(path).to_numpy()
+    sent = records[records["event"] == SEND]
+    delivered = records[records["event"] == DELIVER]
+
+    assert len(np.unique(sent["packet"])) == len(sent) and \
+        np.all(np.isin(delivered["packet"], sent["packet"])), \
+        "TraceWriter failure - Packet ids are not unique"